@@ -4,17 +4,34 @@
 Cyberpunk Web Interface
 """
 
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, Response, g, render_template, request, jsonify, session, redirect, send_from_directory, url_for
 from flask_cors import CORS
 import os
+import re
+import json
+import time
+import queue
+import atexit
+import mimetypes
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
+from backend.cache import TTLCache
+from backend.counters import MessageCounter
 from backend.database import Database
-from backend.deployer import BotDeployer
-from backend.auth import hash_password, verify_password
+from backend.deployer import BotDeployer, probe_gateway
+from backend.heartbeat import MAX_CLOCK_SKEW, MAX_MESSAGES, SIGNATURE_HEADER, STALE_SECONDS as HEARTBEAT_STALE_SECONDS, verify_signature
+from backend.jobs import DeployQueue
+from backend.logcache import log_cache
+from backend import media
+from backend.logstream import KEEPALIVE_SECONDS, STREAM_MAX_SECONDS, StreamsFull, log_streams
+from backend.probe import format_logs
+from backend.usage import DEFAULT_RANGE as DEFAULT_USAGE_RANGE, RANGES as USAGE_RANGES, usage_series
+from backend.assets import CACHE_SECONDS as ASSET_CACHE_SECONDS, DIST_DIR as ASSET_DIST_DIR, AssetManifest
+from backend.auth import HashingBusy, hashing_pool, needs_rehash
+from backend.blog import render_posts
+from backend.oauth import GoogleOAuth
+from backend.throttle import login_throttle
 import secrets
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
-from google_auth_oauthlib.flow import Flow
 
 app = Flask(__name__)
 
@@ -45,14 +62,112 @@ DIGITALOCEAN_TOKEN = os.environ.get('DIGITALOCEAN_TOKEN')
 # Platform NVIDIA NIM API key — used for all customer bot deployments
 NVIDIA_API_KEY = os.environ.get('NVIDIA_API_KEY')
 
+# Background deploy workers (each gunicorn worker runs its own pool, jobs are shared via the database)
+deploy_queue = DeployQueue(db, DIGITALOCEAN_TOKEN, NVIDIA_API_KEY)
+if DIGITALOCEAN_TOKEN and NVIDIA_API_KEY:
+    deploy_queue.start()
+
+# Bot status: results are reused for a few seconds, SSH probes share one bounded pool
+status_cache = TTLCache(ttl=int(os.environ.get('STATUS_CACHE_TTL', '10')))
+status_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix='status-probe')
+FLEET_STATUS_DEADLINE = 8   # Seconds a fleet status request waits on probes; slower bots are reported 'unknown'
+UNKNOWN_STATUS = {'status': 'unknown', 'telegram_ready': None, 'service_active': None}
+
+# Message counts are buffered and written in batches (flushed on exit, at most one interval is lost on a crash)
+message_counter = MessageCounter(db)
+message_counter.start()
+atexit.register(message_counter.stop)
+
+# Proxies in front of the app that append to X-Forwarded-For (Railway's edge is one)
+TRUSTED_PROXY_HOPS = int(os.environ.get('TRUSTED_PROXY_HOPS', '1'))
+
+# Users allowed to see the whole fleet (comma separated usernames)
+ADMIN_USERNAMES = {u.strip() for u in os.environ.get('ADMIN_USERNAMES', '').split(',') if u.strip()}
+
 # Google OAuth configuration
 GOOGLE_CLIENT_ID = os.environ.get('GOOGLE_CLIENT_ID')
 GOOGLE_CLIENT_SECRET = os.environ.get('GOOGLE_CLIENT_SECRET')
 GOOGLE_REDIRECT_URI = os.environ.get('GOOGLE_REDIRECT_URI', 'http://localhost:5000/auth/google/callback')
+google_oauth = GoogleOAuth(GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET, GOOGLE_REDIRECT_URI)
 
 # Disable HTTPS requirement for local development
 os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
 
+def client_ip():
+    """Client address as seen by the outermost trusted proxy (earlier X-Forwarded-For entries can be forged)"""
+    route = request.access_route
+    if TRUSTED_PROXY_HOPS and len(route) >= TRUSTED_PROXY_HOPS:
+        return route[-TRUSTED_PROXY_HOPS]
+    return request.remote_addr
+
+def too_many_requests(message, retry_after):
+    """429 response telling the client when to retry"""
+    response = jsonify({'success': False, 'message': message})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+def current_user():
+    """Logged-in user's record, read at most once per request"""
+    if 'current_user' not in g:
+        g.current_user = db.get_user(session['username']) if 'username' in session else None
+    return g.current_user
+
+def session_user_id():
+    """Logged-in user's id, looked up once and then kept in the session"""
+    if 'user_id' not in session:
+        # Sessions from before user_id was stored at login
+        user = current_user()
+        if not user:
+            return None
+        session['user_id'] = user['id']
+    return session['user_id']
+
+# Fingerprinted static files from `python -m backend.assets` (none until the build has run)
+asset_manifest = AssetManifest()
+
+@app.template_global()
+def asset_url(filename):
+    """URL of a static file: content-hashed when built, so it can be cached forever; plain /static otherwise"""
+    built = asset_manifest.lookup(filename)
+    if built:
+        return url_for('asset', filename=built)
+    return url_for('static', filename=filename)
+
+# Image/video variants from `python -m backend.media` (committed under static/media)
+media_manifest = media.load_manifest()
+
+@app.template_global()
+def picture(filename, alt, sizes='100vw', **attrs):
+    """<picture> with AVIF/WebP srcsets for a static image"""
+    return media.picture(media_manifest, filename, asset_url, alt, sizes, **attrs)
+
+@app.template_global()
+def video(filename, alt='', **attrs):
+    """Looping muted <video> for an animated GIF"""
+    return media.video(media_manifest, filename, asset_url, alt, **attrs)
+
+@app.template_global()
+def media_url(filename, width=None, ext=None):
+    """URL of a single resized variant (e.g. a favicon size)"""
+    return media.media_url(media_manifest, filename, asset_url, width, ext)
+
+@app.route('/assets/<path:filename>')
+def asset(filename):
+    """Fingerprinted static file, precompressed when the client accepts it"""
+    found = asset_manifest.variant(filename, request.accept_encodings)
+    if found is None:
+        return "Not found", 404
+
+    name, encoding, path = found
+    response = send_from_directory(ASSET_DIST_DIR, path, mimetype=mimetypes.guess_type(name)[0] or 'application/octet-stream')
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    # The name changes whenever the content does, so browsers never need to revalidate
+    response.headers['Cache-Control'] = f'public, max-age={ASSET_CACHE_SECONDS}, immutable'
+    return response
+
 @app.route('/')
 def index():
     """Main landing page"""
@@ -72,1411 +187,35 @@ def sitemap():
     from flask import send_from_directory
     return send_from_directory('static', 'sitemap.xml', mimetype='application/xml')
 
-@app.route('/blog/setup-guide')
-def blog_setup_guide():
-    """OpenClaw setup guide blog post"""
-    from markupsafe import Markup
-
-    content = Markup('''
-<div class="tldr">
-<strong>TL;DR:</strong> This guide covers three ways to get OpenClaw running — from 5-minute automated deploy to full manual setup. Includes free Kimi setup on Nvidia for zero API costs.
-</div>
-
-<h2>What is OpenClaw?</h2>
-
-<p>OpenClaw is an open-source AI assistant gateway that runs on your own server. Unlike ChatGPT or Claude where your conversations train their models, OpenClaw keeps everything on your infrastructure.</p>
-
-<ul>
-<li><strong>Private:</strong> Your data never leaves your machine</li>
-<li><strong>Flexible:</strong> Connect multiple AI providers (Claude, GPT, Gemini, Kimi)</li>
-<li><strong>Multi-platform:</strong> Telegram, Discord, WhatsApp, Email, Slack</li>
-<li><strong>Open source:</strong> <a href="https://github.com/openclaw/openclaw">github.com/openclaw/openclaw</a></li>
-</ul>
-
-<h2>Method 1: 5-Minute Deploy (Recommended)</h2>
-
-<p>The fastest way to get OpenClaw running without touching a terminal.</p>
-
-<p><strong>What you need:</strong></p>
-<ul>
-<li>A Telegram account (for bot integration)</li>
-<li>An AI provider API key (we'll use free Kimi)</li>
-</ul>
-
-<p><strong>Steps:</strong></p>
-<ol>
-<li>Go to <a href="https://open-claw.space">open-claw.space</a></li>
-<li>Choose your AI model (recommend: Kimi via Nvidia for free credits)</li>
-<li>Paste your Telegram bot token</li>
-<li>Click "Deploy"</li>
-<li>Wait 5 minutes</li>
-</ol>
-
-<p><strong>Behind the scenes:</strong></p>
-<ul>
-<li>Server spins up (Ubuntu VPS)</li>
-<li>OpenClaw installs automatically</li>
-<li>Security configured (UFW firewall, fail2ban, non-root user)</li>
-<li>Encrypted API keys</li>
-<li>Telegram webhook connected</li>
-</ul>
-
-<p><strong>Result:</strong> Your OpenClaw instance running 24/7 on your own server.</p>
-
-<p><strong>Cost:</strong> $49/month (includes deployment + $15 API credits)</p>
-
-<h2>Method 2: Manual Setup (1-2 Hours)</h2>
-
-<p>Want to understand every component? Do it yourself.</p>
-
-<h3>Prerequisites</h3>
-<ul>
-<li>A VPS (DigitalOcean, Linode, Hetzner — $5-10/month)</li>
-<li>SSH access</li>
-<li>Basic Linux knowledge</li>
-</ul>
-
-<h3>Step 1: Spin Up VPS (15 min)</h3>
-<pre><code># Ubuntu 22.04 LTS recommended
-# Create droplet, get IP, SSH in
-ssh root@your-vps-ip</code></pre>
-
-<h3>Step 2: Install Node.js (5 min)</h3>
-<pre><code>curl -fsSL https://deb.nodesource.com/setup_20.x | sudo -E bash -
-sudo apt-get install -y nodejs
-node --version  # v20.x.x</code></pre>
-
-<h3>Step 3: Install OpenClaw (7 min)</h3>
-<pre><code>git clone https://github.com/openclaw/openclaw.git
-cd openclaw
-npm install
-npm run build</code></pre>
-
-<h3>Step 4: Configure Everything (10 min)</h3>
-<pre><code># Copy example config
-cp config.example.json config.json
-
-# Edit with your settings
-nano config.json</code></pre>
-
-<p><strong>Key settings:</strong></p>
-<ul>
-<li><code>gateway.host</code>: Set to <code>localhost</code> (security)</li>
-<li><code>telegram.botToken</code>: From @BotFather</li>
-<li><code>ai.provider</code>: Choose your provider</li>
-<li><code>ai.apiKey</code>: Your API key</li>
-</ul>
-
-<h3>Step 5: Set Up AI Provider (10 min)</h3>
-
-<h4>Option A: Kimi (Free via Nvidia)</h4>
-<ol>
-<li>Go to <a href="https://build.nvidia.com/moonshot">build.nvidia.com/moonshot</a></li>
-<li>Create free account</li>
-<li>Generate API key</li>
-<li>Paste into config</li>
-</ol>
-
-<p><strong>Free tier:</strong> 50,000 tokens/day</p>
-
-<h4>Option B: Anthropic Claude</h4>
-<ol>
-<li><a href="https://console.anthropic.com">console.anthropic.com</a></li>
-<li>Add billing</li>
-<li>Generate API key</li>
-</ol>
-
-<h4>Option C: OpenAI</h4>
-<ol>
-<li><a href="https://platform.openai.com">platform.openai.com</a></li>
-<li>Add billing</li>
-<li>Generate API key</li>
-</ol>
-
-<h3>Step 6: Connect Telegram (10 min)</h3>
-<ol>
-<li>Message @BotFather → <code>/newbot</code></li>
-<li>Name your bot</li>
-<li>Copy token to config</li>
-<li>Start OpenClaw: <code>npm start</code></li>
-<li>Message your bot — it should reply</li>
-</ol>
-
-<h3>Step 7: Security Hardening (10 min)</h3>
-<pre><code># Firewall
-sudo ufw default deny incoming
-sudo ufw default allow outgoing
-sudo ufw allow 22/tcp  # SSH
-sudo ufw enable
-
-# fail2ban
-sudo apt install fail2ban
-sudo systemctl enable fail2ban
-
-# Non-root user
-sudo useradd -m openclaw
-sudo usermod -aG sudo openclaw
-# Run OpenClaw as this user, not root</code></pre>
-
-<h3>Step 8: Debug Why Nothing Works (?? min)</h3>
-
-<p>This is where most people get stuck.</p>
-
-<p><strong>Common issues:</strong></p>
-<ul>
-<li>Telegram webhook URL wrong</li>
-<li>Firewall blocking requests</li>
-<li>API key permissions</li>
-<li>Node version mismatch</li>
-<li>Config syntax errors</li>
-</ul>
-
-<p><strong>Debug steps:</strong></p>
-<pre><code># Check logs
-npm start 2>&1 | tee openclaw.log
-
-# Test Telegram webhook
-curl -X POST https://api.telegram.org/bot&lt;TOKEN&gt;/getMe
-
-# Check if gateway is listening
-netstat -tlnp | grep 3000</code></pre>
-
-<p><strong>Total time:</strong> 1-2 hours if nothing goes wrong. Days if you're learning as you go.</p>
-
-<h2>Method 3: Docker Deploy (30 min)</h2>
-
-<p>For those who know Docker.</p>
-
-<pre><code># Pull image
-docker pull openclaw/openclaw:latest
-
-# Run with config
-docker run -d \\
-  --name openclaw \\
-  -v $(pwd)/config.json:/app/config.json \\
-  -p 3000:3000 \\
-  openclaw/openclaw:latest</code></pre>
-
-<p><strong>Pros:</strong> Isolated, reproducible<br>
-<strong>Cons:</strong> Still need to configure everything manually</p>
-
-<h2>Which Method Should You Choose?</h2>
-
-<table>
-<thead>
-<tr>
-<th>Method</th>
-<th>Time</th>
-<th>Cost</th>
-<th>Effort</th>
-</tr>
-</thead>
-<tbody>
-<tr>
-<td>5-Min Deploy</td>
-<td>5 min</td>
-<td>$49/mo</td>
-<td>Zero</td>
-</tr>
-<tr>
-<td>Manual</td>
-<td>1-2 hrs (or days)</td>
-<td>$5-10/mo VPS + API costs</td>
-<td>High</td>
-</tr>
-<tr>
-<td>Docker</td>
-<td>30 min</td>
-<td>Same as manual</td>
-<td>Medium</td>
-</tr>
-</tbody>
-</table>
-
-<p><strong>My recommendation:</strong> If you value your time, use the 5-minute deploy. If you want to learn OpenClaw's internals, do it manually once — then you'll appreciate the automation.</p>
-
-<h2>Free AI: Kimi on Nvidia Explained</h2>
-
-<p>Most guides skip this. Here's the exact setup.</p>
-
-<p><strong>Why Kimi?</strong></p>
-<ul>
-<li>50,000 free tokens/day</li>
-<li>Good quality (Moonshot's model)</li>
-<li>No credit card required</li>
-</ul>
-
-<p><strong>Setup steps:</strong></p>
-<ol>
-<li>Go to <a href="https://build.nvidia.com/moonshot">build.nvidia.com/moonshot</a></li>
-<li>Sign up with email</li>
-<li>Click "Get API Key"</li>
-<li>Copy key starting with <code>nvapi-...</code></li>
-<li>In config.json:</li>
-</ol>
-
-<pre><code>{
-  "ai": {
-    "provider": "nvidia",
-    "apiKey": "nvapi-xxxxxxxxxxxxxxxxxxxxxxxxxx",
-    "model": "kimi-k2.5"
-  }
-}</code></pre>
-
-<ol start="6">
-<li>Restart OpenClaw</li>
-</ol>
-
-<p><strong>Monitoring usage:</strong> Dashboard shows daily token usage. If you hit 50k/day, switch to another free tier or add paid credits.</p>
-
-<h2>Troubleshooting Common Errors</h2>
-
-<h3>"Webhook failed"</h3>
-<ul>
-<li>Check webhook URL in config</li>
-<li>Ensure VPS IP is public</li>
-<li>Verify SSL certificate (letsencrypt)</li>
-</ul>
-
-<h3>"API key invalid"</h3>
-<ul>
-<li>Check key has correct permissions</li>
-<li>Ensure billing is active (for paid providers)</li>
-<li>Verify key format (some need "Bearer" prefix)</li>
-</ul>
-
-<h3>"Gateway connection refused"</h3>
-<ul>
-<li>Check if OpenClaw is running: <code>pm2 status</code> or <code>ps aux | grep openclaw</code></li>
-<li>Verify port 3000 isn't blocked</li>
-<li>Check firewall rules</li>
-</ul>
-
-<h3>"Bot not responding"</h3>
-<ul>
-<li>Message @BotFather, ensure bot isn't blocked</li>
-<li>Check webhook is set: <code>https://api.telegram.org/bot&lt;TOKEN&gt;/getWebhookInfo</code></li>
-<li>Verify your VPS can reach Telegram servers</li>
-</ul>
-
-<h3>"Rate limited"</h3>
-<ul>
-<li>You're hitting API limits</li>
-<li>Add API key for additional provider</li>
-<li>Check token usage dashboard</li>
-</ul>
-
-<h2>Next Steps After Setup</h2>
-
-<ol>
-<li><strong>Add integrations:</strong> Connect Discord, WhatsApp, Email</li>
-<li><strong>Configure skills:</strong> Enable browser automation, web search</li>
-<li><strong>Set up cron:</strong> Schedule automated tasks</li>
-<li><strong>Secure:</strong> Add 2FA to your VPS</li>
-<li><strong>Backup:</strong> Export your config regularly</li>
-</ol>
-
-<h2>Resources</h2>
-
-<ul>
-<li><strong>OpenClaw Docs:</strong> <a href="https://docs.openclaw.ai">docs.openclaw.ai</a></li>
-<li><strong>Community:</strong> <a href="https://github.com/openclaw/openclaw/discussions">github.com/openclaw/openclaw/discussions</a></li>
-<li><strong>Nvidia Build:</strong> <a href="https://build.nvidia.com">build.nvidia.com</a></li>
-</ul>
-
-<h2>Summary</h2>
-
-<p>Three ways to OpenClaw:</p>
-<ul>
-<li><strong>Fast:</strong> 5-minute deploy at open-claw.space</li>
-<li><strong>Manual:</strong> 1-2 hours learning every component</li>
-<li><strong>Docker:</strong> 30 minutes if you know containers</li>
-</ul>
-
-<p>The fastest route to private AI? 5-minute deploy. The most educational? Do it manually once, then automate.</p>
-
-<p>Want to skip the headache? I built the 5-minute deploy after spending 3 days on manual setup so you don't have to.</p>
-
-<hr>
-
-<p style="font-style: italic; color: var(--text-muted);">Last updated: February 2026</p>
-    ''')
-
-    return render_template('blog-post.html',
-                         title='How to Set Up OpenClaw: Complete Guide (2026)',
-                         description='Three ways to get OpenClaw running — from 5-minute automated deploy to full manual setup. Includes free Kimi setup on Nvidia for zero API costs.',
-                         slug='setup-guide',
-                         date='February 21, 2026',
-                         read_time='12',
-                         content=content)
-
-@app.route('/blog/openclaw-vs-claude')
-def blog_openclaw_vs_claude():
-    """OpenClaw vs Claude comparison blog post"""
-    from markupsafe import Markup
-
-    content = Markup('''
-<div class="tldr">
-<strong>TL;DR:</strong> Claude is an AI model. OpenClaw is an AI gateway that lets you use Claude (and GPT, Gemini, Kimi) from one private interface. They're not competitors—OpenClaw makes Claude more private and flexible.
-</div>
-
-<h2>The Confusion: OpenClaw vs Claude</h2>
-
-<p>People keep asking: "Should I use OpenClaw or Claude?"</p>
-
-<p>This is like asking "Should I use a TV or Netflix?"</p>
-
-<p>They're not the same thing.</p>
-
-<h2>What Claude Is</h2>
-
-<p>Claude is an AI model made by Anthropic. It's one of the smartest AI assistants available.</p>
-
-<p><strong>How you normally use Claude:</strong></p>
-<ul>
-<li>Go to claude.ai</li>
-<li>Type your questions in their web interface</li>
-<li>Your conversations train their systems</li>
-<li>Your data lives on Anthropic's servers</li>
-</ul>
-
-<p><strong>Claude's pricing:</strong></p>
-<ul>
-<li>Free: 5 messages every 5 hours (very limited)</li>
-<li>Pro: $20/month for higher limits</li>
-<li>API: Pay-per-token (can get expensive fast)</li>
-</ul>
-
-<h2>What OpenClaw Is</h2>
-
-<p>OpenClaw is an AI gateway that runs on your own server.</p>
-
-<p><strong>What it does:</strong></p>
-<ul>
-<li>Connects to multiple AI providers (Claude, GPT, Gemini, Kimi)</li>
-<li>Routes your requests to whichever model you choose</li>
-<li>Keeps everything on your infrastructure</li>
-<li>Works through Telegram, Discord, Email, etc.</li>
-</ul>
-
-<p><strong>Think of it as:</strong> Your private AI assistant that can talk to any model you want.</p>
-
-<h2>The Key Difference</h2>
-
-<table>
-<thead>
-<tr>
-<th>Feature</th>
-<th>Claude Direct</th>
-<th>OpenClaw (with Claude)</th>
-</tr>
-</thead>
-<tbody>
-<tr>
-<td><strong>Privacy</strong></td>
-<td>Data on Anthropic servers</td>
-<td>Data on your server</td>
-</tr>
-<tr>
-<td><strong>Model Choice</strong></td>
-<td>Only Claude</td>
-<td>Claude, GPT, Gemini, Kimi</td>
-</tr>
-<tr>
-<td><strong>Interface</strong></td>
-<td>Web only</td>
-<td>Telegram, Discord, Email, etc.</td>
-</tr>
-<tr>
-<td><strong>Training</strong></td>
-<td>Your convos may train their model</td>
-<td>Your data stays private</td>
-</tr>
-<tr>
-<td><strong>Control</strong></td>
-<td>Limited to their features</td>
-<td>Full control, customize anything</td>
-</tr>
-<tr>
-<td><strong>Cost</strong></td>
-<td>$20/mo Pro or pay-per-token</td>
-<td>$49/mo (includes $15 credits)</td>
-</tr>
-</tbody>
-</table>
-
-<h2>When to Use Claude Directly</h2>
-
-<p><strong>Use claude.ai when:</strong></p>
-<ul>
-<li>You just need quick AI answers occasionally</li>
-<li>You're okay with using their web interface</li>
-<li>Privacy isn't your main concern</li>
-<li>You don't need other AI models</li>
-</ul>
-
-<h2>When to Use OpenClaw (with Claude)</h2>
-
-<p><strong>Use OpenClaw when:</strong></p>
-<ul>
-<li>You want complete privacy (data on your server)</li>
-<li>You want to switch between Claude, GPT, and others</li>
-<li>You want AI in Telegram, not just web</li>
-<li>You're building business workflows</li>
-<li>You need 24/7 automation</li>
-<li>You want to customize everything</li>
-</ul>
-
-<h2>Can You Use Both?</h2>
-
-<p>Yes. In fact, you can use Claude <em>through</em> OpenClaw.</p>
-
-<p><strong>Here's how it works:</strong></p>
-<ol>
-<li>Get Claude API key from Anthropic</li>
-<li>Connect it to your OpenClaw instance</li>
-<li>Now you talk to Claude through your private gateway</li>
-<li>Your data never touches Anthropic's training systems</li>
-</ol>
-
-<h2>Real-World Example</h2>
-
-<p><strong>Sarah is a freelancer. She uses Claude for:</strong></p>
-<ul>
-<li>Writing client emails</li>
-<li>Drafting proposals</li>
-<li>Research</li>
-</ul>
-
-<p><strong>Problem:</strong> All her client data goes through Anthropic's servers. Not ideal for confidentiality.</p>
-
-<p><strong>Solution:</strong> She switched to OpenClaw.</p>
-
-<p><strong>Now:</strong></p>
-<ul>
-<li>OpenClaw runs on her VPS</li>
-<li>She messages her Telegram bot</li>
-<li>It routes to Claude API</li>
-<li>No data stored on third-party servers</li>
-<li>She also uses GPT for creative tasks</li>
-<li>Switches models with one command</li>
-</ul>
-
-<h2>OpenClaw + Claude = Best of Both Worlds</h2>
-
-<p><strong>What you get:</strong></p>
-<ul>
-<li>Claude's intelligence</li>
-<li>GPT's versatility</li>
-<li>Gemini's speed</li>
-<li>Kimi's free tier</li>
-<li>All from one private gateway</li>
-</ul>
-
-<p><strong>Your conversations:</strong></p>
-<ul>
-<li>Never leave your server</li>
-<li>Don't train anyone's model</li>
-<li>Completely under your control</li>
-</ul>
-
-<h2>Pricing Breakdown</h2>
-
-<h3>Claude Direct ($20/month Pro)</h3>
-<ul>
-<li>Web interface only</li>
-<li>Usage limits</li>
-<li>Data on their servers</li>
-<li>Only Claude models</li>
-</ul>
-
-<h3>OpenClaw ($49/month)</h3>
-<ul>
-<li>Telegram, Discord, Email, etc.</li>
-<li>$15 in API credits included</li>
-<li>Use with Claude, GPT, Gemini, Kimi</li>
-<li>Your own dedicated server</li>
-<li>Complete privacy</li>
-<li>24/7 running</li>
-</ul>
-
-<p><strong>Which is better value?</strong></p>
-
-<p>If you only use AI casually: Claude Pro ($20)</p>
-
-<p>If you use AI for business or want privacy: OpenClaw ($49)</p>
-
-<h2>Common Misconceptions</h2>
-
-<p><strong>"OpenClaw is a cheaper Claude alternative"</strong></p>
-<p>No. OpenClaw is infrastructure. You still use Claude (or any AI) through it.</p>
-
-<p><strong>"I need to choose between them"</strong></p>
-<p>No. You can use Claude <em>inside</em> OpenClaw for better privacy and control.</p>
-
-<p><strong>"OpenClaw has its own AI model"</strong></p>
-<p>No. OpenClaw connects to existing models (Claude, GPT, Gemini, Kimi).</p>
-
-<h2>The Bottom Line</h2>
-
-<p>Claude is an AI model. OpenClaw is your private gateway to AI models.</p>
-
-<p><strong>Use Claude direct if:</strong> You want simple, occasional AI help</p>
-
-<p><strong>Use OpenClaw if:</strong> You want privacy, control, and flexibility</p>
-
-<p><strong>Best setup?</strong> OpenClaw with Claude API access—you get Claude's intelligence plus complete privacy.</p>
-
-<h2>Try Both. See What Fits.</h2>
-
-<p>Most people start with Claude direct. Then realize they need:</p>
-<ul>
-<li>More privacy (client data concerns)</li>
-<li>More models (not just Claude)</li>
-<li>Better integration (Telegram, not web)</li>
-<li>24/7 automation</li>
-</ul>
-
-<p>That's when OpenClaw makes sense.</p>
-
-<p>You don't have to choose. Use both. OpenClaw makes Claude better.</p>
-
-<hr>
-
-<p style="font-style: italic; color: var(--text-muted);">Last updated: February 2026</p>
-    ''')
-
-    return render_template('blog-post.html',
-                         title='OpenClaw vs Claude: Which is Better? (2026 Comparison)',
-                         description='Claude is an AI model. OpenClaw is an AI gateway. They work together. Complete comparison of features, privacy, and pricing to help you decide.',
-                         slug='openclaw-vs-claude',
-                         date='February 21, 2026',
-                         read_time='8',
-                         content=content)
-
-@app.route('/blog/deploy-openclaw-vps')
-def blog_deploy_vps():
-    """How to deploy OpenClaw on VPS tutorial"""
-    from markupsafe import Markup
-
-    content = Markup('''
-<div class="tldr">
-<strong>TL;DR:</strong> Step-by-step guide to deploy OpenClaw on any VPS (DigitalOcean, Linode, Hetzner). Covers Ubuntu setup, security hardening, Telegram integration, and common troubleshooting. Takes 1-2 hours.
-</div>
-
-<h2>What You'll Need</h2>
-
-<ul>
-<li>A VPS (any provider—DigitalOcean, Linode, Hetzner, AWS)</li>
-<li>Ubuntu 22.04 LTS (recommended)</li>
-<li>SSH access</li>
-<li>A Telegram account</li>
-<li>An AI provider API key (we'll use free Kimi)</li>
-<li>Basic terminal knowledge (we'll explain each command)</li>
-</ul>
-
-<p><strong>Cost:</strong> $5-10/month for VPS + API usage</p>
-<p><strong>Time:</strong> 1-2 hours (first time), 30 min (if you know what you're doing)</p>
-
-<h2>Why Deploy on Your Own VPS?</h2>
-
-<p><strong>Benefits:</strong></p>
-<ul>
-<li>Complete control over your infrastructure</li>
-<li>Cheaper long-term ($5-10/mo vs $49/mo managed)</li>
-<li>Learn how OpenClaw works under the hood</li>
-<li>Customize everything</li>
-</ul>
-
-<p><strong>Drawbacks:</strong></p>
-<ul>
-<li>You maintain everything yourself</li>
-<li>Need to handle security updates</li>
-<li>Troubleshooting is on you</li>
-<li>Takes 1-2 hours to set up</li>
-</ul>
-
-<h2>Step 1: Create Your VPS (10 minutes)</h2>
-
-<h3>DigitalOcean (Recommended for Beginners)</h3>
-
-<ol>
-<li>Go to <a href="https://digitalocean.com">digitalocean.com</a> and create account</li>
-<li>Click "Create Droplet"</li>
-<li>Choose Ubuntu 22.04 LTS</li>
-<li>Select "Basic" plan</li>
-<li>Pick $6/month option (1 GB RAM, 1 vCPU—enough for OpenClaw)</li>
-<li>Choose region closest to you</li>
-<li>Add SSH key (or use password—we'll secure it later)</li>
-<li>Click "Create Droplet"</li>
-</ol>
-
-<p><strong>Alternative providers:</strong></p>
-<ul>
-<li><strong>Linode:</strong> Similar pricing, great support</li>
-<li><strong>Hetzner:</strong> Cheapest ($4/mo), EU-based</li>
-<li><strong>Vultr:</strong> More datacenter locations</li>
-</ul>
-
-<p>All providers work the same. Pick whichever you prefer.</p>
-
-<h2>Step 2: Connect to Your VPS (5 minutes)</h2>
-
-<p><strong>On Mac/Linux:</strong></p>
-<pre><code>ssh root@your-vps-ip</code></pre>
-
-<p><strong>On Windows:</strong></p>
-<p>Use PuTTY or Windows Terminal with WSL.</p>
-
-<p>You'll see something like:</p>
-<pre><code>Welcome to Ubuntu 22.04 LTS
-root@openclaw:~#</code></pre>
-
-<p>You're in. Now we install OpenClaw.</p>
-
-<h2>Step 3: Install Node.js (5 minutes)</h2>
-
-<p>OpenClaw runs on Node.js. Install it:</p>
-
-<pre><code># Update package list
-apt update && apt upgrade -y
-
-# Install Node.js 20.x (LTS)
-curl -fsSL https://deb.nodesource.com/setup_20.x | bash -
-apt-get install -y nodejs
-
-# Verify installation
-node --version   # Should show v20.x.x
-npm --version    # Should show 10.x.x</code></pre>
-
-<p><strong>Why Node 20?</strong> OpenClaw requires Node 18+ for modern JavaScript features.</p>
-
-<h2>Step 4: Install OpenClaw (7 minutes)</h2>
-
-<pre><code># Clone OpenClaw repository
-git clone https://github.com/openclaw/openclaw.git
-cd openclaw
-
-# Install dependencies
-npm install
-
-# Build the project
-npm run build</code></pre>
-
-<p>This takes 3-5 minutes. You'll see a bunch of package names scroll by. That's normal.</p>
-
-<p><strong>If you see errors:</strong> Check Node version. Needs to be 18+.</p>
-
-<h2>Step 5: Configure OpenClaw (10 minutes)</h2>
-
-<pre><code># Copy example config
-cp config.example.json config.json
-
-# Edit with nano (or vim if you prefer)
-nano config.json</code></pre>
-
-<p><strong>Key settings to change:</strong></p>
-
-<pre><code>{
-  "gateway": {
-    "host": "localhost",    // IMPORTANT: localhost only for security
-    "port": 3000
-  },
-  "telegram": {
-    "botToken": "YOUR_BOT_TOKEN_HERE"  // Get from @BotFather
-  },
-  "ai": {
-    "provider": "nvidia",               // Free Kimi via Nvidia
-    "apiKey": "nvapi-...",             // Your Nvidia API key
-    "model": "kimi-k2.5"
-  }
-}</code></pre>
-
-<p><strong>Security note:</strong> Always set <code>host: "localhost"</code>. Never expose to <code>0.0.0.0</code> without authentication.</p>
-
-<p>Save with: <code>Ctrl+X</code>, then <code>Y</code>, then <code>Enter</code></p>
-
-<h2>Step 6: Get Your Telegram Bot Token (10 minutes)</h2>
-
-<ol>
-<li>Open Telegram, search for <strong>@BotFather</strong></li>
-<li>Send <code>/newbot</code></li>
-<li>Choose a name: "My OpenClaw Bot"</li>
-<li>Choose a username: "myopenclaw_bot" (must end in _bot)</li>
-<li>Copy the token (looks like: <code>1234567890:ABCdefGHIjklMNOpqrsTUVwxyz</code>)</li>
-<li>Paste it in config.json under <code>telegram.botToken</code></li>
-</ol>
-
-<h2>Step 7: Get Free AI Credits (Kimi via Nvidia) (10 minutes)</h2>
-
-<p><strong>Why Kimi?</strong> 50,000 free tokens/day. No credit card required.</p>
-
-<ol>
-<li>Go to <a href="https://build.nvidia.com/moonshot/kimi-k2_5">build.nvidia.com/moonshot</a></li>
-<li>Sign up with email</li>
-<li>Click "Get API Key"</li>
-<li>Copy the key (starts with <code>nvapi-...</code>)</li>
-<li>Paste in config.json under <code>ai.apiKey</code></li>
-</ol>
-
-<p><strong>Alternative: Use Claude or GPT</strong></p>
-<ul>
-<li><strong>Claude:</strong> <a href="https://console.anthropic.com">console.anthropic.com</a> (paid)</li>
-<li><strong>GPT:</strong> <a href="https://platform.openai.com">platform.openai.com</a> (paid)</li>
-</ul>
-
-<h2>Step 8: Start OpenClaw (2 minutes)</h2>
-
-<pre><code># Start in foreground (to test)
-npm start</code></pre>
-
-<p>You should see:</p>
-<pre><code>[gateway] gateway listening on localhost:3000
-[telegram] starting provider
-[telegram] bot connected: @your_bot_name</code></pre>
-
-<p><strong>Test it:</strong> Message your bot on Telegram. It should reply.</p>
-
-<p>If it works, press <code>Ctrl+C</code> to stop. We'll make it run 24/7 next.</p>
-
-<h2>Step 9: Make It Run 24/7 with PM2 (5 minutes)</h2>
-
-<pre><code># Install PM2 (process manager)
-npm install -g pm2
-
-# Start OpenClaw with PM2
-pm2 start npm --name "openclaw" -- start
-
-# Make it start on boot
-pm2 startup
-pm2 save</code></pre>
-
-<p><strong>Useful PM2 commands:</strong></p>
-<pre><code>pm2 status          # Check if running
-pm2 logs openclaw   # View logs
-pm2 restart openclaw  # Restart
-pm2 stop openclaw   # Stop</code></pre>
-
-<h2>Step 10: Security Hardening (10 minutes)</h2>
-
-<p><strong>CRITICAL: Don't skip this step.</strong></p>
-
-<h3>10.1: Set Up Firewall (UFW)</h3>
-
-<pre><code># Install UFW
-apt install ufw
-
-# Default rules: deny incoming, allow outgoing
-ufw default deny incoming
-ufw default allow outgoing
-
-# Allow SSH (otherwise you'll lock yourself out)
-ufw allow 22/tcp
-
-# Enable firewall
-ufw enable
-
-# Check status
-ufw status</code></pre>
-
-<h3>10.2: Install fail2ban (Blocks Brute Force)</h3>
-
-<pre><code>apt install fail2ban
-systemctl enable fail2ban
-systemctl start fail2ban</code></pre>
-
-<h3>10.3: Create Non-Root User</h3>
-
-<pre><code># Create user
-useradd -m openclaw
-
-# Add to sudo group
-usermod -aG sudo openclaw
-
-# Switch to this user for running OpenClaw
-su - openclaw</code></pre>
-
-<p><strong>Why?</strong> Running as root is dangerous. If OpenClaw gets compromised, attacker has full system access.</p>
-
-<h2>Step 11: Verify Everything Works (5 minutes)</h2>
-
-<p><strong>Checklist:</strong></p>
-<ul>
-<li>[ ] VPS is running</li>
-<li>[ ] Node.js installed (version 20+)</li>
-<li>[ ] OpenClaw cloned and built</li>
-<li>[ ] config.json configured</li>
-<li>[ ] Telegram bot token added</li>
-<li>[ ] AI provider (Kimi) connected</li>
-<li>[ ] PM2 running OpenClaw 24/7</li>
-<li>[ ] Firewall (UFW) active</li>
-<li>[ ] fail2ban protecting SSH</li>
-</ul>
-
-<p><strong>Test:</strong> Message your Telegram bot. Should reply instantly.</p>
-
-<h2>Common Issues & Fixes</h2>
-
-<h3>"Bot not responding"</h3>
-
-<pre><code># Check if OpenClaw is running
-pm2 status
-
-# Check logs for errors
-pm2 logs openclaw
-
-# Verify Telegram token
-curl https://api.telegram.org/bot&lt;YOUR_TOKEN&gt;/getMe</code></pre>
-
-<h3>"API key invalid"</h3>
-
-<ul>
-<li>Check you copied the full key</li>
-<li>Ensure no extra spaces in config.json</li>
-<li>Verify key hasn't expired (Nvidia keys don't expire, but check dashboard)</li>
-</ul>
-
-<h3>"Gateway connection refused"</h3>
-
-<pre><code># Check if port 3000 is listening
-netstat -tlnp | grep 3000
-
-# Restart OpenClaw
-pm2 restart openclaw</code></pre>
-
-<h3>"npm install" fails</h3>
-
-<ul>
-<li>Check Node version: <code>node --version</code> (needs 18+)</li>
-<li>Try: <code>npm install --legacy-peer-deps</code></li>
-<li>Clear cache: <code>npm cache clean --force</code></li>
-</ul>
-
-<h2>Maintenance Tips</h2>
-
-<p><strong>Weekly:</strong></p>
-<ul>
-<li>Check PM2 status: <code>pm2 status</code></li>
-<li>View logs for errors: <code>pm2 logs openclaw --lines 50</code></li>
-</ul>
-
-<p><strong>Monthly:</strong></p>
-<ul>
-<li>Update system: <code>apt update && apt upgrade -y</code></li>
-<li>Update OpenClaw: <code>cd openclaw && git pull && npm install && npm run build && pm2 restart openclaw</code></li>
-</ul>
-
-<p><strong>Check disk space:</strong></p>
-<pre><code>df -h</code></pre>
-
-<p>If <code>/</code> is above 80%, clean logs:</p>
-<pre><code>pm2 flush openclaw</code></pre>
-
-<h2>Upgrading to Paid AI Models</h2>
-
-<p>Free Kimi is great to start, but has limits (50k tokens/day).</p>
-
-<p><strong>When you need more:</strong></p>
-
-<h3>Add Claude API</h3>
-<ol>
-<li>Get key from <a href="https://console.anthropic.com">console.anthropic.com</a></li>
-<li>Update config.json:</li>
-</ol>
-
-<pre><code>"ai": {
-  "provider": "anthropic",
-  "apiKey": "sk-ant-...",
-  "model": "claude-opus-4.5"
-}</code></pre>
-
-<ol start="3">
-<li>Restart: <code>pm2 restart openclaw</code></li>
-</ol>
-
-<h3>Switch to GPT</h3>
-
-<pre><code>"ai": {
-  "provider": "openai",
-  "apiKey": "sk-proj-...",
-  "model": "gpt-5.2"
-}</code></pre>
-
-<h2>Next Steps</h2>
-
-<p><strong>Your OpenClaw is running. Now what?</strong></p>
-
-<ol>
-<li><strong>Add more channels:</strong> Discord, Email, WhatsApp</li>
-<li><strong>Enable browser automation:</strong> Let it browse the web</li>
-<li><strong>Set up web search:</strong> Connect to Google/Bing API</li>
-<li><strong>Create custom skills:</strong> Teach it new abilities</li>
-<li><strong>Backup config:</strong> <code>cp config.json config.backup.json</code></li>
-</ol>
-
-<h2>When Manual Setup Isn't Worth It</h2>
-
-<p>If this guide feels overwhelming, or you don't want to maintain a VPS yourself, consider the managed option.</p>
-
-<p><strong>5-minute automated deploy:</strong> <a href="https://open-claw.space">open-claw.space</a></p>
-
-<ul>
-<li>No terminal required</li>
-<li>Security handled automatically</li>
-<li>Automatic updates</li>
-<li>$49/mo (includes $15 AI credits)</li>
-</ul>
-
-<p>Most people do manual setup once to learn how it works, then realize maintaining it isn't worth their time.</p>
-
-<h2>Resources</h2>
-
-<ul>
-<li><strong>OpenClaw Docs:</strong> <a href="https://docs.openclaw.ai">docs.openclaw.ai</a></li>
-<li><strong>Community:</strong> <a href="https://github.com/openclaw/openclaw/discussions">GitHub Discussions</a></li>
-<li><strong>Free AI (Nvidia):</strong> <a href="https://build.nvidia.com">build.nvidia.com</a></li>
-</ul>
-
-<hr>
-
-<p style="font-style: italic; color: var(--text-muted);">Last updated: February 2026</p>
-    ''')
-
-    return render_template('blog-post.html',
-                         title='How to Deploy OpenClaw on VPS: Complete Guide (2026)',
-                         description='Step-by-step tutorial to deploy OpenClaw on any VPS (DigitalOcean, Linode, Hetzner). Covers Ubuntu setup, security, Telegram, and troubleshooting.',
-                         slug='deploy-openclaw-vps',
-                         date='February 21, 2026',
-                         read_time='15',
-                         content=content)
-
-@app.route('/blog/free-kimi-api-openclaw')
-def blog_free_kimi():
-    """Free Kimi API with OpenClaw tutorial"""
-    from markupsafe import Markup
-
-    content = Markup('''
-<div class="tldr">
-<strong>TL;DR:</strong> Get 50,000 free AI tokens per day using Kimi through Nvidia's API. No credit card required. Works perfectly with OpenClaw. This guide shows you exactly how to set it up.
-</div>
-
-<h2>Why Kimi is Perfect for OpenClaw</h2>
-
-<p>Most AI APIs are expensive:</p>
-<ul>
-<li><strong>Claude:</strong> ~$15/million tokens</li>
-<li><strong>GPT-4:</strong> ~$30/million tokens</li>
-<li><strong>Gemini:</strong> Starts free, but limits are low</li>
-</ul>
-
-<p><strong>Kimi via Nvidia?</strong> 50,000 tokens/day. Completely free. Forever.</p>
-
-<p><strong>What's the catch?</strong> None. Nvidia subsidizes it to get developers using their AI platform.</p>
-
-<h2>What You Get for Free</h2>
-
-<p><strong>Daily limits:</strong></p>
-<ul>
-<li>50,000 tokens/day</li>
-<li>~38,000 words of output</li>
-<li>~100-200 conversations (depends on length)</li>
-</ul>
-
-<p><strong>Model quality:</strong></p>
-<ul>
-<li>Kimi-k2.5: Smart enough for most tasks</li>
-<li>Context: 200k tokens (handles long documents)</li>
-<li>Response quality: Between GPT-3.5 and GPT-4</li>
-</ul>
-
-<p><strong>Perfect for:</strong></p>
-<ul>
-<li>Email summaries</li>
-<li>Draft writing</li>
-<li>Research</li>
-<li>Code explanations</li>
-<li>Personal assistant tasks</li>
-</ul>
-
-<p><strong>Not ideal for:</strong></p>
-<ul>
-<li>Creative writing (Claude is better)</li>
-<li>Complex reasoning (GPT-4 or Claude Opus)</li>
-<li>Heavy API usage (50k/day limit)</li>
-</ul>
-
-<h2>Step 1: Get Your Free Nvidia API Key (5 minutes)</h2>
-
-<ol>
-<li>Go to <a href="https://build.nvidia.com">build.nvidia.com</a></li>
-<li>Click "Sign Up" (top right)</li>
-<li>Use email or Google/GitHub login</li>
-<li>Verify your email</li>
-<li>Search for "Kimi" or "Moonshot"</li>
-<li>Click "Get API Key"</li>
-<li>Copy the key (starts with <code>nvapi-...</code>)</li>
-</ol>
-
-<p><strong>No credit card required. No trial expiry. Completely free.</strong></p>
-
-<h2>Step 2: Connect Kimi to OpenClaw (2 minutes)</h2>
-
-<p>If you're using the managed OpenClaw deploy at <a href="https://open-claw.space">open-claw.space</a>, Kimi is already set up. Just select "Kimi" during onboarding.</p>
-
-<p><strong>For self-hosted OpenClaw:</strong></p>
-
-<pre><code># Edit your config file
-nano ~/openclaw/config.json</code></pre>
-
-<p>Update the AI section:</p>
-
-<pre><code>{
-  "ai": {
-    "provider": "nvidia",
-    "apiKey": "nvapi-XXXXXXXXXXXXXXXXXXXXXXXXXX",
-    "model": "kimi-k2.5",
-    "baseURL": "https://integrate.api.nvidia.com/v1"
-  }
-}</code></pre>
-
-<p>Save and restart OpenClaw:</p>
-
-<pre><code>pm2 restart openclaw</code></pre>
-
-<h2>Step 3: Test Your Setup (1 minute)</h2>
-
-<p>Message your OpenClaw Telegram bot:</p>
-
-<pre><code>Hello! Are you using Kimi?</code></pre>
-
-<p>If it replies, you're good. Kimi is now powering your AI assistant—for free.</p>
-
-<h2>Understanding Token Usage</h2>
-
-<p><strong>What's a token?</strong></p>
-<ul>
-<li>~0.75 words in English</li>
-<li>"Hello, how are you?" = ~5 tokens</li>
-</ul>
-
-<p><strong>50,000 tokens/day means:</strong></p>
-<ul>
-<li>~125 conversations (400 tokens each)</li>
-<li>~250 short questions (200 tokens each)</li>
-<li>~25 long research queries (2000 tokens each)</li>
-</ul>
-
-<p><strong>Usage examples:</strong></p>
-
-<table>
-<thead>
-<tr>
-<th>Task</th>
-<th>Tokens</th>
-<th>Per Day</th>
-</tr>
-</thead>
-<tbody>
-<tr>
-<td>Email summary</td>
-<td>~150</td>
-<td>~333</td>
-</tr>
-<tr>
-<td>Draft email reply</td>
-<td>~300</td>
-<td>~166</td>
-</tr>
-<tr>
-<td>Code explanation</td>
-<td>~800</td>
-<td>~62</td>
-</tr>
-<tr>
-<td>Research query</td>
-<td>~1500</td>
-<td>~33</td>
-</tr>
-<tr>
-<td>Long document summary</td>
-<td>~3000</td>
-<td>~16</td>
-</tr>
-</tbody>
-</table>
-
-<h2>Monitoring Your Usage</h2>
-
-<p><strong>Check usage in Nvidia dashboard:</strong></p>
-<ol>
-<li>Go to <a href="https://build.nvidia.com">build.nvidia.com</a></li>
-<li>Click your profile (top right)</li>
-<li>Select "API Keys"</li>
-<li>View usage graph</li>
-</ol>
-
-<p><strong>What happens if you hit the limit?</strong></p>
-<ul>
-<li>Requests fail with "rate limit exceeded"</li>
-<li>Limit resets at midnight UTC</li>
-<li>No charges—it just stops working until reset</li>
-</ul>
-
-<h2>Upgrading When You Need More</h2>
-
-<p><strong>If you consistently hit 50k/day, you have options:</strong></p>
-
-<h3>Option 1: Add Fallback AI Provider</h3>
-
-<p>Use Kimi as primary, Claude/GPT as fallback when limit is hit.</p>
-
-<pre><code>{
-  "ai": {
-    "providers": [
-      {
-        "name": "nvidia",
-        "apiKey": "nvapi-...",
-        "model": "kimi-k2.5",
-        "priority": 1
-      },
-      {
-        "name": "anthropic",
-        "apiKey": "sk-ant-...",
-        "model": "claude-sonnet-4.5",
-        "priority": 2
-      }
-    ]
-  }
-}</code></pre>
-
-<p>OpenClaw will use Kimi first, switch to Claude if rate limited.</p>
-
-<h3>Option 2: Multiple Free APIs</h3>
-
-<p>Nvidia offers multiple free models. Rotate between them:</p>
-
-<ul>
-<li><strong>Kimi-k2.5:</strong> 50k/day</li>
-<li><strong>Llama-3.1:</strong> 1000 requests/day</li>
-<li><strong>Mixtral:</strong> 1000 requests/day</li>
-</ul>
-
-<p>Combine them = ~100k+ tokens/day free.</p>
-
-<h3>Option 3: Upgrade to Paid</h3>
-
-<p>If you need more than free tier:</p>
-
-<ul>
-<li><strong>Anthropic Claude:</strong> $15/million tokens</li>
-<li><strong>OpenRouter:</strong> Access to 100+ models, pay as you go</li>
-<li><strong>OpenAI:</strong> GPT-4 for $30/million tokens</li>
-</ul>
-
-<h2>Best Practices for Maximizing Free Tier</h2>
-
-<h3>1. Use Concise Prompts</h3>
-
-<p><strong>Bad:</strong> "Hey there! I was wondering if you could help me understand, like, what is the best way to..."</p>
-
-<p><strong>Good:</strong> "Explain the best way to..."</p>
-
-<p>Save 20-30% tokens with direct prompts.</p>
-
-<h3>2. Limit Context</h3>
-
-<p>Don't send entire documents if you only need summary.</p>
-
-<p><strong>Bad:</strong> (Pastes 5000-word article) "Summarize this"</p>
-
-<p><strong>Good:</strong> "Summarize: [paste only relevant sections]"</p>
-
-<h3>3. Batch Requests</h3>
-
-<p>Instead of:</p>
-<ul>
-<li>"Summarize email 1"</li>
-<li>"Summarize email 2"</li>
-<li>"Summarize email 3"</li>
-</ul>
-
-<p>Do:</p>
-<ul>
-<li>"Summarize these 3 emails: [all text]"</li>
-</ul>
-
-<p>Saves ~40% tokens (less overhead per request).</p>
-
-<h2>Common Issues & Fixes</h2>
-
-<h3>"Invalid API key"</h3>
-
-<ul>
-<li>Check you copied the full key (starts with <code>nvapi-</code>)</li>
-<li>Ensure no spaces before/after in config</li>
-<li>Regenerate key from Nvidia dashboard</li>
-</ul>
-
-<h3>"Rate limit exceeded"</h3>
-
-<ul>
-<li>You hit 50k tokens today</li>
-<li>Wait until midnight UTC for reset</li>
-<li>Or add fallback provider (Claude/GPT)</li>
-</ul>
-
-<h3>"Model not found"</h3>
-
-<ul>
-<li>Check model name: <code>kimi-k2.5</code> (not <code>kimi</code> or <code>kimi-2.5</code>)</li>
-<li>Verify baseURL: <code>https://integrate.api.nvidia.com/v1</code></li>
-</ul>
-
-<h3>"Slow responses"</h3>
-
-<ul>
-<li>Kimi is slower than GPT-4 (~5-10 sec vs 2-3 sec)</li>
-<li>This is normal for free tier</li>
-<li>If it's >30 sec, check network/firewall</li>
-</ul>
-
-<h2>Kimi vs Other Free Options</h2>
-
-<table>
-<thead>
-<tr>
-<th>Provider</th>
-<th>Free Tier</th>
-<th>Quality</th>
-<th>Best For</th>
-</tr>
-</thead>
-<tbody>
-<tr>
-<td><strong>Kimi (Nvidia)</strong></td>
-<td>50k tokens/day</td>
-<td>Good</td>
-<td>Daily assistant use</td>
-</tr>
-<tr>
-<td><strong>Gemini</strong></td>
-<td>60 requests/min (low daily cap)</td>
-<td>Very good</td>
-<td>Testing, low volume</td>
-</tr>
-<tr>
-<td><strong>Claude</strong></td>
-<td>No free API tier</td>
-<td>Excellent</td>
-<td>Paid only</td>
-</tr>
-<tr>
-<td><strong>GPT-3.5</strong></td>
-<td>No longer free</td>
-<td>Good</td>
-<td>Paid only</td>
-</tr>
-</tbody>
-</table>
-
-<p><strong>Winner:</strong> Kimi via Nvidia. Best balance of free tier + quality.</p>
-
-<h2>Real-World Usage: How Long Does 50k Last?</h2>
-
-<p><strong>Light user (personal assistant):</strong></p>
-<ul>
-<li>10-20 queries/day</li>
-<li>~5,000-10,000 tokens/day</li>
-<li><strong>Verdict:</strong> Never hit the limit</li>
-</ul>
-
-<p><strong>Medium user (work + personal):</strong></p>
-<ul>
-<li>40-60 queries/day</li>
-<li>~20,000-35,000 tokens/day</li>
-<li><strong>Verdict:</strong> Occasionally hit limit on heavy days</li>
-</ul>
-
-<p><strong>Heavy user (business use):</strong></p>
-<ul>
-<li>100+ queries/day</li>
-<li>~50,000+ tokens/day</li>
-<li><strong>Verdict:</strong> Need fallback or paid tier</li>
-</ul>
-
-<h2>Combining Free Kimi with OpenClaw</h2>
-
-<p><strong>Perfect combo:</strong></p>
-<ul>
-<li>OpenClaw handles infrastructure (Telegram, security, 24/7 running)</li>
-<li>Kimi provides free AI (50k tokens/day)</li>
-<li>Total cost: $0 if self-hosted, or $49/mo managed</li>
-</ul>
-
-<p><strong>What you get:</strong></p>
-<ul>
-<li>Private AI assistant</li>
-<li>Running 24/7</li>
-<li>Accessible via Telegram</li>
-<li>Zero AI API costs</li>
-</ul>
-
-<h2>When to Upgrade to Paid AI</h2>
-
-<p><strong>Stick with free Kimi if:</strong></p>
-<ul>
-<li>You use AI casually (20-50 queries/day)</li>
-<li>Tasks are straightforward (summaries, drafts, research)</li>
-<li>You're okay with occasional rate limits</li>
-</ul>
-
-<p><strong>Upgrade to Claude/GPT if:</strong></p>
-<ul>
-<li>You need top-tier reasoning (complex problems)</li>
-<li>You're doing creative work (writing, brainstorming)</li>
-<li>You consistently hit 50k/day limit</li>
-<li>You need faster response times</li>
-</ul>
-
-<p><strong>Cost comparison:</strong></p>
-
-<ul>
-<li><strong>Free Kimi:</strong> $0/mo (50k tokens/day)</li>
-<li><strong>Claude API:</strong> ~$15/mo (1 million tokens)</li>
-<li><strong>GPT-4 API:</strong> ~$30/mo (1 million tokens)</li>
-</ul>
-
-<h2>Resources</h2>
-
-<ul>
-<li><strong>Nvidia Build Platform:</strong> <a href="https://build.nvidia.com">build.nvidia.com</a></li>
-<li><strong>Kimi Model Docs:</strong> <a href="https://build.nvidia.com/moonshot/kimi-k2_5">build.nvidia.com/moonshot</a></li>
-<li><strong>OpenClaw Setup Guide:</strong> <a href="/blog/setup-guide">Complete OpenClaw Guide</a></li>
-<li><strong>Deploy in 5 Minutes:</strong> <a href="https://open-claw.space">open-claw.space</a></li>
-</ul>
-
-<h2>Summary</h2>
-
-<p>Free Kimi API through Nvidia = 50,000 tokens/day at zero cost.</p>
-
-<p>Perfect for running OpenClaw without paying for AI API usage.</p>
-
-<p><strong>Setup takes 5 minutes. No credit card. No catch.</strong></p>
-
-<p>Try it. If you need more later, add Claude/GPT as fallback. But most people never hit the free limit.</p>
-
-<hr>
-
-<p style="font-style: italic; color: var(--text-muted);">Last updated: February 2026</p>
-    ''')
-
-    return render_template('blog-post.html',
-                         title='Free Kimi API with OpenClaw: Complete Guide (2026)',
-                         description='Get 50,000 free AI tokens daily using Kimi through Nvidia. No credit card required. Perfect for OpenClaw. Step-by-step setup guide.',
-                         slug='free-kimi-api-openclaw',
-                         date='February 21, 2026',
-                         read_time='10',
-                         content=content)
+# Blog posts are rendered once per worker start; browsers and CDNs revalidate with the ETag after this
+BLOG_MAX_AGE = int(os.environ.get('BLOG_MAX_AGE', '300'))
+
+def render_blog_post(**post):
+    """blog-post.html for one post (outside any real request)"""
+    with app.test_request_context():
+        return render_template('blog-post.html', **post)
+
+blog_pages = render_posts(render_blog_post)
+
+@app.route('/blog/<slug>')
+def blog_post(slug):
+    """Blog post, pre-rendered and compressed at startup (content/blog/<slug>.html)"""
+    page = blog_pages.get(slug)
+    if page is None:
+        return "Not found", 404
+
+    # Only the chosen variant's ETag validates: a cached gzip body is no use to a client now asking for identity
+    encoding, body, etag = page.negotiate(request.accept_encodings)
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='text/html')
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = f'public, max-age={BLOG_MAX_AGE}'
+    return response
 
 @app.route('/dashboard')
 def dashboard():
@@ -1485,14 +224,14 @@ def dashboard():
         return redirect(url_for('index'))
 
     username = session['username']
-    user = db.get_user(username)
+    user = current_user()
 
     # If user doesn't exist in database, clear session and redirect to index
     if not user:
         session.clear()
         return redirect(url_for('index'))
 
-    bots = db.get_user_bots(username)
+    bots = db.get_user_bots(username, user_id=user['id'])
 
     return render_template('dashboard.html',
                          username=username,
@@ -1508,13 +247,35 @@ def login():
     data = request.json
     username = data.get('username')
     password = data.get('password')
+    ip = client_ip()
+
+    # Checked before any hashing, so guessing costs the attacker a 429 and us nothing
+    retry_after = login_throttle.retry_after(ip, username)
+    if retry_after:
+        return too_many_requests('Too many failed logins, try again later', retry_after)
 
     user = db.get_user(username)
-    if user and verify_password(password, user['password_hash']):
+    try:
+        verified = bool(user and user['password_hash']) and hashing_pool.verify_password(password, user['password_hash'])
+    except HashingBusy:
+        return too_many_requests('Server busy, try again in a moment', 1)
+
+    if verified:
+        login_throttle.succeeded(ip, username)
+
+        # Legacy or outdated hash: store one with current parameters while we have the password
+        if needs_rehash(user['password_hash']):
+            try:
+                db.update_password_hash(username, hashing_pool.hash_password(password))
+            except HashingBusy:
+                pass  # Upgraded at a later login instead
+
         session.permanent = True  # Make session last for PERMANENT_SESSION_LIFETIME
         session['username'] = username
+        session['user_id'] = user['id']
         return jsonify({'success': True, 'message': 'Login successful'})
 
+    login_throttle.failed(ip, username)
     return jsonify({'success': False, 'message': 'Invalid credentials'}), 401
 
 @app.route('/api/register', methods=['POST'])
@@ -1528,7 +289,11 @@ def register():
     if db.get_user(username):
         return jsonify({'success': False, 'message': 'Username already exists'}), 400
 
-    password_hash = hash_password(password)
+    try:
+        password_hash = hashing_pool.hash_password(password)
+    except HashingBusy:
+        return too_many_requests('Server busy, try again in a moment', 1)
+
     if db.create_user(username, email, password_hash):
         return jsonify({'success': True, 'message': 'Account created'})
 
@@ -1538,6 +303,7 @@ def register():
 def logout():
     """Logout endpoint"""
     session.pop('username', None)
+    session.pop('user_id', None)
     session.pop('google_id', None)
     session.pop('email', None)
     return jsonify({'success': True})
@@ -1547,24 +313,10 @@ def logout():
 @app.route('/auth/google')
 def google_auth():
     """Initiate Google OAuth flow"""
-    if not GOOGLE_CLIENT_ID or not GOOGLE_CLIENT_SECRET:
+    if not google_oauth.configured:
         return "Google OAuth not configured. Please set GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET environment variables.", 500
 
-    # Create flow instance
-    flow = Flow.from_client_config(
-        client_config={
-            "web": {
-                "client_id": GOOGLE_CLIENT_ID,
-                "client_secret": GOOGLE_CLIENT_SECRET,
-                "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                "token_uri": "https://oauth2.googleapis.com/token",
-                "redirect_uris": [GOOGLE_REDIRECT_URI]
-            }
-        },
-        scopes=['openid', 'https://www.googleapis.com/auth/userinfo.email', 'https://www.googleapis.com/auth/userinfo.profile']
-    )
-
-    flow.redirect_uri = GOOGLE_REDIRECT_URI
+    flow = google_oauth.flow()
 
     # Generate authorization URL
     authorization_url, state = flow.authorization_url(
@@ -1572,8 +324,9 @@ def google_auth():
         include_granted_scopes='true'
     )
 
-    # Store state in session for CSRF protection
+    # Store state in session for CSRF protection, and the PKCE verifier the token exchange must present
     session['state'] = state
+    session['code_verifier'] = flow.code_verifier
 
     return redirect(authorization_url)
 
@@ -1582,37 +335,18 @@ def google_callback():
     """Handle Google OAuth callback"""
     # Verify state to prevent CSRF
     state = session.get('state')
-    if not state:
+    code_verifier = session.pop('code_verifier', None)
+    if not state or not code_verifier:
         return "Invalid session state", 400
 
     try:
-        # Create flow instance
-        flow = Flow.from_client_config(
-            client_config={
-                "web": {
-                    "client_id": GOOGLE_CLIENT_ID,
-                    "client_secret": GOOGLE_CLIENT_SECRET,
-                    "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                    "token_uri": "https://oauth2.googleapis.com/token",
-                    "redirect_uris": [GOOGLE_REDIRECT_URI]
-                }
-            },
-            scopes=['openid', 'https://www.googleapis.com/auth/userinfo.email', 'https://www.googleapis.com/auth/userinfo.profile'],
-            state=state
-        )
-
-        flow.redirect_uri = GOOGLE_REDIRECT_URI
+        flow = google_oauth.flow(state=state, code_verifier=code_verifier)
 
         # Exchange authorization code for tokens
         flow.fetch_token(authorization_response=request.url)
 
-        # Get user info from Google
-        credentials = flow.credentials
-        id_info = id_token.verify_oauth2_token(
-            credentials.id_token,
-            google_requests.Request(),
-            GOOGLE_CLIENT_ID
-        )
+        # Get user info from Google (signing certs come from cache)
+        id_info = google_oauth.verify_id_token(flow.credentials.id_token)
 
         # Extract user information
         google_id = id_info['sub']
@@ -1642,6 +376,11 @@ def google_callback():
         # Log user in
         session.permanent = True
         session['username'] = username
+        if user:
+            session['user_id'] = user['id']
+        else:
+            # New account: session_user_id() looks the id up on first use
+            session.pop('user_id', None)
         session['google_id'] = google_id
         session['email'] = email
 
@@ -1691,7 +430,7 @@ def deploy_page():
         return redirect(url_for('connect_telegram_page'))
 
     username = session['username']
-    user = db.get_user(username)
+    user = current_user()
 
     return render_template('deploy.html',
                          username=username,
@@ -1701,7 +440,7 @@ def deploy_page():
 
 @app.route('/api/deploy', methods=['POST'])
 def deploy_bot():
-    """Deploy new bot"""
+    """Queue a new bot deployment (poll /api/deploy/<job_id> for progress)"""
     if 'username' not in session:
         return jsonify({'success': False, 'message': 'Not authenticated'}), 401
 
@@ -1709,7 +448,7 @@ def deploy_bot():
     username = session['username']
 
     # Check if user has paid subscription
-    user = db.get_user(username)
+    user = current_user()
     if not user or not user.get('has_paid'):
         return jsonify({
             'success': False,
@@ -1732,7 +471,7 @@ def deploy_bot():
             }), 500
 
         # Get optional user-provided OpenRouter key (for fallback models)
-        api_keys = db.get_api_keys(username)
+        api_keys = db.get_api_keys(username, user_id=user['id'])
         openrouter_key = api_keys.get('anthropic_key') if api_keys else None  # Column name stays same
 
         # Use platform's DigitalOcean token
@@ -1748,34 +487,26 @@ def deploy_bot():
             }), 400
 
         # Sanitize bot name: only allow a-z, A-Z, 0-9, . and -
-        import re
         safe_bot_name = re.sub(r'[^a-zA-Z0-9.-]', '-', bot_username.lower())
         safe_bot_name = f"openclaw-{safe_bot_name}"
 
-        result = deployer.deploy(
+        # Queue the deployment — workers create the droplet and wait for it in the background
+        job_id = deploy_queue.enqueue(
+            username=username,
             telegram_token=data['telegram_token'],
-            nvidia_key=NVIDIA_API_KEY,           # Platform NVIDIA NIM key (default AI provider)
             openrouter_key=openrouter_key,        # User's OpenRouter key (optional fallback)
             region='nyc3',  # Hardcoded
             size='s-2vcpu-2gb',  # Starter Plan: 2 vCPU · 2 GB RAM · 20 GB SSD
-            bot_name=safe_bot_name
+            bot_name=safe_bot_name,
+            bot_username=bot_username
         )
 
-        if result['success']:
-            # Save to database
-            db.add_bot(
-                username=username,
-                bot_name=bot_username,  # Store original name for display
-                bot_username=result['bot_username'],
-                ip_address=result['ip_address'],
-                gateway_token=result['gateway_token'],
-                droplet_id=result['droplet_id'],
-                region='nyc3'
-            )
-
-            return jsonify(result)
-
-        return jsonify(result), 500
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'phase': 'queued',
+            'bot_username': bot_username
+        }), 202
 
     except Exception as e:
         # Log error for debugging (server-side only)
@@ -1787,13 +518,116 @@ def deploy_bot():
             'message': 'Failed to deploy AI agent. Please check your tokens and try again.'
         }), 500
 
+MAX_BATCH_BOTS = 50
+
+@app.route('/api/deploy/batch', methods=['POST'])
+def deploy_bot_batch():
+    """Queue a team deployment of several bots (poll /api/deploy/<job_id> for progress)"""
+    if 'username' not in session:
+        return jsonify({'success': False, 'message': 'Not authenticated'}), 401
+
+    data = request.json or {}
+    username = session['username']
+
+    user = current_user()
+    if not user or not user.get('has_paid'):
+        return jsonify({
+            'success': False,
+            'message': 'Active subscription required. Please subscribe to deploy AI agents.',
+            'requires_payment': True
+        }), 402
+
+    if not DIGITALOCEAN_TOKEN or DIGITALOCEAN_TOKEN == 'YOUR_DO_TOKEN_HERE' or not NVIDIA_API_KEY:
+        return jsonify({
+            'success': False,
+            'message': 'Platform keys not configured. Please contact administrator.'
+        }), 500
+
+    # Same token twice would mean two droplets fighting over one Telegram bot
+    telegram_tokens = list(dict.fromkeys(t.strip() for t in data.get('telegram_tokens', []) if t and t.strip()))
+    if not telegram_tokens or len(telegram_tokens) > MAX_BATCH_BOTS:
+        return jsonify({
+            'success': False,
+            'message': f'Provide between 1 and {MAX_BATCH_BOTS} Telegram bot tokens.'
+        }), 400
+
+    try:
+        deployer = BotDeployer(DIGITALOCEAN_TOKEN)
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            bot_usernames = list(pool.map(deployer.get_bot_username, telegram_tokens))
+
+        invalid = [i + 1 for i, name in enumerate(bot_usernames) if name == 'unknown_bot']
+        if invalid:
+            return jsonify({
+                'success': False,
+                'message': f'Invalid Telegram bot token(s) at position {", ".join(map(str, invalid))}.'
+            }), 400
+
+        bots = [{
+            'telegram_token': token,
+            'bot_username': bot_username,
+            'bot_name': 'openclaw-' + re.sub(r'[^a-zA-Z0-9.-]', '-', bot_username.lower())
+        } for token, bot_username in zip(telegram_tokens, bot_usernames)]
+
+        api_keys = db.get_api_keys(username, user_id=user['id'])
+        openrouter_key = api_keys.get('anthropic_key') if api_keys else None  # Column name stays same
+
+        job_id = deploy_queue.enqueue_batch(
+            username=username,
+            bots=bots,
+            openrouter_key=openrouter_key,
+            region='nyc3',
+            size='s-2vcpu-2gb'
+        )
+
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'phase': 'queued',
+            'bot_usernames': bot_usernames
+        }), 202
+
+    except Exception as e:
+        print(f"❌ Batch deployment error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': 'Failed to queue deployment. Please try again.'
+        }), 500
+
+@app.route('/api/deploy/<job_id>', methods=['GET'])
+def get_deploy_job(job_id):
+    """Get deployment progress"""
+    if 'username' not in session:
+        return jsonify({'success': False, 'message': 'Not authenticated'}), 401
+
+    job = db.get_deploy_job(job_id)
+    if not job or job['username'] != session['username']:
+        return jsonify({'success': False, 'message': 'Deployment not found'}), 404
+
+    response = {
+        'success': True,
+        'job_id': job['id'],
+        'status': job['status'],
+        'phase': job['phase'],
+        'bot_id': job['bot_id'],
+        'bot_username': job['bot_username'],
+        'ip_address': job['ip_address'],
+        'error': job['error']
+    }
+
+    # Batch jobs report each bot separately
+    if job['kind'] == 'deploy-batch':
+        response['bots'] = json.loads(job['result']).get('bots', []) if job['result'] else []
+
+    return jsonify(response)
+
 @app.route('/api/bots', methods=['GET'])
 def get_bots():
     """Get user's bots"""
     if 'username' not in session:
         return jsonify({'success': False, 'message': 'Not authenticated'}), 401
 
-    bots = db.get_user_bots(session['username'])
+    bots = db.get_user_bots(session['username'], user_id=session_user_id())
     return jsonify({'success': True, 'bots': bots})
 
 @app.route('/api/bots/<int:bot_id>', methods=['DELETE'])
@@ -1807,6 +641,9 @@ def delete_bot(bot_id):
     if not bot:
         return jsonify({'success': False, 'message': 'Bot not found'}), 404
 
+    log_cache.forget(bot_id)
+    status_cache.delete(bot_id)
+
     try:
         # Delete the DigitalOcean droplet
         from pydo import Client
@@ -1840,50 +677,33 @@ def get_logs(bot_id):
     if 'username' not in session:
         return jsonify({'success': False, 'message': 'Not authenticated'}), 401
 
+    # Logs can contain the bot's conversations: only the owner (or an admin) may read them or warm the cache
     bot = db.get_bot(bot_id)
-    if not bot:
+    if not bot or (bot['user_id'] != session_user_id() and session['username'] not in ADMIN_USERNAMES):
         return jsonify({'success': False, 'message': 'Bot not found'}), 404
 
     import subprocess
-    output_parts = []
-
-    ssh_base = ["ssh", "-o", "StrictHostKeyChecking=no", "-o", "ConnectTimeout=8"]
+    offset = request.args.get('offset', type=int)
 
     try:
-        # 1. Cloud-init deployment logs (shows what's happening during setup)
-        deploy_result = subprocess.run(
-            ssh_base + [f"root@{bot['ip_address']}",
-             "tail -n 80 /var/log/cloud-init-output.log 2>/dev/null || echo '(cloud-init log not available yet)'"],
-            capture_output=True, text=True, timeout=12
-        )
-        if deploy_result.stdout.strip():
-            output_parts.append("=== DEPLOYMENT LOG (cloud-init) ===")
-            output_parts.append(deploy_result.stdout.strip())
-
-        # 2. OpenClaw service startup logs (first 30 lines — shows initial Telegram connection)
-        startup_result = subprocess.run(
-            ssh_base + [f"root@{bot['ip_address']}",
-             "journalctl -u openclaw-gateway --no-pager 2>/dev/null | head -30 || echo '(service not started yet)'"],
-            capture_output=True, text=True, timeout=12
-        )
-        if startup_result.stdout.strip():
-            output_parts.append("\n=== OPENCLAW STARTUP LOG ===")
-            output_parts.append(startup_result.stdout.strip())
-
-        # 3. Recent service logs filtered (no bonjour spam)
-        recent_result = subprocess.run(
-            ssh_base + [f"root@{bot['ip_address']}",
-             "journalctl -u openclaw-gateway --no-pager 2>/dev/null | grep -v 'bonjour' | tail -30"],
-            capture_output=True, text=True, timeout=12
-        )
-        if recent_result.stdout.strip():
-            output_parts.append("\n=== RECENT ACTIVITY (bonjour filtered) ===")
-            output_parts.append(recent_result.stdout.strip())
+        # Shared per-bot cache: viewers of the same bot reuse one SSH round trip
+        if offset is not None:
+            # Incremental poll: only lines after the viewer's journal cursor / cloud-init offset
+            new_lines = log_cache.since(bot_id, bot['ip_address'], request.args.get('cursor'), offset)
+            return jsonify({'success': True, **new_lines})
 
-        if output_parts:
-            return jsonify({'success': True, 'logs': '\n'.join(output_parts)})
+        probe = log_cache.snapshot(bot_id, bot['ip_address'])
+        logs = format_logs(probe)
+        position = {
+            'cursor': probe.get('cursor'),
+            'offset': probe.get('offset'),
+            'sections': {key: probe.get(key) or [] for key in ('cloud_init', 'startup', 'recent')}
+        }
 
-        return jsonify({'success': True, 'logs': 'Server is starting up, logs not available yet. Try again in 30 seconds.'})
+        if logs:
+            return jsonify({'success': True, 'logs': logs, **position})
+
+        return jsonify({'success': True, 'logs': 'Server is starting up, logs not available yet. Try again in 30 seconds.', **position})
 
     except subprocess.TimeoutExpired:
         return jsonify({'success': True, 'logs': 'Server is still booting. Try again in 30 seconds.'})
@@ -1892,63 +712,207 @@ def get_logs(bot_id):
         print(f"❌ Fetch logs error: {str(e)}")
         return jsonify({'success': True, 'logs': 'Unable to connect to server yet. It may still be booting.'})
 
+@app.route('/api/logs/<int:bot_id>/stream', methods=['GET'])
+def stream_logs(bot_id):
+    """Stream new gateway log lines as Server-Sent Events"""
+    if 'username' not in session:
+        return jsonify({'success': False, 'message': 'Not authenticated'}), 401
+
+    # Gateway logs can contain the bot's conversations: only the owner (or an admin) may tail them
+    bot = db.get_bot(bot_id)
+    if not bot or (bot['user_id'] != session_user_id() and session['username'] not in ADMIN_USERNAMES):
+        return jsonify({'success': False, 'message': 'Bot not found'}), 404
+
+    # EventSource sends the id of the last event it saw when it reconnects
+    cursor = request.headers.get('Last-Event-ID') or request.args.get('cursor')
+    try:
+        subscriber = log_streams.subscribe(bot_id, bot['ip_address'], cursor or None)
+    except StreamsFull:
+        # Dashboard falls back to polling /api/logs/<bot_id> when the stream is refused
+        response = jsonify({'success': False, 'message': 'Too many open log streams, polling instead'})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(KEEPALIVE_SECONDS)
+        return response
+
+    def generate():
+        deadline = time.time() + STREAM_MAX_SECONDS
+        try:
+            yield 'retry: 3000\n\n'
+            while time.time() < deadline:
+                try:
+                    item = subscriber.get(timeout=KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    # Also how we notice a browser that went away
+                    yield ': keepalive\n\n'
+                    continue
+                if item is None:
+                    break
+                entry_cursor, line = item
+                yield f"id: {entry_cursor or ''}\ndata: {json.dumps(line)}\n\n"
+        finally:
+            log_streams.unsubscribe(bot_id, subscriber)
+
+    response = Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    # A generator closed before its first chunk never runs its finally, so release the slot here too
+    response.call_on_close(lambda: log_streams.unsubscribe(bot_id, subscriber))
+    return response
+
+def get_bot_status(bot, probe=True):
+    """Gateway status of a bot, from its heartbeat if fresh, otherwise an SSH probe (cached briefly)
+
+    With probe=False a bot whose heartbeat went quiet is reported 'unknown' instead of probed.
+    """
+    cached = status_cache.get(bot['id'])
+    if cached:
+        return cached
+
+    try:
+        # Droplet's heartbeat agent keeps this current; only SSH in when it has gone quiet
+        last_seen_at = bot.get('last_seen_at')
+        if last_seen_at and datetime.now() - datetime.fromisoformat(str(last_seen_at)) < timedelta(seconds=HEARTBEAT_STALE_SECONDS):
+            telegram_ready = bool(bot['telegram_ready'])
+            service_active = bool(bot['service_active'])
+        elif not probe:
+            return UNKNOWN_STATUS
+        else:
+            probed = probe_gateway(bot['ip_address'])
+            telegram_ready = probed['telegram_ready']
+            service_active = probed['service_active']
+    except Exception:
+        telegram_ready = False
+        service_active = False
+
+    if telegram_ready and service_active:
+        status = 'ready'
+    elif service_active:
+        status = 'initializing'
+    else:
+        status = 'deploying'
+
+    result = {
+        'status': status,
+        'telegram_ready': telegram_ready,
+        'service_active': service_active
+    }
+    status_cache.set(bot['id'], result)
+    return result
+
 @app.route('/api/bots/<int:bot_id>/status', methods=['GET'])
 def check_bot_status(bot_id):
     """Check if bot's Telegram is ready"""
     if 'username' not in session:
         return jsonify({'success': False, 'message': 'Not authenticated'}), 401
 
+    # Same scoping as /api/bots/status: the session user's own bots (admins may check any)
     bot = db.get_bot(bot_id)
-    if not bot:
+    if not bot or (bot['user_id'] != session_user_id() and session['username'] not in ADMIN_USERNAMES):
         return jsonify({'success': False, 'message': 'Bot not found'}), 404
 
-    # Check if Telegram is connected by looking for the telegram startup log
-    import subprocess
+    return jsonify({'success': True, **get_bot_status(bot)})
+
+@app.route('/api/bots/status', methods=['GET'])
+def fleet_status():
+    """Status of all the user's bots in one call (?scope=all: every bot, admins only)"""
+    if 'username' not in session:
+        return jsonify({'success': False, 'message': 'Not authenticated'}), 401
+
+    # The whole fleet is served from heartbeats and the status cache only: SSH-probing every quiet bot doesn't scale
+    fleet = request.args.get('scope') == 'all'
+    if fleet:
+        if session['username'] not in ADMIN_USERNAMES:
+            return jsonify({'success': False, 'message': 'Admin access required'}), 403
+        bots = db.get_all_bots()
+    else:
+        bots = db.get_user_bots(session['username'], user_id=session_user_id())
+
+    # Probes run concurrently on a shared bounded pool, each with its own SSH timeout, under one overall deadline
+    futures = [status_pool.submit(get_bot_status, bot, probe=not fleet) for bot in bots]
+    done, not_done = wait_futures(futures, timeout=FLEET_STATUS_DEADLINE)
+    for future in not_done:
+        # Probes already running finish in the background and fill the cache for the next poll
+        future.cancel()
+    statuses = [future.result() if future in done else UNKNOWN_STATUS for future in futures]
+
+    return jsonify({
+        'success': True,
+        'bots': [
+            {'id': bot['id'], 'bot_username': bot['bot_username'], **status}
+            for bot, status in zip(bots, statuses)
+        ]
+    })
+
+@app.route('/api/agent/heartbeat', methods=['POST'])
+def agent_heartbeat():
+    """Receive a signed gateway status report from a bot droplet's heartbeat agent"""
+    body = request.get_data()
     try:
-        result = subprocess.run(
-            ["ssh", "-o", "StrictHostKeyChecking=no", "-o", "ConnectTimeout=5",
-             f"root@{bot['ip_address']}",
-             "journalctl -u openclaw-gateway --no-pager | grep -q '\\[telegram\\].*starting provider' && echo 'ready' || echo 'initializing'"],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+        data = json.loads(body)
+        droplet_id = int(data['droplet_id'])
+        timestamp = int(data['timestamp'])
+        messages = int(data.get('messages') or 0)
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return jsonify({'success': False, 'message': 'Invalid heartbeat'}), 400
 
-        telegram_ready = 'ready' in result.stdout
+    if not 0 <= messages <= MAX_MESSAGES:
+        return jsonify({'success': False, 'message': 'Invalid heartbeat'}), 400
 
-        # Also check if service exists and is active
-        service_result = subprocess.run(
-            ["ssh", "-o", "StrictHostKeyChecking=no", "-o", "ConnectTimeout=5",
-             f"root@{bot['ip_address']}",
-             "systemctl is-active openclaw-gateway 2>&1"],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+    # Signed with the bot's gateway token, which only the droplet and we know
+    bot = db.get_bot_by_droplet_id(droplet_id)
+    if not bot or not verify_signature(bot['gateway_token'], body, request.headers.get(SIGNATURE_HEADER)):
+        return jsonify({'success': False, 'message': 'Invalid signature'}), 401
 
-        service_active = 'active' in service_result.stdout
+    if abs(time.time() - timestamp) > MAX_CLOCK_SKEW:
+        return jsonify({'success': False, 'message': 'Heartbeat expired'}), 401
 
-        if telegram_ready and service_active:
-            status = 'ready'
-        elif service_active:
-            status = 'initializing'
-        else:
-            status = 'deploying'
+    # Rejects replays: timestamps must increase
+    if not db.record_heartbeat(bot['id'], timestamp, bool(data.get('telegram_ready')), bool(data.get('service_active'))):
+        return jsonify({'success': False, 'message': 'Heartbeat already received'}), 409
 
-        return jsonify({
-            'success': True,
-            'status': status,
-            'telegram_ready': telegram_ready,
-            'service_active': service_active
-        })
+    # Messages handled since the agent's last accepted heartbeat, bucketed by its timestamp
+    message_counter.increment(bot['id'], messages, timestamp=timestamp)
 
-    except Exception as e:
+    status_cache.delete(bot['id'])
+    return jsonify({'success': True})
+
+@app.route('/api/bots/<int:bot_id>/usage', methods=['GET'])
+def bot_usage(bot_id):
+    """Message counts for a bot over ?range= (1h, 24h, 7d, 30d, 365d), read from pre-aggregated buckets"""
+    if 'username' not in session:
+        return jsonify({'success': False, 'message': 'Not authenticated'}), 401
+
+    range_name = request.args.get('range', DEFAULT_USAGE_RANGE)
+    if range_name not in USAGE_RANGES:
         return jsonify({
-            'success': True,
-            'status': 'deploying',
-            'telegram_ready': False,
-            'service_active': False
-        })
+            'success': False,
+            'message': f'Unknown range. Use one of: {", ".join(USAGE_RANGES)}'
+        }), 400
+
+    # Usage is billing data: only the owner (or an admin) may read it
+    bot = db.get_bot(bot_id)
+    if not bot or (bot['user_id'] != session_user_id() and session['username'] not in ADMIN_USERNAMES):
+        return jsonify({'success': False, 'message': 'Bot not found'}), 404
+
+    return jsonify({'success': True, 'bot_id': bot_id, **usage_series(db, bot_id, range_name)})
+
+@app.route('/api/admin/metrics', methods=['GET'])
+def admin_metrics():
+    """In-process metrics for this worker (admins only)"""
+    if 'username' not in session:
+        return jsonify({'success': False, 'message': 'Not authenticated'}), 401
+
+    if session['username'] not in ADMIN_USERNAMES:
+        return jsonify({'success': False, 'message': 'Admin access required'}), 403
+
+    return jsonify({
+        'success': True,
+        'pid': os.getpid(),
+        'message_counts': message_counter.stats(),
+        'password_hashing': hashing_pool.stats(),
+        'google_certs': google_oauth.certs.stats()
+    })
 
 @app.route('/api/settings', methods=['GET'])
 def get_settings():
@@ -1956,7 +920,7 @@ def get_settings():
     if 'username' not in session:
         return jsonify({'success': False, 'message': 'Not authenticated'}), 401
 
-    api_keys = db.get_api_keys(session['username'])
+    api_keys = db.get_api_keys(session['username'], user_id=session_user_id())
     if api_keys:
         # Return masked values
         return jsonify({
@@ -0,0 +1,116 @@
+"""
+Static asset build for OpenClaw SaaS
+Copies static/ into static/dist under content-hashed names with precompressed .gz/.br siblings, plus a manifest
+that templates resolve through asset_url(), so assets can be cached forever and still change on every deploy
+
+Usage: python -m backend.assets   (run at build time; without a manifest pages fall back to plain /static URLs)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+
+try:
+    import brotli
+except ImportError:   # Optional: without it only .gz siblings are written
+    brotli = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATIC_DIR = os.path.join(ROOT, 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_NAME = 'manifest.json'
+
+COMPRESSIBLE = {'.css', '.js', '.svg', '.html', '.txt', '.xml', '.json'}   # PNG/GIF/JPEG are compressed already
+SKIP_SUFFIXES = ('.backup',)
+HASH_LENGTH = 12
+CACHE_SECONDS = 365 * 24 * 3600   # Fingerprinted names never change content, so browsers keep them a year
+
+
+def fingerprint(name, data):
+    """name with a content hash before its extension (css/jack.css -> css/jack.1a2b3c4d5e6f.css)"""
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{ext}"
+
+
+def source_files(static_dir=STATIC_DIR):
+    """Paths of every static file relative to static_dir (the build output itself excluded)"""
+    for directory, subdirs, files in os.walk(static_dir):
+        if os.path.abspath(directory) == os.path.abspath(static_dir):
+            subdirs[:] = [d for d in subdirs if d != os.path.basename(DIST_DIR)]
+        for name in sorted(files):
+            if not name.endswith(SKIP_SUFFIXES):
+                yield os.path.relpath(os.path.join(directory, name), static_dir).replace(os.sep, '/')
+
+
+def build(static_dir=STATIC_DIR, dist_dir=DIST_DIR):
+    """Rebuild dist_dir from scratch and write its manifest (returns the manifest)"""
+    if os.path.isdir(dist_dir):
+        shutil.rmtree(dist_dir)
+    os.makedirs(dist_dir)
+
+    assets = {}
+    for name in source_files(static_dir):
+        with open(os.path.join(static_dir, name), 'rb') as f:
+            data = f.read()
+
+        hashed = fingerprint(name, data)
+        target = os.path.join(dist_dir, hashed)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(data)
+
+        encodings = []
+        if os.path.splitext(name)[1] in COMPRESSIBLE:
+            variants = [('gzip', '.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+            if brotli is not None:
+                variants.insert(0, ('br', '.br', brotli.compress(data, quality=11)))
+            for encoding, suffix, compressed in variants:
+                # Tiny files can come out bigger, then the original is served as is
+                if len(compressed) < len(data):
+                    with open(target + suffix, 'wb') as f:
+                        f.write(compressed)
+                    encodings.append(encoding)
+
+        assets[name] = {'file': hashed, 'encodings': encodings}
+
+    manifest = {'assets': assets}
+    with open(os.path.join(dist_dir, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+class AssetManifest:
+    def __init__(self, dist_dir=DIST_DIR):
+        """Load the build's manifest (empty if the build hasn't run)"""
+        self.dist_dir = dist_dir
+        self.assets = {}
+        path = os.path.join(dist_dir, MANIFEST_NAME)
+        if os.path.exists(path):
+            with open(path) as f:
+                self.assets = json.load(f)['assets']
+        # Fingerprinted name -> (original name, precompressed encodings)
+        self._built = {entry['file']: (name, entry['encodings']) for name, entry in self.assets.items()}
+
+    def lookup(self, name):
+        """Fingerprinted path of a static file, or None if it wasn't built"""
+        entry = self.assets.get(name)
+        return entry['file'] if entry else None
+
+    def variant(self, hashed, accept_encodings):
+        """(original name, encoding, path under dist_dir) to send for a fingerprinted path, or None if unknown"""
+        built = self._built.get(hashed)
+        if built is None:
+            return None
+        name, encodings = built
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if encoding in encodings and accept_encodings.quality(encoding) > 0:
+                return name, encoding, hashed + suffix
+        return name, 'identity', hashed
+
+
+if __name__ == '__main__':
+    built_assets = build()['assets']
+    compressed = sum(1 for entry in built_assets.values() if entry['encodings'])
+    print(f"📦 Built {len(built_assets)} assets into {DIST_DIR} ({compressed} precompressed{'' if brotli else ', gzip only: Brotli not installed'})")
@@ -1,26 +1,198 @@
 """
 Authentication module for OpenClaw SaaS
 Handles password hashing and verification
+
+Hashes name their algorithm and cost, so parameters can change without invalidating stored passwords:
+    $pbkdf2-sha256$i=200000$<salt hex>$<digest hex>
+    $scrypt$n=16384,r=8,p=1$<salt hex>$<digest hex>
+Older hashes are a bare 64-character hex salt followed by a PBKDF2-SHA256 digest at 100000 iterations.
+
+Calibrate costs on the target CPU: python -m backend.auth [target_ms]
 """
 
 import hashlib
+import hmac
+import os
 import secrets
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+HASH_WORKERS = int(os.environ.get('HASH_WORKERS', '2'))        # Hashes running at once per gunicorn worker (one core each)
+HASH_QUEUE_MAX = int(os.environ.get('HASH_QUEUE_MAX', '16'))   # Hashes allowed to wait for a free slot, beyond that callers get HashingBusy
+
+# New hashes use these; stored hashes with anything else are upgraded at the user's next login
+PASSWORD_HASH_ALGORITHM = os.environ.get('PASSWORD_HASH_ALGORITHM', 'pbkdf2-sha256')   # or scrypt
+# 2x the legacy cost (~80 ms a verify on one core): HASH_WORKERS=2 then verifies ~25 passwords/second per gunicorn worker
+PBKDF2_ITERATIONS = int(os.environ.get('PBKDF2_ITERATIONS', '200000'))
+SCRYPT_N = int(os.environ.get('SCRYPT_N', '16384'))    # Memory is 128 * n * r bytes (16 MiB at the defaults)
+SCRYPT_R = int(os.environ.get('SCRYPT_R', '8'))
+SCRYPT_P = int(os.environ.get('SCRYPT_P', '1'))
+
+ALGORITHMS = ('pbkdf2-sha256', 'scrypt')
+LEGACY_ITERATIONS = 100000
+SALT_BYTES = 16
+DIGEST_BYTES = 32
+
+def current_params(algorithm=None):
+    """Parameters new hashes get for an algorithm"""
+    algorithm = algorithm or PASSWORD_HASH_ALGORITHM
+    if algorithm == 'pbkdf2-sha256':
+        return {'i': PBKDF2_ITERATIONS}
+    if algorithm == 'scrypt':
+        return {'n': SCRYPT_N, 'r': SCRYPT_R, 'p': SCRYPT_P}
+    raise ValueError(f"Unknown password hash algorithm: {algorithm}")
+
+def _derive(algorithm, params, password, salt):
+    """Raw digest of a password"""
+    if algorithm == 'pbkdf2-sha256':
+        return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, params['i'])
+    if algorithm == 'scrypt':
+        n, r, p = params['n'], params['r'], params['p']
+        # OpenSSL refuses anything over maxmem (32 MiB by default), so allow what these parameters need
+        return hashlib.scrypt(password.encode('utf-8'), salt=salt, n=n, r=r, p=p,
+                              maxmem=128 * r * (n + p + 2) + 1024 * 1024, dklen=DIGEST_BYTES)
+    raise ValueError(f"Unknown password hash algorithm: {algorithm}")
+
+def parse_hash(stored_hash):
+    """(algorithm, params, salt, digest hex) of a stored hash, raising ValueError if it's malformed"""
+    if not stored_hash.startswith('$'):
+        # Legacy format: the salt is the hex text itself, not the bytes it spells
+        if len(stored_hash) != 128:
+            raise ValueError("Malformed legacy password hash")
+        return 'pbkdf2-sha256', {'i': LEGACY_ITERATIONS}, stored_hash[:64].encode('utf-8'), stored_hash[64:]
 
-def hash_password(password):
-    """Hash a password with salt"""
-    salt = secrets.token_hex(32)
-    pwdhash = hashlib.pbkdf2_hmac('sha256',
-                                   password.encode('utf-8'),
-                                   salt.encode('utf-8'),
-                                   100000)
-    return salt + pwdhash.hex()
+    fields = stored_hash.split('$')
+    if len(fields) != 5 or fields[1] not in ALGORITHMS:
+        raise ValueError("Malformed password hash")
+    _, algorithm, params, salt, digest = fields
+    params = {key: int(value) for key, value in (item.split('=', 1) for item in params.split(','))}
+    if set(params) != set(current_params(algorithm)):
+        raise ValueError(f"Malformed {algorithm} parameters")
+    return algorithm, params, bytes.fromhex(salt), digest
+
+def hash_password(password, algorithm=None, params=None):
+    """Hash a password with salt (current algorithm and parameters unless given)"""
+    algorithm = algorithm or PASSWORD_HASH_ALGORITHM
+    params = params or current_params(algorithm)
+    salt = secrets.token_bytes(SALT_BYTES)
+    digest = _derive(algorithm, params, password, salt)
+    encoded_params = ','.join(f"{key}={value}" for key, value in params.items())
+    return f"${algorithm}${encoded_params}${salt.hex()}${digest.hex()}"
 
 def verify_password(password, stored_hash):
-    """Verify a password against stored hash"""
-    salt = stored_hash[:64]
-    stored_pwdhash = stored_hash[64:]
-    pwdhash = hashlib.pbkdf2_hmac('sha256',
-                                   password.encode('utf-8'),
-                                   salt.encode('utf-8'),
-                                   100000)
-    return pwdhash.hex() == stored_pwdhash
+    """Verify a password against stored hash (either format)"""
+    try:
+        algorithm, params, salt, digest = parse_hash(stored_hash)
+    except ValueError:
+        return False
+    return hmac.compare_digest(_derive(algorithm, params, password, salt).hex(), digest)
+
+def needs_rehash(stored_hash):
+    """Whether a stored hash uses the legacy format or other parameters than new hashes get"""
+    try:
+        algorithm, params, _, _ = parse_hash(stored_hash)
+    except ValueError:
+        return True
+    return algorithm != PASSWORD_HASH_ALGORITHM or params != current_params()
+
+
+class HashingBusy(Exception):
+    """Every hashing slot and queue place is taken (answer 429 and let the client retry)"""
+
+
+class HashingPool:
+    """Bounded pool that runs password hashing off the request threads"""
+
+    def __init__(self, workers=None, queue_max=None):
+        """Initialize pool (threads start on first use)"""
+        self.workers = workers or HASH_WORKERS
+        self.queue_max = HASH_QUEUE_MAX if queue_max is None else queue_max
+        # OpenSSL's PBKDF2 releases the GIL, so these threads hash on separate cores
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_max)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _run(self, fn, *args):
+        """Run fn in the pool and wait for it, or raise HashingBusy without queueing"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HashingBusy()
+
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+            self._slots.release()
+
+    def hash_password(self, password):
+        """hash_password() in the pool"""
+        return self._run(hash_password, password)
+
+    def verify_password(self, password, stored_hash):
+        """verify_password() in the pool"""
+        return self._run(verify_password, password, stored_hash)
+
+    def stats(self):
+        """Pool counters for this process"""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'queue_max': self.queue_max,
+                'in_flight': self._in_flight,
+                'completed': self._completed,
+                'rejected': self._rejected
+            }
+
+
+hashing_pool = HashingPool()
+
+
+def _verify_ms(algorithm, params, rounds=3):
+    """Fastest of a few verifications, in milliseconds"""
+    stored_hash = hash_password('calibration', algorithm, params)
+    best = None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        verify_password('calibration', stored_hash)
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def calibrate(target_ms):
+    """Costs whose verify time comes closest to target_ms on this CPU"""
+    # PBKDF2 time is linear in iterations, so one measurement scales
+    sample = 100000
+    iterations = max(LEGACY_ITERATIONS, int(sample * target_ms / _verify_ms('pbkdf2-sha256', {'i': sample})) // 10000 * 10000)
+
+    # scrypt cost only comes in powers of two: double n while it still fits
+    n = 2 ** 12
+    while n < 2 ** 20 and _verify_ms('scrypt', {'n': n * 2, 'r': SCRYPT_R, 'p': SCRYPT_P}) <= target_ms:
+        n *= 2
+
+    return {
+        'pbkdf2-sha256': {'i': iterations},
+        'scrypt': {'n': n, 'r': SCRYPT_R, 'p': SCRYPT_P}
+    }
+
+
+if __name__ == '__main__':
+    # Run on the production container size: python -m backend.auth [target_ms]
+    target = float(sys.argv[1]) if len(sys.argv) > 1 else 250
+    print(f"⏱️  Calibrating password hashing for {target:.0f} ms per verify...")
+    chosen = calibrate(target)
+
+    pbkdf2 = chosen['pbkdf2-sha256']
+    print(f"PBKDF2_ITERATIONS={pbkdf2['i']}  # {_verify_ms('pbkdf2-sha256', pbkdf2):.0f} ms")
+    scrypt = chosen['scrypt']
+    print(f"SCRYPT_N={scrypt['n']}  # {_verify_ms('scrypt', scrypt):.0f} ms, {128 * scrypt['n'] * scrypt['r'] // 2 ** 20} MiB per hash")
+    print(f"Each gunicorn worker can verify about {HASH_WORKERS * 1000 / target:.0f} passwords/second with HASH_WORKERS={HASH_WORKERS}")
@@ -0,0 +1,89 @@
+"""
+Blog pages for OpenClaw SaaS
+Posts live in content/blog as HTML with a front-matter header, and are rendered and compressed once at startup
+
+    ---
+    title: How to Set Up OpenClaw
+    description: One line for search results and link previews
+    date: February 21, 2026
+    read_time: 12
+    ---
+    <p>Post body...</p>
+
+The file name (minus .html) is the URL slug: /blog/<slug>
+"""
+
+import gzip
+import hashlib
+import os
+
+try:
+    import brotli
+except ImportError:   # Optional: without it browsers get gzip
+    brotli = None
+
+BLOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'content', 'blog')
+REQUIRED_FIELDS = ('title', 'description', 'date', 'read_time')
+
+
+def parse_post(text):
+    """(front-matter fields, body HTML) of a post file"""
+    lines = text.split('\n')
+    if not lines or lines[0].strip() != '---':
+        raise ValueError("Post must start with a --- front-matter line")
+
+    fields = {}
+    for index, line in enumerate(lines[1:], start=1):
+        if line.strip() == '---':
+            body = '\n'.join(lines[index + 1:]).strip()
+            break
+        if line.strip():
+            key, _, value = line.partition(':')
+            fields[key.strip()] = value.strip()
+    else:
+        raise ValueError("Front matter is never closed with ---")
+
+    missing = [field for field in REQUIRED_FIELDS if not fields.get(field)]
+    if missing:
+        raise ValueError(f"Front matter is missing {', '.join(missing)}")
+    return fields, body
+
+
+def load_posts(directory=BLOG_DIR):
+    """Every post in a directory, keyed by slug"""
+    posts = {}
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith('.html'):
+            continue
+        with open(os.path.join(directory, name), encoding='utf-8') as f:
+            try:
+                fields, body = parse_post(f.read())
+            except ValueError as e:
+                raise ValueError(f"{name}: {e}") from None
+        posts[name[:-len('.html')]] = dict(fields, content=body)
+    return posts
+
+
+class RenderedPage:
+    """One page's final HTML with its compressed variants and validators, computed once"""
+
+    def __init__(self, html):
+        self.body = html.encode('utf-8')
+        digest = hashlib.sha256(self.body).hexdigest()[:20]
+        # Each encoding is its own representation, so each gets its own strong ETag
+        self.variants = {'identity': (self.body, digest)}
+        self.variants['gzip'] = (gzip.compress(self.body, compresslevel=9, mtime=0), f'{digest}-gz')
+        if brotli is not None:
+            self.variants['br'] = (brotli.compress(self.body, quality=11, mode=brotli.MODE_TEXT), f'{digest}-br')
+
+    def negotiate(self, accept_encodings):
+        """(encoding, body, etag) of the smallest variant the client accepts (werkzeug's request.accept_encodings)"""
+        for encoding in ('br', 'gzip'):
+            if encoding in self.variants and accept_encodings.quality(encoding) > 0:
+                return (encoding,) + self.variants[encoding]
+        return ('identity',) + self.variants['identity']
+
+
+def render_posts(render, directory=BLOG_DIR):
+    """Render every post through render(**post) into RenderedPages keyed by slug"""
+    return {slug: RenderedPage(render(slug=slug, **post)) for slug, post in load_posts(directory).items()}
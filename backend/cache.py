@@ -0,0 +1,48 @@
+"""
+In-process caches for OpenClaw SaaS
+Small thread-safe LRU + TTL cache for values that are expensive to fetch and fine to serve slightly stale
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    def __init__(self, ttl, max_entries=10000):
+        """Initialize cache (entries expire ttl seconds after they are set, least recently used go first when full)"""
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            value, expires_at = entry
+            if time.time() > expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entries beyond max_entries"""
+        with self._lock:
+            self._entries[key] = (value, time.time() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """Drop a key (e.g. when the underlying value changed)"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop everything"""
+        with self._lock:
+            self._entries.clear()
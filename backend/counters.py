@@ -0,0 +1,126 @@
+"""
+Write-behind counters for OpenClaw SaaS
+Buffers per-bot message count increments in memory and writes them to the database in batches
+"""
+
+import os
+import threading
+import time
+
+from backend.usage import bucket_start, rollup
+
+FLUSH_MS = int(os.environ.get('MESSAGE_COUNT_FLUSH_MS', '1000'))   # Write buffered counts at least this often
+FLUSH_AT = int(os.environ.get('MESSAGE_COUNT_FLUSH_AT', '500'))    # ...or as soon as this many increments are waiting
+
+
+class MessageCounter:
+    def __init__(self, db, flush_ms=None, flush_at=None):
+        """Initialize the counter (call start() to flush in the background)"""
+        self.db = db
+        self.flush_ms = flush_ms or FLUSH_MS
+        self.flush_at = flush_at or FLUSH_AT
+        self._pending = {}              # (bot_id, minute) -> increments not yet written
+        self._pending_total = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._thread = None
+
+        self._flushed_total = 0
+        self._flushes = 0
+        self._failed_flushes = 0
+        self._last_flush_at = None
+        self._last_error = None
+
+    def start(self):
+        """Start the background flusher"""
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._flush_loop, name='message-counter', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the flusher and write whatever is still buffered (registered with atexit)"""
+        self._stopped = True
+        self._wakeup.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self.flush()
+
+    def increment(self, bot_id, count=1, timestamp=None):
+        """Add to a bot's message count (written within flush_ms, at most that much is lost on a crash)"""
+        if count <= 0:
+            return
+        key = (bot_id, bucket_start(timestamp or time.time(), 'minute'))
+        with self._lock:
+            self._pending[key] = self._pending.get(key, 0) + count
+            self._pending_total += count
+            full = self._pending_total >= self.flush_at
+        if full:
+            self._wakeup.set()
+
+    def pending(self, bot_id):
+        """Increments buffered for a bot but not yet in the database"""
+        with self._lock:
+            return sum(count for (pending_bot, _), count in self._pending.items() if pending_bot == bot_id)
+
+    def flush(self):
+        """Write buffered increments to bots and the usage tables in one transaction (returns bots updated)"""
+        # One flush at a time so a shutdown flush can't interleave with the background one
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                total, self._pending_total = self._pending_total, 0
+
+            if not batch:
+                return 0
+
+            totals = {}
+            for (bot_id, _), count in batch.items():
+                totals[bot_id] = totals.get(bot_id, 0) + count
+
+            try:
+                with self.db.transaction():
+                    self.db.add_message_counts(totals)
+                    self.db.record_usage(rollup(batch))
+            except Exception as e:
+                # Put the batch back so the next flush retries it instead of dropping counts
+                with self._lock:
+                    for key, count in batch.items():
+                        self._pending[key] = self._pending.get(key, 0) + count
+                    self._pending_total += total
+                    self._failed_flushes += 1
+                    self._last_error = str(e)
+                print(f"❌ Message count flush failed ({len(totals)} bots): {e}")
+                return 0
+
+            with self._lock:
+                self._flushed_total += total
+                self._flushes += 1
+                self._last_flush_at = time.time()
+            return len(totals)
+
+    def stats(self):
+        """Buffer and flush metrics for the admin metrics endpoint"""
+        with self._lock:
+            return {
+                'pending_bots': len({bot_id for bot_id, _ in self._pending}),
+                'pending_increments': self._pending_total,
+                'flushed_increments': self._flushed_total,
+                'flushes': self._flushes,
+                'failed_flushes': self._failed_flushes,
+                'last_flush_at': self._last_flush_at,
+                'last_error': self._last_error,
+                'flush_ms': self.flush_ms,
+                'flush_at': self.flush_at
+            }
+
+    def _flush_loop(self):
+        """Flush every flush_ms, or early when increment() signals a full buffer"""
+        while not self._stopped:
+            self._wakeup.wait(self.flush_ms / 1000)
+            self._wakeup.clear()
+            if self._stopped:
+                break
+            self.flush()
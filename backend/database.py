@@ -1,393 +1,311 @@
 """
 Database module for OpenClaw SaaS
-Handles all database operations using SQLite
+Handles all database operations (SQLite by default, PostgreSQL when DATABASE_URL is set)
 """
 
-import sqlite3
 import os
 from datetime import datetime
-from pathlib import Path
+
+from backend.cache import TTLCache
+from backend.migrations import migrate
+from backend.storage import create_backend
+
+# Writes drop a user from this process's cache at once, other workers see them within the TTL
+USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', '5'))
+USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', '5000'))
 
 class Database:
-    def __init__(self, db_path='openclaw_saas.db'):
-        """Initialize database connection"""
+    def __init__(self, db_path='openclaw_saas.db', url=None):
+        """Initialize database (url defaults to DATABASE_URL, SQLite at db_path when neither is set)"""
         self.db_path = db_path
+        self.backend = create_backend(db_path, url)
+        # ('username', name) -> user record, ('email' | 'google_id', value) -> username
+        self._users = TTLCache(ttl=USER_CACHE_TTL, max_entries=USER_CACHE_SIZE)
         self.init_database()
 
-    def get_connection(self):
-        """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
-
-    def init_database(self):
-        """Initialize database tables"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        # Users table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                last_login TIMESTAMP,
-                credits REAL DEFAULT 50.0
-            )
-        ''')
-
-        # Bots table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS bots (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                bot_name TEXT NOT NULL,
-                bot_username TEXT NOT NULL,
-                ip_address TEXT NOT NULL,
-                gateway_token TEXT NOT NULL,
-                droplet_id INTEGER NOT NULL,
-                region TEXT NOT NULL,
-                status TEXT DEFAULT 'running',
-                message_count INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        ''')
-
-        # API Keys table (for storing user's API keys)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS api_keys (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                do_token TEXT,
-                anthropic_key TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        ''')
-
-        # Pending Payments table (for payments before user registration)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS pending_payments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                email TEXT NOT NULL,
-                payment_id TEXT NOT NULL,
-                subscription_plan TEXT DEFAULT 'monthly',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        # Add payment columns if they don't exist (for existing databases)
-        try:
-            cursor.execute('ALTER TABLE users ADD COLUMN has_paid INTEGER DEFAULT 0')
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-
-        try:
-            cursor.execute('ALTER TABLE users ADD COLUMN payment_date TIMESTAMP')
-        except sqlite3.OperationalError:
-            pass
+    def close(self):
+        """Release connections (reopened on next use)"""
+        self.backend.close()
 
-        try:
-            cursor.execute('ALTER TABLE users ADD COLUMN dodo_payment_id TEXT')
-        except sqlite3.OperationalError:
-            pass
+    def transaction(self):
+        """Cursor whose statements commit together, or roll back if the block raises (nested use joins the outer one)"""
+        return self.backend.transaction()
 
-        try:
-            cursor.execute("ALTER TABLE users ADD COLUMN subscription_plan TEXT DEFAULT 'none'")
-        except sqlite3.OperationalError:
-            pass
+    def query_one(self, sql, params=()):
+        """First row of a query as a dict, or None"""
+        return self.backend.query_one(sql, params)
 
-        try:
-            cursor.execute('ALTER TABLE users ADD COLUMN plan_expires_at TIMESTAMP')
-        except sqlite3.OperationalError:
-            pass
+    def query_all(self, sql, params=()):
+        """All rows of a query as dicts"""
+        return self.backend.query_all(sql, params)
 
-        # Add Google OAuth columns (UNIQUE constraints can't be added via ALTER TABLE in SQLite)
-        try:
-            cursor.execute('ALTER TABLE users ADD COLUMN google_id TEXT')
-        except sqlite3.OperationalError:
-            pass
-
-        try:
-            cursor.execute('ALTER TABLE users ADD COLUMN google_name TEXT')
-        except sqlite3.OperationalError:
-            pass
+    def init_database(self):
+        """Bring the schema up to date (numbered migrations in backend/migrations.py)"""
+        migrate(self)
+
+    def _cached_user(self, field, value):
+        """User by a unique column, read through the user cache (misses aren't cached)"""
+        username = value if field == 'username' else self._users.get((field, value))
+        if username is not None:
+            user = self._users.get(('username', username))
+            if user:
+                return dict(user)
+
+        user = self.query_one(f'SELECT * FROM users WHERE {field} = ?', (value,))
+        if not user:
+            return None
 
-        conn.commit()
-        conn.close()
+        # Username, email and Google ID never change, so the pointers only go stale with the TTL
+        self._users.set(('username', user['username']), user)
+        for key in ('email', 'google_id'):
+            if user.get(key):
+                self._users.set((key, user[key]), user['username'])
+        return dict(user)
+
+    def _forget_user(self, username=None, email=None):
+        """Drop a user's cached record after writing to it"""
+        if username is None and email is not None:
+            username = self._users.get(('email', email))
+            if username is None:
+                row = self.query_one('SELECT username FROM users WHERE email = ?', (email,))
+                username = row['username'] if row else None
+        if username is not None:
+            self._users.delete(('username', username))
 
     def create_user(self, username, email, password_hash):
         """Create a new user and auto-activate if pending payment exists"""
         try:
             from datetime import timedelta
 
-            conn = self.get_connection()
-            cursor = conn.cursor()
-
-            # Check for pending payment
-            pending = self.get_pending_payment(email)
-
-            if pending:
-                # Create user with payment already activated (monthly subscription)
-                plan_expires_at = datetime.now() + timedelta(days=30)
-                cursor.execute('''
-                    INSERT INTO users (username, email, password_hash, has_paid,
-                                     payment_date, dodo_payment_id, subscription_plan, plan_expires_at)
-                    VALUES (?, ?, ?, 1, ?, ?, ?, ?)
-                ''', (username, email, password_hash, datetime.now(),
-                      pending['payment_id'], pending['subscription_plan'], plan_expires_at))
-
-                # Clear pending payment
-                self.clear_pending_payment(email)
-            else:
-                # Create user normally
-                cursor.execute('''
-                    INSERT INTO users (username, email, password_hash)
-                    VALUES (?, ?, ?)
-                ''', (username, email, password_hash))
-
-            conn.commit()
-            conn.close()
+            with self.transaction() as cursor:
+                # Check for pending payment
+                pending = self.get_pending_payment(email)
+
+                if pending:
+                    # Create user with payment already activated (monthly subscription)
+                    plan_expires_at = datetime.now() + timedelta(days=30)
+                    cursor.execute('''
+                        INSERT INTO users (username, email, password_hash, has_paid,
+                                         payment_date, dodo_payment_id, subscription_plan, plan_expires_at)
+                        VALUES (?, ?, ?, 1, ?, ?, ?, ?)
+                    ''', (username, email, password_hash, datetime.now(),
+                          pending['payment_id'], pending['subscription_plan'], plan_expires_at))
+
+                    # Clear pending payment
+                    self.clear_pending_payment(email)
+                else:
+                    # Create user normally
+                    cursor.execute('''
+                        INSERT INTO users (username, email, password_hash)
+                        VALUES (?, ?, ?)
+                    ''', (username, email, password_hash))
+
+            self._forget_user(username=username)
             return True
-        except sqlite3.IntegrityError:
+        except self.backend.IntegrityError:
             return False
 
     def get_user(self, username):
         """Get user by username"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('SELECT * FROM users WHERE username = ?', (username,))
-        user = cursor.fetchone()
-
-        conn.close()
-
-        if user:
-            return dict(user)
-        return None
+        return self._cached_user('username', username)
 
     def update_last_login(self, username):
         """Update user's last login time"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            UPDATE users
-            SET last_login = ?
-            WHERE username = ?
-        ''', (datetime.now(), username))
-
-        conn.commit()
-        conn.close()
+        with self.transaction() as cursor:
+            cursor.execute('''
+                UPDATE users
+                SET last_login = ?
+                WHERE username = ?
+            ''', (datetime.now(), username))
+        self._forget_user(username=username)
+
+    def update_password_hash(self, username, password_hash):
+        """Replace a user's password hash (e.g. upgraded to current parameters at login)"""
+        with self.transaction() as cursor:
+            cursor.execute('''
+                UPDATE users
+                SET password_hash = ?
+                WHERE username = ?
+            ''', (password_hash, username))
+        self._forget_user(username=username)
+
+    # Resolves the owner inside the INSERT so adding a bot is one statement (no rows if the user is gone)
+    INSERT_BOT_SQL = '''
+        INSERT INTO bots (user_id, bot_name, bot_username, ip_address,
+                        gateway_token, droplet_id, region)
+        SELECT id, ?, ?, ?, ?, ?, ? FROM users WHERE username = ?
+        RETURNING id
+    '''
 
     def add_bot(self, username, bot_name, bot_username, ip_address, gateway_token, droplet_id, region):
-        """Add a new bot"""
-        user = self.get_user(username)
-        if not user:
-            return False
-
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            INSERT INTO bots (user_id, bot_name, bot_username, ip_address,
-                            gateway_token, droplet_id, region)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (user['id'], bot_name, bot_username, ip_address, gateway_token, droplet_id, region))
-
-        conn.commit()
-        conn.close()
-        return True
-
-    def get_user_bots(self, username):
-        """Get all bots for a user"""
-        user = self.get_user(username)
-        if not user:
-            return []
-
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            SELECT * FROM bots
-            WHERE user_id = ?
-            ORDER BY created_at DESC
-        ''', (user['id'],))
+        """Add a new bot (returns the new bot id)"""
+        with self.transaction() as cursor:
+            rows = cursor.execute(self.INSERT_BOT_SQL, (bot_name, bot_username, ip_address, gateway_token,
+                                                        droplet_id, region, username)).fetchall()
+            if not rows:
+                return False
+            return rows[0]['id']
+
+    def add_bots(self, username, bots, region):
+        """Add several bots in a single transaction (returns the new bot ids, in order)
+
+        Raises if the user is gone, so none of the batch is saved.
+        """
+        bot_ids = []
+        with self.transaction() as cursor:
+            for bot in bots:
+                rows = cursor.execute(self.INSERT_BOT_SQL, (bot['bot_username'], bot['bot_username'], bot['ip_address'],
+                                                            bot['gateway_token'], bot['droplet_id'], region, username)).fetchall()
+                if not rows:
+                    # Raising (not returning) rolls back the rows already inserted
+                    raise RuntimeError('User no longer exists')
+                bot_ids.append(rows[0]['id'])
+
+        return bot_ids
+
+    def get_user_bots(self, username, user_id=None):
+        """Get all bots for a user (pass user_id when it is already known to skip the users lookup)"""
+        if user_id is not None:
+            return self.query_all('''
+                SELECT * FROM bots
+                WHERE user_id = ?
+                ORDER BY created_at DESC
+            ''', (user_id,))
 
-        bots = cursor.fetchall()
-        conn.close()
+        return self.query_all('''
+            SELECT bots.* FROM bots
+            JOIN users ON users.id = bots.user_id
+            WHERE users.username = ?
+            ORDER BY bots.created_at DESC
+        ''', (username,))
 
-        return [dict(bot) for bot in bots]
+    def get_all_bots(self):
+        """Get every bot on the platform (admin fleet view)"""
+        return self.query_all('SELECT * FROM bots ORDER BY created_at DESC')
 
     def get_bot(self, bot_id):
         """Get bot by ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('SELECT * FROM bots WHERE id = ?', (bot_id,))
-        bot = cursor.fetchone()
-
-        conn.close()
-
-        if bot:
-            return dict(bot)
-        return None
+        return self.query_one('SELECT * FROM bots WHERE id = ?', (bot_id,))
 
     def delete_bot(self, bot_id):
         """Delete a bot"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-
-            cursor.execute('DELETE FROM bots WHERE id = ?', (bot_id,))
-
-            conn.commit()
-            conn.close()
+            with self.transaction() as cursor:
+                cursor.execute('DELETE FROM bots WHERE id = ?', (bot_id,))
             return True
         except:
             return False
 
-    def update_bot_status(self, bot_id, status):
-        """Update bot status"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    def get_bot_by_droplet_id(self, droplet_id):
+        """Get bot by its DigitalOcean droplet ID"""
+        return self.query_one('SELECT * FROM bots WHERE droplet_id = ?', (droplet_id,))
 
-        cursor.execute('''
-            UPDATE bots
-            SET status = ?
-            WHERE id = ?
-        ''', (status, bot_id))
+    def record_heartbeat(self, bot_id, timestamp, telegram_ready, service_active):
+        """Store a bot's heartbeat unless a newer one was already recorded (returns False for replays)"""
+        with self.transaction() as cursor:
+            cursor.execute('''
+                UPDATE bots
+                SET last_seen_at = ?, heartbeat_ts = ?, telegram_ready = ?, service_active = ?
+                WHERE id = ? AND (heartbeat_ts IS NULL OR heartbeat_ts < ?)
+            ''', (datetime.now(), timestamp, int(telegram_ready), int(service_active), bot_id, timestamp))
+            return cursor.rowcount > 0
 
-        conn.commit()
-        conn.close()
+    def update_bot_status(self, bot_id, status):
+        """Update bot status"""
+        with self.transaction() as cursor:
+            cursor.execute('''
+                UPDATE bots
+                SET status = ?
+                WHERE id = ?
+            ''', (status, bot_id))
 
     def increment_message_count(self, bot_id):
-        """Increment bot's message count"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            UPDATE bots
-            SET message_count = message_count + 1
-            WHERE id = ?
-        ''', (bot_id,))
-
-        conn.commit()
-        conn.close()
+        """Increment bot's message count (unbuffered, app code goes through backend/counters.py)"""
+        with self.transaction() as cursor:
+            cursor.execute('''
+                UPDATE bots
+                SET message_count = message_count + 1
+                WHERE id = ?
+            ''', (bot_id,))
+
+    def add_message_counts(self, counts):
+        """Add buffered message counts ({bot_id: increment}) in a single transaction"""
+        with self.transaction() as cursor:
+            cursor.executemany('''
+                UPDATE bots
+                SET message_count = message_count + ?
+                WHERE id = ?
+            ''', [(count, bot_id) for bot_id, count in counts.items()])
 
     def save_api_keys(self, username, anthropic_key=None):
         """Save user's API keys (DO token is managed by platform)"""
-        user = self.get_user(username)
-        if not user:
-            return False
-
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        # Check if keys exist
-        cursor.execute('SELECT id FROM api_keys WHERE user_id = ?', (user['id'],))
-        existing = cursor.fetchone()
-
-        if existing:
+        with self.transaction() as cursor:
+            # Update existing keys, falling back to an insert for a user's first save
             cursor.execute('''
                 UPDATE api_keys
                 SET anthropic_key = ?, updated_at = ?
-                WHERE user_id = ?
-            ''', (anthropic_key, datetime.now(), user['id']))
-        else:
-            cursor.execute('''
-                INSERT INTO api_keys (user_id, anthropic_key)
-                VALUES (?, ?)
-            ''', (user['id'], anthropic_key))
-
-        conn.commit()
-        conn.close()
-        return True
+                WHERE user_id = (SELECT id FROM users WHERE username = ?)
+            ''', (anthropic_key, datetime.now(), username))
 
-    def get_api_keys(self, username):
-        """Get user's stored API keys"""
-        user = self.get_user(username)
-        if not user:
-            return None
-
-        conn = self.get_connection()
-        cursor = conn.cursor()
+            if not cursor.rowcount:
+                cursor.execute('''
+                    INSERT INTO api_keys (user_id, anthropic_key)
+                    SELECT id, ? FROM users WHERE username = ?
+                ''', (anthropic_key, username))
+                return cursor.rowcount > 0
 
-        cursor.execute('SELECT * FROM api_keys WHERE user_id = ?', (user['id'],))
-        keys = cursor.fetchone()
+        return True
 
-        conn.close()
+    def get_api_keys(self, username, user_id=None):
+        """Get user's stored API keys (pass user_id when it is already known to skip the users lookup)"""
+        if user_id is not None:
+            return self.query_one('SELECT * FROM api_keys WHERE user_id = ?', (user_id,))
 
-        if keys:
-            return dict(keys)
-        return None
+        return self.query_one('''
+            SELECT api_keys.* FROM api_keys
+            JOIN users ON users.id = api_keys.user_id
+            WHERE users.username = ?
+        ''', (username,))
 
     def get_user_by_email(self, email):
         """Get user by email"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('SELECT * FROM users WHERE email = ?', (email,))
-        user = cursor.fetchone()
-
-        conn.close()
-
-        if user:
-            return dict(user)
-        return None
+        return self._cached_user('email', email)
 
     def get_user_by_google_id(self, google_id):
         """Get user by Google ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('SELECT * FROM users WHERE google_id = ?', (google_id,))
-        user = cursor.fetchone()
-
-        conn.close()
-
-        if user:
-            return dict(user)
-        return None
+        return self._cached_user('google_id', google_id)
 
     def create_google_user(self, username, email, google_id, google_name):
         """Create a new user via Google OAuth"""
         try:
             from datetime import timedelta
 
-            conn = self.get_connection()
-            cursor = conn.cursor()
-
-            # Check for pending payment
-            pending = self.get_pending_payment(email)
-
-            if pending:
-                # Create user with payment already activated (monthly subscription)
-                plan_expires_at = datetime.now() + timedelta(days=30)
-                cursor.execute('''
-                    INSERT INTO users (username, email, password_hash, google_id, google_name,
-                                     has_paid, payment_date, dodo_payment_id, subscription_plan, plan_expires_at)
-                    VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?, ?)
-                ''', (username, email, '', google_id, google_name, datetime.now(),
-                      pending['payment_id'], pending['subscription_plan'], plan_expires_at))
-
-                # Clear pending payment
-                self.clear_pending_payment(email)
-            else:
-                # Create user normally (password_hash is empty for OAuth users)
-                cursor.execute('''
-                    INSERT INTO users (username, email, password_hash, google_id, google_name)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (username, email, '', google_id, google_name))
-
-            conn.commit()
-            conn.close()
+            with self.transaction() as cursor:
+                # Check for pending payment
+                pending = self.get_pending_payment(email)
+
+                if pending:
+                    # Create user with payment already activated (monthly subscription)
+                    plan_expires_at = datetime.now() + timedelta(days=30)
+                    cursor.execute('''
+                        INSERT INTO users (username, email, password_hash, google_id, google_name,
+                                         has_paid, payment_date, dodo_payment_id, subscription_plan, plan_expires_at)
+                        VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?, ?)
+                    ''', (username, email, '', google_id, google_name, datetime.now(),
+                          pending['payment_id'], pending['subscription_plan'], plan_expires_at))
+
+                    # Clear pending payment
+                    self.clear_pending_payment(email)
+                else:
+                    # Create user normally (password_hash is empty for OAuth users)
+                    cursor.execute('''
+                        INSERT INTO users (username, email, password_hash, google_id, google_name)
+                        VALUES (?, ?, ?, ?, ?)
+                    ''', (username, email, '', google_id, google_name))
+
+            self._forget_user(username=username)
             return True
-        except sqlite3.IntegrityError as e:
+        except self.backend.IntegrityError as e:
             print(f"Database error: {e}")
             return False
 
@@ -395,77 +313,296 @@ class Database:
         """Update user payment status"""
         from datetime import timedelta
 
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
         # Monthly subscription — expires in 30 days (Dodo handles recurring billing)
         plan_expires_at = datetime.now() + timedelta(days=30)
 
-        cursor.execute('''
-            UPDATE users
-            SET has_paid = 1,
-                payment_date = ?,
-                dodo_payment_id = ?,
-                subscription_plan = ?,
-                plan_expires_at = ?
-            WHERE email = ?
-        ''', (datetime.now(), payment_id, subscription_plan, plan_expires_at, email))
+        with self.transaction() as cursor:
+            cursor.execute('''
+                UPDATE users
+                SET has_paid = 1,
+                    payment_date = ?,
+                    dodo_payment_id = ?,
+                    subscription_plan = ?,
+                    plan_expires_at = ?
+                WHERE email = ?
+            ''', (datetime.now(), payment_id, subscription_plan, plan_expires_at, email))
 
-        conn.commit()
-        conn.close()
+        self._forget_user(email=email)
         return True
 
     def store_pending_payment(self, email, payment_id, subscription_plan='monthly'):
         """Store pending payment for users who haven't registered yet"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.transaction() as cursor:
+            # First try to update existing user (if they exist)
+            user = self.get_user_by_email(email)
+            if user:
+                cursor.execute('''
+                    UPDATE users
+                    SET dodo_payment_id = ?,
+                        subscription_plan = 'pending_monthly'
+                    WHERE email = ?
+                ''', (payment_id, email))
+            else:
+                # Store in pending_payments table for future registration
+                cursor.execute('''
+                    INSERT INTO pending_payments (email, payment_id, subscription_plan)
+                    VALUES (?, ?, ?)
+                ''', (email, payment_id, subscription_plan))
 
-        # First try to update existing user (if they exist)
-        user = self.get_user_by_email(email)
         if user:
-            cursor.execute('''
-                UPDATE users
-                SET dodo_payment_id = ?,
-                    subscription_plan = 'pending_monthly'
-                WHERE email = ?
-            ''', (payment_id, email))
-        else:
-            # Store in pending_payments table for future registration
-            cursor.execute('''
-                INSERT INTO pending_payments (email, payment_id, subscription_plan)
-                VALUES (?, ?, ?)
-            ''', (email, payment_id, subscription_plan))
-
-        conn.commit()
-        conn.close()
+            self._forget_user(username=user['username'])
         return True
 
     def get_pending_payment(self, email):
         """Get pending payment for an email"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
+        return self.query_one('''
             SELECT * FROM pending_payments
             WHERE email = ?
             ORDER BY created_at DESC
             LIMIT 1
         ''', (email,))
 
-        payment = cursor.fetchone()
-        conn.close()
+    def clear_pending_payment(self, email):
+        """Clear pending payment after user registration"""
+        with self.transaction() as cursor:
+            cursor.execute('DELETE FROM pending_payments WHERE email = ?', (email,))
+        return True
+
+    # ========== DEPLOY JOBS ==========
 
-        if payment:
-            return dict(payment)
+    DEPLOY_JOB_FIELDS = ('status', 'phase', 'payload', 'droplet_id', 'ip_address', 'gateway_token',
+                         'bot_username', 'bot_id', 'result', 'error', 'worker', 'lease_expires_at')
+
+    def create_deploy_job(self, job_id, username, payload, kind='deploy', region=None, size=None):
+        """Queue a new deploy job"""
+        with self.transaction() as cursor:
+            cursor.execute('''
+                INSERT INTO deploy_jobs (id, kind, username, region, size, payload, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (job_id, kind, username, region, size, payload, datetime.now(), datetime.now()))
+        return True
+
+    def create_unique_job(self, job_id, kind, payload, cooldown_seconds):
+        """Queue a maintenance job unless one of the same kind is pending or ran recently"""
+        from datetime import timedelta
+
+        now = datetime.now()
+        with self.transaction() as cursor:
+            # Single INSERT ... WHERE NOT EXISTS so concurrent workers can't queue duplicates
+            # (Postgres doesn't serialize writers like SQLite, so it also takes a per-kind lock)
+            self.backend.serialize(cursor, f'unique-job:{kind}')
+            cursor.execute('''
+                INSERT INTO deploy_jobs (id, kind, payload, created_at, updated_at)
+                SELECT ?, ?, ?, ?, ?
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM deploy_jobs
+                    WHERE kind = ?
+                      AND (status IN ('queued', 'running') OR created_at > ?)
+                )
+            ''', (job_id, kind, payload, now, now, kind, now - timedelta(seconds=cooldown_seconds)))
+            return cursor.rowcount > 0
+
+    def get_deploy_job(self, job_id):
+        """Get deploy job by ID"""
+        return self.query_one('SELECT * FROM deploy_jobs WHERE id = ?', (job_id,))
+
+    def claim_deploy_job(self, worker, lease_seconds, max_attempts):
+        """Atomically claim the oldest queued job (or one whose worker lease expired)"""
+        from datetime import timedelta
+
+        now = datetime.now()
+        with self.transaction() as cursor:
+            # Single UPDATE so two workers (threads or gunicorn processes) can never claim the same job
+            cursor.execute(f'''
+                UPDATE deploy_jobs
+                SET status = 'running',
+                    worker = ?,
+                    lease_expires_at = ?,
+                    attempts = attempts + 1,
+                    updated_at = ?
+                WHERE id = (
+                    SELECT id FROM deploy_jobs
+                    WHERE (status = 'queued' OR (status = 'running' AND lease_expires_at < ?))
+                      AND attempts < ?
+                    ORDER BY created_at
+                    LIMIT 1
+                    {self.backend.SKIP_LOCKED}
+                )
+            ''', (worker, now + timedelta(seconds=lease_seconds), now, now, max_attempts))
+
+            if not cursor.rowcount:
+                return None
+            cursor.execute("SELECT * FROM deploy_jobs WHERE worker = ? AND status = 'running'", (worker,))
+            job = cursor.fetchone()
+
+        if job:
+            return dict(job)
         return None
 
-    def clear_pending_payment(self, email):
-        """Clear pending payment after user registration"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    def update_deploy_job(self, job_id, **fields):
+        """Update deploy job fields (phase, status, droplet info, lease...)"""
+        columns = [name for name in fields if name in self.DEPLOY_JOB_FIELDS]
+        if not columns:
+            return False
 
-        cursor.execute('DELETE FROM pending_payments WHERE email = ?', (email,))
+        assignments = ', '.join(f'{name} = ?' for name in columns)
+        with self.transaction() as cursor:
+            cursor.execute(f'''
+                UPDATE deploy_jobs
+                SET {assignments}, updated_at = ?
+                WHERE id = ?
+            ''', [fields[name] for name in columns] + [datetime.now(), job_id])
+        return True
 
-        conn.commit()
-        conn.close()
+    def count_recent_deploys(self, region, size, since):
+        """Count deploy jobs queued for a region/size since a given time"""
+        row = self.query_one('''
+            SELECT COUNT(*) AS count FROM deploy_jobs
+            WHERE kind = 'deploy' AND region = ? AND size = ? AND created_at > ?
+        ''', (region, size, since))
+        return row['count']
+
+    def fail_abandoned_deploy_jobs(self, max_attempts):
+        """Mark jobs that crashed on every attempt as failed"""
+        with self.transaction() as cursor:
+            cursor.execute('''
+                UPDATE deploy_jobs
+                SET status = 'failed',
+                    phase = 'failed',
+                    payload = NULL,
+                    error = 'Deployment worker stopped responding',
+                    updated_at = ?
+                WHERE status = 'running' AND lease_expires_at < ? AND attempts >= ?
+            ''', (datetime.now(), datetime.now(), max_attempts))
+            return cursor.rowcount
+
+    # ========== SNAPSHOTS ==========
+
+    def add_snapshot(self, snapshot_id, name, region, size):
+        """Record a freshly built golden snapshot"""
+        with self.transaction() as cursor:
+            cursor.execute('''
+                INSERT INTO snapshots (snapshot_id, name, region, size, created_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (str(snapshot_id), name, region, size, datetime.now()))
         return True
+
+    def get_snapshots(self, region, status='ready'):
+        """Get snapshots for a region, newest first"""
+        return self.query_all('''
+            SELECT * FROM snapshots
+            WHERE region = ? AND status = ?
+            ORDER BY created_at DESC
+        ''', (region, status))
+
+    def get_latest_snapshot(self, region):
+        """Get the newest usable snapshot for a region"""
+        snapshots = self.get_snapshots(region)
+        if snapshots:
+            return snapshots[0]
+        return None
+
+    def update_snapshot_status(self, snapshot_id, status):
+        """Update snapshot status (ready, unusable, deleted)"""
+        with self.transaction() as cursor:
+            cursor.execute('''
+                UPDATE snapshots
+                SET status = ?
+                WHERE snapshot_id = ?
+            ''', (status, str(snapshot_id)))
+        return True
+
+    # ========== WARM POOL ==========
+
+    def add_warm_droplet(self, droplet_id, region, size):
+        """Register a warm pool droplet that is still booting"""
+        with self.transaction() as cursor:
+            cursor.execute('''
+                INSERT INTO warm_droplets (droplet_id, region, size, created_at)
+                VALUES (?, ?, ?, ?)
+            ''', (droplet_id, region, size, datetime.now()))
+        return True
+
+    def get_warm_droplets(self, region, size, status=None):
+        """Get warm pool droplets for a region/size, oldest first"""
+        if status:
+            return self.query_all('''
+                SELECT * FROM warm_droplets
+                WHERE region = ? AND size = ? AND status = ?
+                ORDER BY created_at
+            ''', (region, size, status))
+
+        return self.query_all('''
+            SELECT * FROM warm_droplets
+            WHERE region = ? AND size = ?
+            ORDER BY created_at
+        ''', (region, size))
+
+    def mark_warm_droplet_idle(self, droplet_id, ip_address):
+        """Mark a warm droplet as booted and ready to claim"""
+        with self.transaction() as cursor:
+            cursor.execute('''
+                UPDATE warm_droplets
+                SET status = 'idle', ip_address = ?
+                WHERE droplet_id = ? AND status = 'booting'
+            ''', (ip_address, droplet_id))
+        return True
+
+    def claim_warm_droplet(self, region, size, claim_token):
+        """Atomically claim the oldest idle warm droplet"""
+        with self.transaction() as cursor:
+            cursor.execute(f'''
+                UPDATE warm_droplets
+                SET status = 'claimed', claim_token = ?, claimed_at = ?
+                WHERE id = (
+                    SELECT id FROM warm_droplets
+                    WHERE region = ? AND size = ? AND status = 'idle'
+                    ORDER BY created_at
+                    LIMIT 1
+                    {self.backend.SKIP_LOCKED}
+                )
+            ''', (claim_token, datetime.now(), region, size))
+
+            if not cursor.rowcount:
+                return None
+            cursor.execute('SELECT * FROM warm_droplets WHERE claim_token = ?', (claim_token,))
+            droplet = cursor.fetchone()
+
+        if droplet:
+            return dict(droplet)
+        return None
+
+    def delete_warm_droplet(self, droplet_id):
+        """Remove a droplet from the warm pool (handed off or destroyed)"""
+        with self.transaction() as cursor:
+            cursor.execute('DELETE FROM warm_droplets WHERE droplet_id = ?', (droplet_id,))
+        return True
+
+    # ========== MESSAGE USAGE ==========
+
+    USAGE_TABLES = {'minute': 'usage_minute', 'hour': 'usage_hour', 'day': 'usage_day'}
+
+    def record_usage(self, buckets):
+        """Add message counts to the usage tables ({resolution: {(bot_id, bucket): count}}) in one transaction"""
+        with self.transaction() as cursor:
+            for resolution, counts in buckets.items():
+                cursor.executemany(f'''
+                    INSERT INTO {self.USAGE_TABLES[resolution]} (bot_id, bucket, messages)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT (bot_id, bucket) DO UPDATE
+                    SET messages = {self.USAGE_TABLES[resolution]}.messages + excluded.messages
+                ''', [(bot_id, bucket, count) for (bot_id, bucket), count in counts.items()])
+
+    def get_usage(self, bot_id, resolution, since):
+        """A bot's usage buckets at one resolution starting at or after a unix time"""
+        return self.query_all(f'''
+            SELECT bucket, messages FROM {self.USAGE_TABLES[resolution]}
+            WHERE bot_id = ? AND bucket >= ?
+            ORDER BY bucket
+        ''', (bot_id, since))
+
+    def prune_usage(self, resolution, before):
+        """Delete usage buckets older than a unix time (returns rows deleted)"""
+        with self.transaction() as cursor:
+            cursor.execute(f'DELETE FROM {self.USAGE_TABLES[resolution]} WHERE bucket < ?', (before,))
+            return cursor.rowcount
@@ -9,7 +9,9 @@ import time
 import secrets
 import string
 import subprocess
+import tempfile
 import requests
+from concurrent.futures import ThreadPoolExecutor
 
 # Add parent directory to path to import the deployment script
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -20,6 +22,17 @@ except ImportError:
     subprocess.check_call([sys.executable, "-m", "pip", "install", "-q", "pydo"])
     from pydo import Client
 
+from backend.heartbeat import AGENT_CONFIG, AGENT_PATH, AGENT_SCRIPT, HEARTBEAT_SECONDS, MESSAGE_LOG_PATTERN, heartbeat_url
+from backend.probe import PROBE_PATH, PROBE_SCRIPT, run_probe
+from backend.readiness import WATCH_TAG, get_watcher
+from backend.ssh import ssh_pool
+
+# DigitalOcean accepts at most this many names in one multi-droplet create
+MAX_NAMES_PER_CREATE = 10
+
+# Host keys of droplets we push secrets to are pinned on first contact (see run_remote_script)
+PINNED_HOSTS_FILE = os.path.join(tempfile.gettempdir(), 'openclaw_pinned_known_hosts')
+
 class BotDeployer:
     def __init__(self, do_token):
         """Initialize deployer with DigitalOcean token"""
@@ -44,49 +57,9 @@ class BotDeployer:
             pass
         return 'unknown_bot'
 
-    def create_cloud_init_script(self, telegram_token, nvidia_key, gateway_token, openrouter_key=None, has_ssh_keys=False):
-        """Create cloud-init script for bot deployment with security hardening"""
-
-        # Conditional SSH hardening based on whether SSH keys are present
-        ssh_hardening = ""
-        if has_ssh_keys:
-            # Full SSH hardening - disable password auth (safe because SSH keys exist)
-            ssh_hardening = """
-# Harden SSH - Disable root login and password authentication
-sed -i 's/#*PermitRootLogin.*/PermitRootLogin prohibit-password/' /etc/ssh/sshd_config
-sed -i 's/#*PasswordAuthentication.*/PasswordAuthentication no/' /etc/ssh/sshd_config
-sed -i 's/#*PubkeyAuthentication.*/PubkeyAuthentication yes/' /etc/ssh/sshd_config
-# Ubuntu 24.04 uses 'ssh' service name, not 'sshd'
-systemctl reload ssh 2>/dev/null || systemctl reload sshd 2>/dev/null || true
-"""
-        else:
-            # Partial SSH hardening - keep password auth but disable root login
-            # (User has no SSH keys, so we can't lock them out)
-            ssh_hardening = """
-# Partial SSH hardening - Disable root password login only
-sed -i 's/#*PermitRootLogin.*/PermitRootLogin no/' /etc/ssh/sshd_config
-sed -i 's/#*PubkeyAuthentication.*/PubkeyAuthentication yes/' /etc/ssh/sshd_config
-# Ubuntu 24.04 uses 'ssh' service name, not 'sshd'
-systemctl reload ssh 2>/dev/null || systemctl reload sshd 2>/dev/null || true
-"""
-
-        # Build model fallbacks — only use OpenRouter if key is provided
-        if openrouter_key:
-            model_fallbacks = '["openrouter/anthropic/claude-sonnet-4.6", "openrouter/anthropic/claude-sonnet-4.5"]'
-            openrouter_auth = f"""
-      "openrouter:default": {{
-        "provider": "openrouter",
-        "mode": "token"
-      }}"""
-            openrouter_env = f"\nOPENROUTER_API_KEY={openrouter_key}"
-        else:
-            model_fallbacks = '[]'
-            openrouter_auth = ''
-            openrouter_env = ''
-
-        return f"""#!/bin/bash
-set -e
-
+    def create_base_script(self):
+        """Static provisioning steps shared by every bot (baked into the golden snapshot)"""
+        return """
 # Update system
 apt-get update
 DEBIAN_FRONTEND=noninteractive apt-get upgrade -y -o Dpkg::Options::="--force-confdef" -o Dpkg::Options::="--force-confold"
@@ -108,7 +81,7 @@ ufw default allow outgoing
 ufw allow ssh
 # Gateway port 18789 is NOT exposed to internet (only localhost/LAN access)
 ufw --force enable
-{ssh_hardening}
+
 # Configure fail2ban for SSH brute force protection
 cat > /etc/fail2ban/jail.local << 'FAIL2BAN_EOF'
 [DEFAULT]
@@ -141,6 +114,97 @@ chmod 750 /var/lib/openclaw/.openclaw/cron
 # (doctor overwrites openclaw.json, so we must run it before writing our version)
 su - openclaw -s /bin/bash -c "cd /var/lib/openclaw && HOME=/var/lib/openclaw openclaw doctor --fix --yes" || true
 
+# Create daily cleanup script for backup files
+cat > /etc/cron.daily/openclaw-cleanup << 'CLEANUP_EOF'
+#!/bin/bash
+# Remove backup files with secrets
+find /var/lib/openclaw/.openclaw -type f \\( -name "*.bak" -o -name "*.backup" -o -name "*~" \\) -delete 2>/dev/null || true
+CLEANUP_EOF
+chmod +x /etc/cron.daily/openclaw-cleanup
+
+# Create systemd service with security hardening
+cat > /etc/systemd/system/openclaw-gateway.service << 'EOF'
+[Unit]
+Description=OpenClaw Gateway
+After=network-online.target
+Wants=network-online.target
+
+[Service]
+Type=simple
+User=openclaw
+Group=openclaw
+WorkingDirectory=/var/lib/openclaw
+Environment="NODE_ENV=production"
+Environment="HOME=/var/lib/openclaw"
+EnvironmentFile=/var/lib/openclaw/.openclaw/.env
+ExecStart=/usr/bin/openclaw gateway --bind loopback --port 18789
+Restart=always
+RestartSec=10
+StandardOutput=journal
+StandardError=journal
+SyslogIdentifier=openclaw
+
+# Security hardening
+NoNewPrivileges=true
+PrivateTmp=true
+ProtectSystem=strict
+ProtectHome=true
+ReadWritePaths=/var/lib/openclaw
+ProtectKernelTunables=true
+ProtectControlGroups=true
+RestrictRealtime=true
+RestrictNamespaces=true
+
+[Install]
+WantedBy=multi-user.target
+EOF
+
+# Register the service (it is enabled and started once the bot config is written)
+systemctl daemon-reload
+"""
+
+    def create_ssh_hardening_script(self, has_ssh_keys=False):
+        """SSH hardening, full if SSH keys exist (otherwise we'd lock everyone out)"""
+        if has_ssh_keys:
+            # Full SSH hardening - disable password auth (safe because SSH keys exist)
+            return """
+# Harden SSH - Disable root login and password authentication
+sed -i 's/#*PermitRootLogin.*/PermitRootLogin prohibit-password/' /etc/ssh/sshd_config
+sed -i 's/#*PasswordAuthentication.*/PasswordAuthentication no/' /etc/ssh/sshd_config
+sed -i 's/#*PubkeyAuthentication.*/PubkeyAuthentication yes/' /etc/ssh/sshd_config
+# Ubuntu 24.04 uses 'ssh' service name, not 'sshd'
+systemctl reload ssh 2>/dev/null || systemctl reload sshd 2>/dev/null || true
+"""
+
+        # Partial SSH hardening - keep password auth but disable root login
+        # (User has no SSH keys, so we can't lock them out)
+        return """
+# Partial SSH hardening - Disable root password login only
+sed -i 's/#*PermitRootLogin.*/PermitRootLogin no/' /etc/ssh/sshd_config
+sed -i 's/#*PubkeyAuthentication.*/PubkeyAuthentication yes/' /etc/ssh/sshd_config
+# Ubuntu 24.04 uses 'ssh' service name, not 'sshd'
+systemctl reload ssh 2>/dev/null || systemctl reload sshd 2>/dev/null || true
+"""
+
+    def create_bot_config_script(self, telegram_token, nvidia_key, gateway_token, openrouter_key=None, has_ssh_keys=False):
+        """Per-bot steps: SSH hardening, OpenClaw config, secrets and service start"""
+        ssh_hardening = self.create_ssh_hardening_script(has_ssh_keys)
+
+        # Build model fallbacks — only use OpenRouter if key is provided
+        if openrouter_key:
+            model_fallbacks = '["openrouter/anthropic/claude-sonnet-4.6", "openrouter/anthropic/claude-sonnet-4.5"]'
+            openrouter_auth = f"""
+      "openrouter:default": {{
+        "provider": "openrouter",
+        "mode": "token"
+      }}"""
+            openrouter_env = f"\nOPENROUTER_API_KEY={openrouter_key}"
+        else:
+            model_fallbacks = '[]'
+            openrouter_auth = ''
+            openrouter_env = ''
+
+        return f"""{ssh_hardening}
 # Now write our OpenClaw configuration (overwrites whatever doctor wrote)
 cat > /var/lib/openclaw/.openclaw/openclaw.json << 'EOF'
 {{
@@ -258,124 +322,192 @@ chown openclaw:openclaw /var/lib/openclaw/.openclaw/.env
 chown openclaw:openclaw /var/lib/openclaw/.openclaw/openclaw.json
 
 # Remove any backup files doctor may have created (they contain secrets)
-find /var/lib/openclaw/.openclaw -type f \( -name "*.bak" -o -name "*.backup" -o -name "*~" \) -delete
+find /var/lib/openclaw/.openclaw -type f \\( -name "*.bak" -o -name "*.backup" -o -name "*~" \\) -delete
 
-# Create daily cleanup script for backup files
-cat > /etc/cron.daily/openclaw-cleanup << 'CLEANUP_EOF'
-#!/bin/bash
-# Remove backup files with secrets
-find /var/lib/openclaw/.openclaw -type f \( -name "*.bak" -o -name "*.backup" -o -name "*~" \) -delete 2>/dev/null || true
-CLEANUP_EOF
-chmod +x /etc/cron.daily/openclaw-cleanup
+# Enable and start the service
+systemctl enable openclaw-gateway
+systemctl restart openclaw-gateway
+{self.create_agent_script()}"""
+
+    def create_agent_script(self):
+        """Status probe and heartbeat agent (installed per bot so they never lag behind an old snapshot)"""
+        url = heartbeat_url()
+
+        return f"""
+# Status/log probe the dashboard runs in one SSH round trip
+cat > {PROBE_PATH} << 'PROBE_EOF'
+{PROBE_SCRIPT}PROBE_EOF
+chmod 755 {PROBE_PATH}
+rm -f /var/lib/openclaw-probe/state.json
+
+# Heartbeat agent: pushes signed gateway status to the dashboard every {HEARTBEAT_SECONDS}s
+cat > {AGENT_PATH} << 'AGENT_EOF'
+{AGENT_SCRIPT}AGENT_EOF
+chmod 755 {AGENT_PATH}
+
+cat > {AGENT_CONFIG} << 'EOF'
+HEARTBEAT_URL={url or ''}
+MESSAGE_PATTERN={MESSAGE_LOG_PATTERN}
+EOF
 
-# Create systemd service with security hardening
-cat > /etc/systemd/system/openclaw-gateway.service << 'EOF'
+cat > /etc/systemd/system/openclaw-heartbeat.service << 'EOF'
 [Unit]
-Description=OpenClaw Gateway
+Description=OpenClaw heartbeat
 After=network-online.target
-Wants=network-online.target
 
 [Service]
-Type=simple
-User=openclaw
-Group=openclaw
-WorkingDirectory=/var/lib/openclaw
-Environment="NODE_ENV=production"
-Environment="HOME=/var/lib/openclaw"
-EnvironmentFile=/var/lib/openclaw/.openclaw/.env
-ExecStart=/usr/bin/openclaw gateway --bind loopback --port 18789
-Restart=always
-RestartSec=10
-StandardOutput=journal
-StandardError=journal
-SyslogIdentifier=openclaw
+Type=oneshot
+ExecStart=/usr/bin/python3 {AGENT_PATH}
+EOF
 
-# Security hardening
-NoNewPrivileges=true
-PrivateTmp=true
-ProtectSystem=strict
-ProtectHome=true
-ReadWritePaths=/var/lib/openclaw
-ProtectKernelTunables=true
-ProtectControlGroups=true
-RestrictRealtime=true
-RestrictNamespaces=true
+cat > /etc/systemd/system/openclaw-heartbeat.timer << 'EOF'
+[Unit]
+Description=OpenClaw heartbeat every {HEARTBEAT_SECONDS}s
+
+[Timer]
+OnBootSec={HEARTBEAT_SECONDS}s
+OnUnitActiveSec={HEARTBEAT_SECONDS}s
+AccuracySec=5s
 
 [Install]
-WantedBy=multi-user.target
+WantedBy=timers.target
 EOF
 
-# Enable and start the service
 systemctl daemon-reload
-systemctl enable openclaw-gateway
-systemctl start openclaw-gateway
+systemctl enable --now openclaw-heartbeat.timer
+"""
+
+    def create_cloud_init_script(self, telegram_token, nvidia_key, gateway_token, openrouter_key=None, has_ssh_keys=False, from_snapshot=False):
+        """Create cloud-init script for bot deployment with security hardening"""
+        # Droplets booted from the golden snapshot already have everything in the base script
+        base_script = '' if from_snapshot else self.create_base_script()
+        config_script = self.create_bot_config_script(
+            telegram_token,
+            nvidia_key,
+            gateway_token,
+            openrouter_key=openrouter_key,
+            has_ssh_keys=has_ssh_keys
+        )
 
+        return f"""#!/bin/bash
+set -e
+{base_script}{config_script}
 echo "OpenClaw deployment completed with security hardening!"
 """
 
-    def deploy(self, telegram_token, nvidia_key, openrouter_key=None, region='nyc3', size='s-2vcpu-4gb', bot_name='openclaw-bot'):
-        """Deploy a new bot"""
+    def create_snapshot_script(self):
+        """Create cloud-init script for the snapshot builder droplet (base install, then power off)"""
+        return f"""#!/bin/bash
+set -e
+{self.create_base_script()}
+# Shrink the image and drop builder logs before snapshotting
+apt-get clean
+journalctl --rotate && journalctl --vacuum-time=1s || true
+truncate -s 0 /var/log/cloud-init-output.log || true
+
+# Powering off tells the snapshot builder the image is ready
+shutdown -h now
+"""
+
+    def create_warm_script(self, from_snapshot=False):
+        """Create cloud-init script for a warm pool droplet (everything except the per-bot config)"""
+        # Warm droplets are only used when SSH keys exist (config is pushed over SSH), so harden fully
+        base_script = '' if from_snapshot else self.create_base_script()
+
+        return f"""#!/bin/bash
+set -e
+{base_script}{self.create_ssh_hardening_script(has_ssh_keys=True)}
+# Tell the warm pool this droplet can be handed to a bot
+touch /var/lib/openclaw/.warm-ready
+"""
+
+    def get_ssh_key_ids(self):
+        """Get platform SSH key IDs (empty if none or on API error)"""
         try:
-            # Generate gateway token
-            gateway_token = self.generate_token()
+            ssh_keys_resp = self.client.ssh_keys.list()
+            return [key["id"] for key in ssh_keys_resp["ssh_keys"]]
+        except:
+            return []
+
+    def create_droplet(self, telegram_token, nvidia_key, openrouter_key=None, region='nyc3', size='s-2vcpu-4gb', bot_name='openclaw-bot', bot_username=None, image=None):
+        """Create the bot droplet without waiting for it to boot (image: golden snapshot id, if any)"""
+        # Generate gateway token
+        gateway_token = self.generate_token()
 
-            # Get bot username
+        # Get bot username
+        if not bot_username:
             bot_username = self.get_bot_username(telegram_token)
 
-            # Get SSH keys
-            ssh_key_ids = []
-            try:
-                ssh_keys_resp = self.client.ssh_keys.list()
-                ssh_key_ids = [key["id"] for key in ssh_keys_resp["ssh_keys"]]
-            except:
-                pass
+        # Get SSH keys
+        ssh_key_ids = self.get_ssh_key_ids()
+
+        # Create cloud-init script with conditional SSH hardening
+        user_data = self.create_cloud_init_script(
+            telegram_token,
+            nvidia_key,
+            gateway_token,
+            openrouter_key=openrouter_key,
+            has_ssh_keys=bool(ssh_key_ids),  # Full hardening only if keys exist
+            from_snapshot=bool(image)
+        )
+
+        # Create droplet
+        droplet_name = f"{bot_name}-{int(time.time())}"
+        req = {
+            "name": droplet_name,
+            "region": region,
+            "size": size,
+            "image": image or "ubuntu-24-04-x64",
+            "ssh_keys": ssh_key_ids,
+            "backups": False,
+            "ipv6": True,
+            "monitoring": True,
+            "tags": ["openclaw", "saas", "bot", WATCH_TAG],
+            "user_data": user_data
+        }
+
+        resp = self.client.droplets.create(body=req)
+        actions = resp.get("links", {}).get("actions", [])
+
+        return {
+            'droplet_id': resp["droplet"]["id"],
+            'action_id': actions[0]["id"] if actions else None,
+            'gateway_token': gateway_token,
+            'bot_username': bot_username
+        }
+
+    def wait_for_ip(self, droplet_id, max_wait=120, on_phase=None, action_id=None):
+        """Wait for droplet to become active and return its public IP (None on timeout or failed create)"""
+        on_active = (lambda: on_phase('droplet-active')) if on_phase else None
+
+        # Shared watcher: one droplets.list for all in-flight deploys instead of a get per droplet
+        future = get_watcher(self.do_token).watch(
+            droplet_id,
+            action_id=action_id,
+            timeout=max_wait,
+            on_active=on_active
+        )
+
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"❌ Droplet {droplet_id} not ready: {str(e)}")
+            return None
 
-            # Create cloud-init script with conditional SSH hardening
-            user_data = self.create_cloud_init_script(
+    def deploy(self, telegram_token, nvidia_key, openrouter_key=None, region='nyc3', size='s-2vcpu-4gb', bot_name='openclaw-bot'):
+        """Deploy a new bot (blocks until the droplet has an IP address)"""
+        try:
+            created = self.create_droplet(
                 telegram_token,
                 nvidia_key,
-                gateway_token,
                 openrouter_key=openrouter_key,
-                has_ssh_keys=bool(ssh_key_ids)  # Full hardening only if keys exist
+                region=region,
+                size=size,
+                bot_name=bot_name
             )
 
-            # Create droplet
-            droplet_name = f"{bot_name}-{int(time.time())}"
-            req = {
-                "name": droplet_name,
-                "region": region,
-                "size": size,
-                "image": "ubuntu-24-04-x64",
-                "ssh_keys": ssh_key_ids,
-                "backups": False,
-                "ipv6": True,
-                "monitoring": True,
-                "tags": ["openclaw", "saas", "bot"],
-                "user_data": user_data
-            }
-
-            resp = self.client.droplets.create(body=req)
-            droplet_id = resp["droplet"]["id"]
-
             # Wait for droplet to become active
-            max_wait = 120  # 2 minutes
-            start_time = time.time()
-            ip_address = None
-
-            while time.time() - start_time < max_wait:
-                droplet = self.client.droplets.get(droplet_id=droplet_id)
-                status = droplet["droplet"]["status"]
-
-                if status == "active":
-                    networks = droplet["droplet"]["networks"]["v4"]
-                    ip_address = next(
-                        (net["ip_address"] for net in networks if net["type"] == "public"),
-                        None
-                    )
-                    if ip_address:
-                        break
-
-                time.sleep(5)
+            ip_address = self.wait_for_ip(created['droplet_id'], action_id=created['action_id'])
 
             if not ip_address:
                 return {
@@ -385,10 +517,10 @@ echo "OpenClaw deployment completed with security hardening!"
 
             return {
                 'success': True,
-                'droplet_id': droplet_id,
+                'droplet_id': created['droplet_id'],
                 'ip_address': ip_address,
-                'gateway_token': gateway_token,
-                'bot_username': bot_username,
+                'gateway_token': created['gateway_token'],
+                'bot_username': created['bot_username'],
                 'gateway_url': f'ws://127.0.0.1:18789'  # Gateway is localhost-only for security
             }
 
@@ -398,6 +530,96 @@ echo "OpenClaw deployment completed with security hardening!"
                 'error': str(e)
             }
 
+    def push_bot_config(self, ip_address, telegram_token, nvidia_key, gateway_token, openrouter_key=None):
+        """Write the bot's config on an already provisioned droplet over SSH and start the gateway"""
+        config_script = self.create_bot_config_script(
+            telegram_token,
+            nvidia_key,
+            gateway_token,
+            openrouter_key=openrouter_key,
+            has_ssh_keys=True
+        )
+        script = f"set -e\nrm -f /var/lib/openclaw/.warm-ready\n{config_script}"
+
+        result = run_remote_script(ip_address, script, timeout=120, known_hosts_file=PINNED_HOSTS_FILE)
+        if result.returncode != 0:
+            raise RuntimeError(f"Config push failed: {result.stderr.strip()[-200:]}")
+
+    def wait_for_warm_ready(self, ip_address, max_wait=1800):
+        """Wait until a droplet booted with create_warm_script has finished provisioning"""
+        # Fresh droplet may reuse the IP of one we pinned before
+        forget_host_key(ip_address)
+        start_time = time.time()
+
+        while time.time() - start_time < max_wait:
+            if is_warm_ready(ip_address):
+                return True
+            time.sleep(15)
+
+        return False
+
+    def deploy_many(self, bots, nvidia_key, region='nyc3', size='s-2vcpu-2gb', image=None, max_wait=1800, on_created=None):
+        """Deploy several bots with multi-name droplet creates, then push each bot's config over SSH
+
+        bots: list of dicts with telegram_token, bot_name, bot_username and optional openrouter_key.
+        Returns one result dict per bot, in order.
+        """
+        # user_data is shared by every droplet in a multi-create, so secrets have to go over SSH
+        ssh_key_ids = self.get_ssh_key_ids()
+        if not ssh_key_ids:
+            raise RuntimeError('Batch deploys need platform SSH keys')
+
+        user_data = self.create_warm_script(from_snapshot=bool(image))
+        stamp = int(time.time())
+        names = [f"{bot['bot_name']}-{stamp}-{i}" for i, bot in enumerate(bots)]
+        droplet_ids = {}
+
+        for start in range(0, len(bots), MAX_NAMES_PER_CREATE):
+            resp = self.client.droplets.create(body={
+                "names": names[start:start + MAX_NAMES_PER_CREATE],
+                "region": region,
+                "size": size,
+                "image": image or "ubuntu-24-04-x64",
+                "ssh_keys": ssh_key_ids,
+                "backups": False,
+                "ipv6": True,
+                "monitoring": True,
+                "tags": ["openclaw", "saas", "bot", WATCH_TAG],
+                "user_data": user_data
+            })
+            for droplet in resp["droplets"]:
+                droplet_ids[droplet["name"]] = droplet["id"]
+
+            if on_created:
+                on_created(list(droplet_ids.values()))
+
+        # Register every droplet with the shared watcher before waiting on any of them
+        watcher = get_watcher(self.do_token)
+        futures = {name: watcher.watch(droplet_id, timeout=max_wait) for name, droplet_id in droplet_ids.items()}
+
+        def finish(i):
+            bot = bots[i]
+            result = {'success': False, 'bot_username': bot['bot_username'], 'droplet_id': droplet_ids.get(names[i])}
+            try:
+                if names[i] not in futures:
+                    raise RuntimeError('Droplet was not created')
+
+                ip_address = futures[names[i]].result()
+                if not self.wait_for_warm_ready(ip_address, max_wait):
+                    raise RuntimeError('Droplet did not finish provisioning')
+
+                gateway_token = self.generate_token()
+                self.push_bot_config(ip_address, bot['telegram_token'], nvidia_key, gateway_token,
+                                     openrouter_key=bot.get('openrouter_key'))
+
+                result.update(success=True, ip_address=ip_address, gateway_token=gateway_token)
+            except Exception as e:
+                result['error'] = str(e)
+            return result
+
+        with ThreadPoolExecutor(max_workers=MAX_NAMES_PER_CREATE) as pool:
+            return list(pool.map(finish, range(len(bots))))
+
     def delete_droplet(self, droplet_id):
         """Delete a droplet"""
         try:
@@ -405,3 +627,33 @@ echo "OpenClaw deployment completed with security hardening!"
             return True
         except:
             return False
+
+
+def probe_gateway(ip_address):
+    """Check over SSH whether the gateway service is active and Telegram has started"""
+    probe = run_probe(ip_address, timeout=12)
+
+    return {
+        'telegram_ready': probe['telegram_ready'],
+        'service_active': probe['service_active']
+    }
+
+
+def run_remote_script(ip_address, script, timeout=60, known_hosts_file=None):
+    """Run a bash script on a droplet over SSH, passing it on stdin so secrets never hit argv or user_data"""
+    return ssh_pool.run(ip_address, "bash -s", input=script, timeout=timeout, known_hosts_file=known_hosts_file)
+
+
+def forget_host_key(ip_address):
+    """Drop a pinned host key (droplet IPs get reused)"""
+    subprocess.run(["ssh-keygen", "-R", ip_address, "-f", PINNED_HOSTS_FILE], capture_output=True)
+
+
+def is_warm_ready(ip_address):
+    """Check whether create_warm_script finished on a droplet"""
+    try:
+        result = run_remote_script(ip_address, "test -f /var/lib/openclaw/.warm-ready && echo ready",
+                                   timeout=15, known_hosts_file=PINNED_HOSTS_FILE)
+    except subprocess.TimeoutExpired:
+        return False
+    return 'ready' in result.stdout
@@ -0,0 +1,139 @@
+"""
+Bot heartbeats for OpenClaw SaaS
+Droplets push signed gateway status to the dashboard, so status checks are a database read
+"""
+
+import hashlib
+import hmac
+import os
+
+# Public base URL of this dashboard as droplets reach it, e.g. https://open-claw.space (unset disables heartbeats)
+PUBLIC_URL = os.environ.get('PUBLIC_URL', '').rstrip('/')
+
+SIGNATURE_HEADER = 'X-OpenClaw-Signature'
+HEARTBEAT_SECONDS = 30      # Agent timer interval on the droplet
+STALE_SECONDS = 90          # Older heartbeats are ignored and status falls back to an SSH probe
+MAX_CLOCK_SKEW = 300        # Heartbeats timestamped further from our clock are rejected
+MAX_MESSAGES = 10000        # A heartbeat reporting more messages than this is rejected as bogus
+
+# Gateway log lines the agent counts as one handled message (regex, written to the agent config)
+MESSAGE_LOG_PATTERN = os.environ.get('MESSAGE_LOG_PATTERN', r'(?i)\[telegram\].*\b(inbound|received)\b')
+
+AGENT_PATH = '/usr/local/bin/openclaw-heartbeat'
+AGENT_CONFIG = '/etc/openclaw-heartbeat.env'
+
+# Runs as root from a systemd timer on every bot droplet. Python 3 stdlib only.
+AGENT_SCRIPT = r'''#!/usr/bin/env python3
+"""OpenClaw heartbeat: report gateway status to the dashboard, signed with the gateway token"""
+
+import hashlib
+import hmac
+import json
+import os
+import re
+import subprocess
+import time
+import urllib.request
+
+CONFIG = '/etc/openclaw-heartbeat.env'
+SECRETS = '/var/lib/openclaw/.openclaw/.env'
+STATE = '/var/lib/openclaw-heartbeat/state.json'
+PROBE = '/usr/local/bin/openclaw-probe'
+METADATA_ID = 'http://169.254.169.254/metadata/v1/id'
+UNIT = 'openclaw-gateway'
+
+
+def read_env(path):
+    try:
+        with open(path) as f:
+            return dict(line.strip().split('=', 1) for line in f if '=' in line)
+    except OSError:
+        return {}
+
+
+def load_state():
+    try:
+        with open(STATE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state):
+    os.makedirs(os.path.dirname(STATE), exist_ok=True)
+    with open(STATE + '.tmp', 'w') as f:
+        json.dump(state, f)
+    os.replace(STATE + '.tmp', STATE)
+
+
+def count_messages(pattern, cursor):
+    """Gateway log lines matching the message pattern since the last reported cursor"""
+    args = ['journalctl', '-u', UNIT, '--no-pager', '-o', 'cat', '--show-cursor']
+    # First run only learns where the journal ends, older messages were never ours to report
+    args += ['--after-cursor', cursor] if cursor else ['-n', '1']
+    lines = subprocess.run(args, capture_output=True, text=True, timeout=30).stdout.splitlines()
+
+    next_cursor = cursor
+    if lines and lines[-1].startswith('-- cursor: '):
+        next_cursor = lines.pop()[len('-- cursor: '):]
+    if not cursor or not pattern:
+        return 0, next_cursor
+
+    matcher = re.compile(pattern)
+    return sum(1 for line in lines if matcher.search(line)), next_cursor
+
+
+def main():
+    config = read_env(CONFIG)
+    url = config.get('HEARTBEAT_URL')
+    token = read_env(SECRETS).get('OPENCLAW_GATEWAY_TOKEN')
+    if not url or not token:
+        return
+
+    droplet_id = int(urllib.request.urlopen(METADATA_ID, timeout=5).read())
+    probe = subprocess.run(['python3', PROBE, '--status'], capture_output=True, text=True, timeout=60)
+    status = json.loads(probe.stdout)
+
+    state = load_state()
+    messages, cursor = count_messages(config.get('MESSAGE_PATTERN'), state.get('cursor'))
+
+    body = json.dumps({
+        'droplet_id': droplet_id,
+        'timestamp': int(time.time()),
+        'telegram_ready': status['telegram_ready'],
+        'service_active': status['service_active'],
+        'messages': messages
+    }).encode()
+
+    request = urllib.request.Request(url, data=body, headers={
+        'Content-Type': 'application/json',
+        'X-OpenClaw-Signature': hmac.new(token.encode(), body, hashlib.sha256).hexdigest()
+    })
+    urllib.request.urlopen(request, timeout=10)
+
+    # Only advance once the dashboard has the count, a failed post is retried with the next heartbeat
+    state['cursor'] = cursor
+    save_state(state)
+
+
+if __name__ == '__main__':
+    main()
+'''
+
+
+def heartbeat_url():
+    """Endpoint droplets post heartbeats to (None when PUBLIC_URL isn't configured)"""
+    if not PUBLIC_URL:
+        return None
+    return f"{PUBLIC_URL}/api/agent/heartbeat"
+
+
+def sign(gateway_token, body):
+    """HMAC-SHA256 of a heartbeat body keyed by the bot's gateway token"""
+    return hmac.new(gateway_token.encode(), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(gateway_token, body, signature):
+    """Check a heartbeat signature in constant time (False for any malformed header)"""
+    # compare_digest raises TypeError on non-ASCII str, so compare bytes
+    return hmac.compare_digest(sign(gateway_token, body).encode(), (signature or '').encode())
@@ -0,0 +1,421 @@
+"""
+Deploy job queue for OpenClaw SaaS
+Runs bot deployments on background worker threads so web requests never block on DigitalOcean
+"""
+
+import json
+import os
+import secrets
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+
+from backend.deployer import BotDeployer, probe_gateway
+from backend.snapshots import SnapshotBuilder, SNAPSHOT_REGIONS, is_image_error
+from backend.usage import RETENTION_COOLDOWN, prune as prune_usage
+from backend.warmpool import WarmPool, WARM_POOLS, WARM_POOL_MAX
+
+# Phases reported by /api/deploy/<job_id>, in order
+PHASES = ('queued', 'created', 'droplet-active', 'ip-assigned', 'gateway-ready', 'failed')
+
+LEASE_SECONDS = 300          # A job whose worker stops renewing its lease is picked up again
+MAX_ATTEMPTS = 3
+IP_WAIT_SECONDS = 300
+GATEWAY_WAIT_SECONDS = 20 * 60
+GATEWAY_POLL_SECONDS = 15
+MAINTENANCE_SECONDS = 60     # How often each process checks for scheduled maintenance jobs
+MAINTENANCE_COOLDOWN = 3600  # Don't retry a failed snapshot build more than hourly
+WARM_POOL_COOLDOWN = 60
+
+
+class DeployQueue:
+    def __init__(self, db, do_token, nvidia_key, workers=None, poll_interval=2):
+        """Initialize the queue (call start() to run workers in this process)"""
+        self.db = db
+        self.do_token = do_token
+        self.nvidia_key = nvidia_key
+        self.workers = workers or int(os.environ.get('DEPLOY_WORKERS', '2'))
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._threads = []
+        self._next_maintenance = 0
+
+    def start(self):
+        """Start worker threads (one pool per gunicorn worker process)"""
+        if self._threads:
+            return
+
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f'deploy-worker-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def enqueue(self, username, telegram_token, openrouter_key=None, region='nyc3',
+                size='s-2vcpu-2gb', bot_name='openclaw-bot', bot_username=None):
+        """Queue a bot deployment and return its job id immediately"""
+        job_id = secrets.token_urlsafe(12)
+        payload = json.dumps({
+            'telegram_token': telegram_token,
+            'openrouter_key': openrouter_key,
+            'region': region,
+            'size': size,
+            'bot_name': bot_name,
+            'bot_username': bot_username
+        })
+
+        self.db.create_deploy_job(job_id, username, payload, region=region, size=size)
+        self._wakeup.set()
+        return job_id
+
+    def enqueue_batch(self, username, bots, openrouter_key=None, region='nyc3', size='s-2vcpu-2gb'):
+        """Queue a team deployment (bots: dicts with telegram_token, bot_name, bot_username)"""
+        job_id = secrets.token_urlsafe(12)
+        payload = json.dumps({
+            'bots': [dict(bot, openrouter_key=openrouter_key) for bot in bots],
+            'region': region,
+            'size': size
+        })
+
+        self.db.create_deploy_job(job_id, username, payload, kind='deploy-batch', region=region, size=size)
+        self._wakeup.set()
+        return job_id
+
+    def _worker_loop(self):
+        """Claim and run jobs until the process exits"""
+        worker_prefix = f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+
+        while True:
+            try:
+                self.db.fail_abandoned_deploy_jobs(MAX_ATTEMPTS)
+                self._schedule_maintenance()
+
+                # Fresh claim token per attempt so a stale row is never mistaken for ours
+                job = self.db.claim_deploy_job(f"{worker_prefix}:{secrets.token_hex(4)}", LEASE_SECONDS, MAX_ATTEMPTS)
+                if job:
+                    self._run(job)
+                    continue
+            except Exception as e:
+                print(f"❌ Deploy worker error: {str(e)}")
+
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def _schedule_maintenance(self):
+        """Queue snapshot rebuilds, warm pool refills and usage pruning (deduplicated across all processes by the database)"""
+        if time.time() < self._next_maintenance:
+            return
+        self._next_maintenance = time.time() + MAINTENANCE_SECONDS
+
+        builder = SnapshotBuilder(self.db, self.do_token)
+        for region in SNAPSHOT_REGIONS:
+            if builder.is_due(region):
+                self.db.create_unique_job(secrets.token_urlsafe(12), 'snapshot',
+                                          json.dumps({'region': region}), MAINTENANCE_COOLDOWN)
+
+        if WARM_POOL_MAX > 0:
+            self.db.create_unique_job(secrets.token_urlsafe(12), 'warm-pool', None, WARM_POOL_COOLDOWN)
+
+        self.db.create_unique_job(secrets.token_urlsafe(12), 'usage-retention', None, RETENTION_COOLDOWN)
+
+    def _lease(self):
+        """New lease expiry for a job we're still working on"""
+        return datetime.now() + timedelta(seconds=LEASE_SECONDS)
+
+    def _keep_lease(self, job_id):
+        """Renew a job's lease in the background while a long blocking call runs (set the returned event to stop)"""
+        stop = threading.Event()
+
+        def renew():
+            while not stop.wait(LEASE_SECONDS / 5):
+                try:
+                    self.db.update_deploy_job(job_id, lease_expires_at=self._lease())
+                except Exception as e:
+                    # Keep trying: one failed write still leaves most of the lease
+                    print(f"❌ Lease renewal error for job {job_id}: {str(e)}")
+
+        threading.Thread(target=renew, name=f'lease-{job_id}', daemon=True).start()
+        return stop
+
+    def _set_phase(self, job_id, phase, **fields):
+        """Record job progress (and renew the lease)"""
+        self.db.update_deploy_job(job_id, phase=phase, lease_expires_at=self._lease(), **fields)
+
+    def _run(self, job):
+        """Run a claimed job"""
+        if job['kind'] == 'snapshot':
+            self._run_snapshot(job)
+        elif job['kind'] == 'warm-pool':
+            self._run_warm_pool(job)
+        elif job['kind'] == 'usage-retention':
+            self._run_usage_retention(job)
+        elif job['kind'] == 'deploy-batch':
+            self._run_batch(job)
+        else:
+            self._run_deploy(job)
+
+    def _run_snapshot(self, job):
+        """Build a golden snapshot (a resumed build starts over with a fresh builder droplet)"""
+        payload = json.loads(job['payload'] or '{}')
+        builder = SnapshotBuilder(self.db, self.do_token)
+
+        try:
+            snapshot_id = builder.build(
+                payload.get('region', 'nyc3'),
+                on_phase=lambda phase: self._set_phase(job['id'], phase),
+                heartbeat=lambda: self.db.update_deploy_job(job['id'], lease_expires_at=self._lease())
+            )
+            print(f"📸 Golden snapshot {snapshot_id} ready")
+            self.db.update_deploy_job(job['id'], status='done', phase='done')
+        except Exception as e:
+            print(f"❌ Snapshot build error: {str(e)}")
+            self.db.update_deploy_job(job['id'], status='failed', phase='failed', error=str(e))
+
+    def _run_warm_pool(self, job):
+        """Refill (or trim) every configured warm pool"""
+        pool = WarmPool(self.db, self.do_token)
+
+        try:
+            for region, size in WARM_POOLS:
+                pool.replenish(region, size)
+            self.db.update_deploy_job(job['id'], status='done', phase='done')
+        except Exception as e:
+            print(f"❌ Warm pool error: {str(e)}")
+            self.db.update_deploy_job(job['id'], status='failed', phase='failed', error=str(e))
+
+    def _run_usage_retention(self, job):
+        """Drop usage buckets past their retention"""
+        try:
+            deleted = prune_usage(self.db)
+            if deleted:
+                print(f"🧹 Pruned {deleted} usage bucket(s)")
+            self.db.update_deploy_job(job['id'], status='done', phase='done')
+        except Exception as e:
+            print(f"❌ Usage retention error: {str(e)}")
+            self.db.update_deploy_job(job['id'], status='failed', phase='failed', error=str(e))
+
+    def _run_batch(self, job):
+        """Deploy a batch of bots with multi-name creates and save them in one transaction"""
+        job_id = job['id']
+        payload = json.loads(job['payload'] or '{}')
+        deployer = BotDeployer(self.do_token)
+
+        # A batch is not resumable: a previous attempt's droplets get cleaned up instead of adopted
+        if job['result']:
+            for droplet_id in json.loads(job['result']).get('droplet_ids', []):
+                deployer.delete_droplet(droplet_id)
+            self.db.update_deploy_job(job_id, status='failed', phase='failed', payload=None,
+                                      error='Batch deployment was interrupted, please retry')
+            return
+
+        created = []
+        saved = False
+        lease = self._keep_lease(job_id)
+
+        def on_created(droplet_ids):
+            created[:] = droplet_ids
+            self._set_phase(job_id, 'created', result=json.dumps({'droplet_ids': droplet_ids}))
+
+        try:
+            snapshot = self.db.get_latest_snapshot(payload['region'])
+            results = deployer.deploy_many(
+                payload['bots'],
+                self.nvidia_key,
+                region=payload['region'],
+                size=payload['size'],
+                image=int(snapshot['snapshot_id']) if snapshot else None,
+                on_created=on_created
+            )
+
+            deployed = [r for r in results if r['success']]
+            bot_ids = self.db.add_bots(job['username'], deployed, payload['region'])
+            saved = True
+            for result, bot_id in zip(deployed, bot_ids):
+                result['bot_id'] = bot_id
+
+            # Droplets whose config push failed have no bot row, so nothing else would ever delete them
+            for result in results:
+                if not result['success'] and result['droplet_id']:
+                    deployer.delete_droplet(result['droplet_id'])
+
+            summary = [{k: r.get(k) for k in ('success', 'bot_id', 'bot_username', 'ip_address', 'error')}
+                       for r in results]
+            self.db.update_deploy_job(
+                job_id,
+                status='done' if deployed else 'failed',
+                phase='ip-assigned' if deployed else 'failed',
+                payload=None,
+                result=json.dumps({'bots': summary}),
+                error=None if len(deployed) == len(results) else f'{len(results) - len(deployed)} bot(s) failed'
+            )
+        except Exception as e:
+            print(f"❌ Batch deploy job {job_id} error: {str(e)}")
+            if not saved:
+                for droplet_id in created:
+                    deployer.delete_droplet(droplet_id)
+            self.db.update_deploy_job(job_id, status='failed', phase='failed', payload=None, error=str(e))
+        finally:
+            lease.set()
+
+    def _claim_warm_droplet(self, deployer, payload):
+        """Hand a warm pool droplet to this bot (None if the pool is empty or the hand-off failed)"""
+        if WARM_POOL_MAX <= 0:
+            return None
+
+        pool = WarmPool(self.db, self.do_token)
+        droplet = pool.claim(payload['region'], payload['size'])
+        if not droplet:
+            return None
+
+        # Refill right away rather than on the next maintenance tick
+        self.db.create_unique_job(secrets.token_urlsafe(12), 'warm-pool', None, 0)
+        self._wakeup.set()
+
+        gateway_token = deployer.generate_token()
+        try:
+            pool.hand_off(
+                droplet,
+                payload['telegram_token'],
+                self.nvidia_key,
+                gateway_token,
+                openrouter_key=payload.get('openrouter_key'),
+                bot_name=payload['bot_name']
+            )
+        except Exception as e:
+            print(f"❌ Warm droplet {droplet['droplet_id']} hand-off failed: {str(e)}")
+            pool.discard(droplet)
+            return None
+
+        return {
+            'droplet_id': droplet['droplet_id'],
+            'ip_address': droplet['ip_address'],
+            'gateway_token': gateway_token,
+            'bot_username': payload.get('bot_username') or deployer.get_bot_username(payload['telegram_token'])
+        }
+
+    def _create_droplet(self, deployer, payload):
+        """Create the bot droplet from the golden snapshot, or with the full install script if there is none"""
+        kwargs = dict(
+            openrouter_key=payload.get('openrouter_key'),
+            region=payload['region'],
+            size=payload['size'],
+            bot_name=payload['bot_name'],
+            bot_username=payload.get('bot_username')
+        )
+
+        snapshot = self.db.get_latest_snapshot(payload['region'])
+        if snapshot:
+            try:
+                return deployer.create_droplet(payload['telegram_token'], self.nvidia_key,
+                                               image=int(snapshot['snapshot_id']), **kwargs)
+            except Exception as e:
+                # Transient API errors go through the job's normal retry with the same snapshot
+                if not is_image_error(e):
+                    raise
+                # Snapshot deleted or incompatible with the size — stop using it
+                print(f"❌ Snapshot {snapshot['snapshot_id']} unusable: {str(e)}")
+                self.db.update_snapshot_status(snapshot['snapshot_id'], 'unusable')
+
+        return deployer.create_droplet(payload['telegram_token'], self.nvidia_key, **kwargs)
+
+    def _run_deploy(self, job):
+        """Run (or resume after a restart) a single deploy job"""
+        job_id = job['id']
+        payload = json.loads(job['payload'] or '{}')
+        deployer = BotDeployer(self.do_token)
+
+        action_id = None
+
+        try:
+            # 1. Create droplet (skipped when resuming a job that already has one)
+            if not job['droplet_id']:
+                warm = self._claim_warm_droplet(deployer, payload)
+                if warm:
+                    # Already booted with a public IP, so skip straight past the boot phases
+                    job.update(warm)
+                    self._set_phase(job_id, 'ip-assigned', **warm)
+                else:
+                    created = self._create_droplet(deployer, payload)
+                    action_id = created.pop('action_id', None)
+                    job.update(created)
+                    self._set_phase(job_id, 'created', **created)
+
+            # 2. Wait for the droplet to boot and get a public IP (can block as long as a whole lease)
+            if not job['ip_address']:
+                lease = self._keep_lease(job_id)
+                try:
+                    ip_address = deployer.wait_for_ip(
+                        job['droplet_id'],
+                        max_wait=IP_WAIT_SECONDS,
+                        on_phase=lambda phase: self._set_phase(job_id, phase),
+                        action_id=action_id
+                    )
+                finally:
+                    lease.set()
+                if not ip_address:
+                    raise RuntimeError('Could not get IP address')
+
+                job['ip_address'] = ip_address
+                self._set_phase(job_id, 'ip-assigned', ip_address=ip_address)
+
+            # 3. Save bot so it shows up on the dashboard while the gateway installs
+            if not job['bot_id']:
+                bot_id = self.db.add_bot(
+                    username=job['username'],
+                    bot_name=job['bot_username'],
+                    bot_username=job['bot_username'],
+                    ip_address=job['ip_address'],
+                    gateway_token=job['gateway_token'],
+                    droplet_id=job['droplet_id'],
+                    region=payload['region']
+                )
+                if not bot_id:
+                    raise RuntimeError('User no longer exists')
+                job['bot_id'] = bot_id
+                self.db.update_deploy_job(job_id, bot_id=bot_id, lease_expires_at=self._lease())
+
+            # 4. Wait for cloud-init to finish and the gateway to connect to Telegram
+            lease = self._keep_lease(job_id)
+            try:
+                ready = self._wait_for_gateway(job['ip_address'])
+            finally:
+                lease.set()
+
+            if ready:
+                self.db.update_deploy_job(job_id, status='done', phase='gateway-ready', payload=None)
+            else:
+                # Bot exists and is probably still installing; dashboard status takes over from here
+                self.db.update_deploy_job(job_id, status='done', payload=None,
+                                          error='Gateway not ready yet, still installing')
+
+        except Exception as e:
+            print(f"❌ Deploy job {job_id} error: {str(e)}")
+            self._fail(job, deployer, str(e))
+
+    def _wait_for_gateway(self, ip_address):
+        """Poll the droplet until Telegram is connected (False on timeout)"""
+        start_time = time.time()
+
+        while time.time() - start_time < GATEWAY_WAIT_SECONDS:
+            try:
+                status = probe_gateway(ip_address)
+                if status['service_active'] and status['telegram_ready']:
+                    return True
+            except Exception:
+                pass  # SSH not up yet while the droplet boots
+
+            time.sleep(GATEWAY_POLL_SECONDS)
+
+        return False
+
+    def _fail(self, job, deployer, error):
+        """Retry the job, or give up and clean up its droplet"""
+        if job['attempts'] < MAX_ATTEMPTS and not job['bot_id']:
+            self.db.update_deploy_job(job['id'], status='queued', error=error, worker=None)
+            return
+
+        # Don't leave an orphaned droplet billing us if no bot row points at it
+        if job['droplet_id'] and not job['bot_id']:
+            deployer.delete_droplet(job['droplet_id'])
+
+        self.db.update_deploy_job(job['id'], status='failed', phase='failed', payload=None, error=error)
@@ -0,0 +1,129 @@
+"""
+Bot log cache for OpenClaw SaaS
+Per-bot ring buffer of recent log increments so every viewer of a bot shares one remote fetch
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from backend.probe import run_probe
+
+LOG_CACHE_TTL = float(os.environ.get('LOG_CACHE_TTL', '5'))  # Seconds a fetch is reused by other viewers
+MAX_CHUNKS = 120            # Increments kept per bot (~10 minutes at one fetch per TTL)
+IDLE_SECONDS = 600          # Bots nobody viewed for this long are dropped
+
+
+class LogCache:
+    def __init__(self, ttl=LOG_CACHE_TTL, max_chunks=MAX_CHUNKS):
+        """Initialize an empty cache (entries are created on first view of a bot)"""
+        self.ttl = ttl
+        self.max_chunks = max_chunks
+        self.remote_fetches = 0     # Probes actually sent to droplets
+        self._bots = {}
+        self._lock = threading.Lock()
+
+    def snapshot(self, bot_id, ip_address):
+        """Full log sections plus the position to poll from next"""
+        entry = self._entry(bot_id, ip_address)
+
+        # Holding the bot's lock while fetching makes concurrent viewers wait for one probe
+        with entry['lock']:
+            full = entry['full']
+            if not full or time.time() - full['fetched_at'] > self.ttl:
+                full = {'doc': self._probe(ip_address), 'fetched_at': time.time()}
+                entry['full'] = full
+                self._mark_checked(entry, self._position(full['doc']))
+            return full['doc']
+
+    def since(self, bot_id, ip_address, cursor, offset):
+        """Log lines written after a journal cursor and cloud-init byte offset"""
+        entry = self._entry(bot_id, ip_address)
+        position = (cursor or None, int(offset))
+        cloud_init, journal = [], []
+
+        with entry['lock']:
+            chunks = entry['chunks']
+
+            # Replay increments other viewers already fetched
+            while position in chunks:
+                chunk = chunks[position]
+                cloud_init += chunk['cloud_init']
+                journal += chunk['journal']
+                position = chunk['end']
+
+            if time.time() - entry['checked'].get(position, 0) > self.ttl:
+                doc = self._probe(ip_address, position)
+                end = self._position(doc)
+
+                if end != position:
+                    chunks[position] = {
+                        'end': end,
+                        'cloud_init': doc['cloud_init'] or [],
+                        'journal': doc['journal']
+                    }
+                    while len(chunks) > self.max_chunks:
+                        chunks.popitem(last=False)
+                    cloud_init += doc['cloud_init'] or []
+                    journal += doc['journal']
+
+                self._mark_checked(entry, end)
+                position = end
+
+        return {
+            'cloud_init': cloud_init,
+            'journal': journal,
+            'cursor': position[0],
+            'offset': position[1]
+        }
+
+    def forget(self, bot_id):
+        """Drop a bot's cached logs (e.g. when the bot is deleted)"""
+        with self._lock:
+            self._bots.pop(bot_id, None)
+
+    def _entry(self, bot_id, ip_address):
+        """Cache entry for a bot, dropping entries nobody has viewed recently"""
+        now = time.time()
+
+        with self._lock:
+            for key in [k for k, e in self._bots.items() if now - e['viewed_at'] > IDLE_SECONDS]:
+                del self._bots[key]
+
+            entry = self._bots.get(bot_id)
+            # A bot redeployed on another droplet starts over
+            if not entry or entry['ip_address'] != ip_address:
+                entry = {
+                    'ip_address': ip_address,
+                    'lock': threading.Lock(),
+                    'full': None,
+                    'chunks': OrderedDict(),
+                    'checked': {}
+                }
+                self._bots[bot_id] = entry
+            entry['viewed_at'] = now
+            return entry
+
+    def _probe(self, ip_address, position=None):
+        """Fetch a full snapshot, or everything after a position, from the droplet"""
+        self.remote_fetches += 1
+        if position is None:
+            return run_probe(ip_address, timeout=15)
+        cursor, offset = position
+        return run_probe(ip_address, args=['--cursor', cursor or '', '--offset', str(offset)], timeout=15)
+
+    def _position(self, doc):
+        """Journal cursor and cloud-init offset a probe result ends at"""
+        return (doc.get('cursor') or None, int(doc.get('offset') or 0))
+
+    def _mark_checked(self, entry, position):
+        """Remember when a position was last checked for new lines, keeping only recent checks"""
+        now = time.time()
+        checked = entry['checked']
+        for key in [k for k, t in checked.items() if now - t > self.ttl]:
+            del checked[key]
+        checked[position] = now
+
+
+log_cache = LogCache()
@@ -0,0 +1,171 @@
+"""
+Live log streaming for OpenClaw SaaS
+One upstream journalctl -f per bot, fanned out to every browser subscribed to it
+"""
+
+import json
+import os
+import queue
+import shlex
+import threading
+from collections import deque
+from datetime import datetime, timezone
+
+from backend.ssh import ssh_pool
+
+STREAM_MAX_SECONDS = int(os.environ.get('LOG_STREAM_MAX_SECONDS', '600'))  # Browsers reconnect after this
+KEEPALIVE_SECONDS = 15      # Comment line so proxies don't close an idle stream
+REPLAY_LINES = 500          # Recent lines kept per bot for subscribers reconnecting with a cursor
+SUBSCRIBER_QUEUE = 1000     # Lines buffered per slow subscriber before it is dropped
+# Each open stream holds a request thread for up to STREAM_MAX_SECONDS; keep most of the
+# worker's threads (16 per gunicorn worker, see Procfile) free for normal requests
+MAX_STREAMS = int(os.environ.get('LOG_STREAM_MAX_PER_PROCESS', '6'))
+
+
+def format_entry(entry):
+    """Render a journalctl JSON entry like journalctl -o short"""
+    timestamp = datetime.fromtimestamp(int(entry.get('__REALTIME_TIMESTAMP', 0)) / 1e6, tz=timezone.utc)
+    message = entry.get('MESSAGE')
+    if not isinstance(message, str):
+        message = '[binary data]'
+    ident = entry.get('SYSLOG_IDENTIFIER', 'openclaw')
+    pid = f"[{entry['_PID']}]" if entry.get('_PID') else ''
+    return f"{timestamp.strftime('%b %d %H:%M:%S')} {entry.get('_HOSTNAME', '')} {ident}{pid}: {message}"
+
+
+class _Upstream:
+    def __init__(self, hub, bot_id, ip_address, cursor=None):
+        """Follow a bot's gateway journal over the droplet's multiplexed SSH connection"""
+        self.hub = hub
+        self.bot_id = bot_id
+        self.ip_address = ip_address
+        self.subscribers = set()
+        self.recent = deque(maxlen=REPLAY_LINES)
+
+        start = f"--after-cursor {shlex.quote(cursor)}" if cursor else "-n 0"
+        self.proc = ssh_pool.popen(
+            ip_address,
+            f"exec journalctl -u openclaw-gateway -f -o json --no-pager {start}"
+        )
+        self.thread = threading.Thread(target=self._read, name=f'log-stream-{bot_id}', daemon=True)
+        self.thread.start()
+
+    def _read(self):
+        """Broadcast each journal line until the upstream exits or is stopped"""
+        try:
+            for raw in self.proc.stdout:
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    continue
+
+                line = format_entry(entry)
+                if 'bonjour' in line:
+                    continue
+                self.hub._broadcast(self, (entry.get('__CURSOR'), line))
+        finally:
+            self.hub._upstream_closed(self)
+
+    def stop(self):
+        """Terminate the SSH session (the journalctl -f on the droplet exits with it)"""
+        if self.proc.poll() is None:
+            self.proc.terminate()
+
+
+class StreamsFull(Exception):
+    """This process already serves MAX_STREAMS streams (answer 503 and let the client poll instead)"""
+
+
+class LogStreamHub:
+    def __init__(self, max_streams=MAX_STREAMS):
+        """Initialize hub (upstreams start with the first subscriber to a bot)"""
+        self.max_streams = max_streams
+        self._upstreams = {}
+        self._open = set()      # Every subscriber not yet unsubscribed, whether or not its upstream is still running
+        self._lock = threading.Lock()
+
+    def subscribe(self, bot_id, ip_address, cursor=None):
+        """Queue receiving (cursor, line) tuples for a bot's new log lines, None when the upstream ends
+
+        Raises StreamsFull when this process is at its stream limit.
+        """
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE)
+
+        with self._lock:
+            if len(self._open) >= self.max_streams:
+                raise StreamsFull()
+            self._open.add(subscriber)
+
+            upstream = self._upstreams.get(bot_id)
+            if upstream and upstream.ip_address != ip_address:
+                upstream.stop()
+                upstream = None
+            if not upstream:
+                try:
+                    upstream = _Upstream(self, bot_id, ip_address, cursor)
+                except Exception:
+                    self._open.discard(subscriber)
+                    raise
+                self._upstreams[bot_id] = upstream
+            elif cursor:
+                # Joining a running follow: replay what the subscriber missed, if we still have it
+                cursors = [c for c, _ in upstream.recent]
+                if cursor in cursors:
+                    for item in list(upstream.recent)[cursors.index(cursor) + 1:]:
+                        subscriber.put_nowait(item)
+            upstream.subscribers.add(subscriber)
+
+        return subscriber
+
+    def unsubscribe(self, bot_id, subscriber):
+        """Remove a subscriber and stop the bot's upstream if it was the last one (safe to call twice)"""
+        with self._lock:
+            self._open.discard(subscriber)
+            upstream = self._upstreams.get(bot_id)
+            if not upstream:
+                return
+            upstream.subscribers.discard(subscriber)
+            if not upstream.subscribers:
+                del self._upstreams[bot_id]
+                upstream.stop()
+
+    def stats(self):
+        """Subscribers per streamed bot"""
+        with self._lock:
+            return {bot_id: len(u.subscribers) for bot_id, u in self._upstreams.items()}
+
+    def _broadcast(self, upstream, item):
+        """Hand a line to every subscriber, dropping ones that stopped reading"""
+        with self._lock:
+            upstream.recent.append(item)
+            for subscriber in list(upstream.subscribers):
+                try:
+                    subscriber.put_nowait(item)
+                except queue.Full:
+                    upstream.subscribers.discard(subscriber)
+                    self._close(subscriber)
+
+    def _upstream_closed(self, upstream):
+        """Tell remaining subscribers the stream ended so their browsers reconnect"""
+        with self._lock:
+            if self._upstreams.get(upstream.bot_id) is upstream:
+                del self._upstreams[upstream.bot_id]
+            subscribers = list(upstream.subscribers)
+            upstream.subscribers.clear()
+        for subscriber in subscribers:
+            self._close(subscriber)
+
+    def _close(self, subscriber):
+        """Put the end-of-stream marker on a subscriber's queue, even if it is full"""
+        while True:
+            try:
+                subscriber.put_nowait(None)
+                return
+            except queue.Full:
+                try:
+                    subscriber.get_nowait()
+                except queue.Empty:
+                    pass
+
+
+log_streams = LogStreamHub()
@@ -0,0 +1,193 @@
+"""
+Media pipeline for OpenClaw SaaS
+Offline step that turns heavy landing-page media into modern formats and sizes under static/media, plus a manifest
+the picture()/video()/media_url() template helpers read (they fall back to the original file for anything not built)
+
+Usage: python -m backend.media   (needs Pillow, and ffmpeg for videos; commit static/media afterwards)
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+from markupsafe import Markup, escape
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATIC_DIR = os.path.join(ROOT, 'static')
+MEDIA_DIR = os.path.join(STATIC_DIR, 'media')
+MANIFEST_PATH = os.path.join(MEDIA_DIR, 'manifest.json')
+
+FFMPEG = os.environ.get('FFMPEG', 'ffmpeg')
+
+# Source image -> widths to produce (larger than the source are skipped)
+IMAGES = {
+    'logo.png': (32, 64, 192, 512),       # Favicon sizes and in-page logo
+}
+# Source animation -> width of the encoded video and its poster
+VIDEOS = {
+    'product-demo.gif': 1280,
+}
+
+# Best first: browsers take the first <source> they support
+IMAGE_FORMATS = (
+    ('avif', 'image/avif', {'quality': 50}),
+    ('webp', 'image/webp', {'quality': 80, 'method': 6}),
+)
+VIDEO_FORMATS = (
+    ('webm', 'video/webm', ['-c:v', 'libvpx-vp9', '-crf', '40', '-b:v', '0', '-row-mt', '1']),
+    ('mp4', 'video/mp4', ['-c:v', 'libx264', '-crf', '28', '-preset', 'slow', '-pix_fmt', 'yuv420p', '-movflags', '+faststart']),
+)
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """Built media by source file (empty if the pipeline hasn't run)"""
+    if not os.path.exists(path):
+        return {'images': {}, 'videos': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _output(name, suffix):
+    """Output path relative to static/ (media/logo/logo-32.webp)"""
+    stem = os.path.splitext(os.path.basename(name))[0]
+    return f"media/{stem}/{stem}{suffix}"
+
+
+def build_image(image_module, name, widths, static_dir=STATIC_DIR):
+    """Resized AVIF/WebP/original-format variants of one image (returns its manifest entry)"""
+    source = image_module.open(os.path.join(static_dir, name))
+    source_format = os.path.splitext(name)[1].lstrip('.').lower()
+    formats = [(ext, options) for ext, _, options in IMAGE_FORMATS] + [(source_format, {'optimize': True})]
+
+    variants = {}
+    for width in sorted(w for w in widths if w <= source.width):
+        height = round(source.height * width / source.width)
+        resized = source.resize((width, height), image_module.LANCZOS)
+        for ext, options in formats:
+            path = _output(name, f"-{width}.{ext}")
+            os.makedirs(os.path.dirname(os.path.join(static_dir, path)), exist_ok=True)
+            try:
+                resized.save(os.path.join(static_dir, path), **options)
+            except (KeyError, OSError) as e:
+                # Pillow built without this encoder (AVIF needs Pillow 11.3+ with libavif)
+                print(f"❌ {path}: {e}")
+                continue
+            variants.setdefault(ext, []).append([width, path])
+
+    return {'width': source.width, 'height': source.height, 'variants': variants}
+
+
+def build_video(image_module, name, width, static_dir=STATIC_DIR):
+    """WebM/MP4 encodes and a WebP poster of one animation (returns its manifest entry)"""
+    source_path = os.path.join(static_dir, name)
+    poster = image_module.open(source_path).convert('RGB')
+    height = round(poster.height * width / poster.width / 2) * 2    # H.264 needs even dimensions
+
+    sources = []
+    for ext, mime, codec in VIDEO_FORMATS:
+        path = _output(name, f".{ext}")
+        os.makedirs(os.path.dirname(os.path.join(static_dir, path)), exist_ok=True)
+        subprocess.run([FFMPEG, '-y', '-loglevel', 'error', '-i', source_path, '-an',
+                        '-vf', f'scale={width}:{height}:flags=lanczos'] + codec + [os.path.join(static_dir, path)],
+                       check=True)
+        sources.append({'type': mime, 'file': path})
+
+    poster_path = _output(name, '-poster.webp')
+    poster.resize((width, height), image_module.LANCZOS).save(os.path.join(static_dir, poster_path), quality=80, method=6)
+    return {'width': width, 'height': height, 'sources': sources, 'poster': poster_path}
+
+
+def build(static_dir=STATIC_DIR, manifest_path=MANIFEST_PATH):
+    """Rebuild every configured image and video (videos are skipped without ffmpeg) and write the manifest"""
+    from PIL import Image
+
+    manifest = load_manifest(manifest_path)
+    for name, widths in IMAGES.items():
+        manifest['images'][name] = build_image(Image, name, widths, static_dir)
+        print(f"🖼️  {name}: {', '.join(manifest['images'][name]['variants'])}")
+
+    if shutil.which(FFMPEG):
+        for name, width in VIDEOS.items():
+            manifest['videos'][name] = build_video(Image, name, width, static_dir)
+            print(f"🎞️  {name}: {', '.join(source['type'] for source in manifest['videos'][name]['sources'])}")
+    else:
+        print(f"❌ {FFMPEG} not found, videos left as they were (set FFMPEG to its path)")
+
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def _attrs(attrs):
+    """HTML attributes, escaped (True renders a bare attribute, None/False are left out)"""
+    parts = []
+    for key, value in attrs.items():
+        key = key.rstrip('_').replace('_', '-')     # class_='x' -> class="x", data_id -> data-id
+        if value is True:
+            parts.append(f' {key}')
+        elif value is not None and value is not False:
+            parts.append(f' {key}="{escape(value)}"')
+    return ''.join(parts)
+
+
+def media_url(manifest, name, url, width=None, ext=None):
+    """URL of the smallest built variant at least width wide (in ext, default the source format), or the original"""
+    entry = manifest['images'].get(name)
+    ext = ext or os.path.splitext(name)[1].lstrip('.').lower()
+    candidates = entry['variants'].get(ext, []) if entry else []
+    for variant_width, path in candidates:
+        if width is None or variant_width >= width:
+            return url(path)
+    if candidates:
+        return url(candidates[-1][1])
+    return url(name)
+
+
+def picture(manifest, name, url, alt, sizes='100vw', **attrs):
+    """<picture> with AVIF/WebP srcsets and an <img> fallback (a plain <img> if the image wasn't built)"""
+    entry = manifest['images'].get(name)
+    if not entry:
+        return Markup(f'<img{_attrs(dict(src=url(name), alt=alt, **attrs))}>')
+
+    def srcset(variants):
+        return ', '.join(f"{url(path)} {width}w" for width, path in variants)
+
+    html = ['<picture>']
+    for ext, mime, _ in IMAGE_FORMATS:
+        if entry['variants'].get(ext):
+            html.append(f'<source{_attrs({"type": mime, "srcset": srcset(entry["variants"][ext]), "sizes": sizes})}>')
+
+    fallback = entry['variants'].get(os.path.splitext(name)[1].lstrip('.').lower())
+    img = dict(src=url(fallback[-1][1]) if fallback else url(name), alt=alt,
+               width=entry['width'], height=entry['height'], loading='lazy', decoding='async')
+    if fallback:
+        img.update(srcset=srcset(fallback), sizes=sizes)
+    img.update(attrs)
+    html.append(f'<img{_attrs(img)}>')
+    html.append('</picture>')
+    return Markup(''.join(html))
+
+
+def video(manifest, name, url, alt='', **attrs):
+    """Muted looping <video> standing in for an animated GIF (the GIF itself as <img> if it wasn't built)"""
+    entry = manifest['videos'].get(name)
+    if not entry:
+        return Markup(f'<img{_attrs(dict(src=url(name), alt=alt, **attrs))}>')
+
+    tag = dict(autoplay=True, loop=True, muted=True, playsinline=True, preload='metadata',
+               poster=url(entry['poster']), width=entry['width'], height=entry['height'])
+    if alt:
+        tag['aria-label'] = alt
+    tag.update(attrs)
+    sources = ''.join(f'<source{_attrs({"src": url(source["file"]), "type": source["type"]})}>' for source in entry['sources'])
+    return Markup(f'<video{_attrs(tag)}>{sources}</video>')
+
+
+if __name__ == '__main__':
+    try:
+        build()
+    except ImportError:
+        sys.exit('Pillow is not installed: pip install Pillow (only needed to run the media pipeline)')
@@ -0,0 +1,435 @@
+"""
+Schema migrations for OpenClaw SaaS
+Numbered migrations tracked in a schema_version table, applied in one transaction at startup
+(SQLite migrations rebuild history in place; PostgreSQL starts from the version 7 schema)
+"""
+
+import sys
+from datetime import datetime
+
+
+def _columns(cursor, table):
+    """Column names of a table (empty if it doesn't exist)"""
+    return {row[1] for row in cursor.execute(f'PRAGMA table_info({table})').fetchall()}
+
+
+def _add_columns(cursor, table, columns):
+    """Add columns a database created by older code may be missing"""
+    existing = _columns(cursor, table)
+    for name, definition in columns:
+        if name not in existing:
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {name} {definition}')
+
+
+def baseline(cursor):
+    """Users, bots, API keys and pending payments (databases from before migrations may already have them)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_login TIMESTAMP,
+            credits REAL DEFAULT 50.0
+        )
+    ''')
+
+    # Payment and Google OAuth columns were added with ALTER TABLE over time
+    _add_columns(cursor, 'users', [
+        ('has_paid', 'INTEGER DEFAULT 0'),
+        ('payment_date', 'TIMESTAMP'),
+        ('dodo_payment_id', 'TEXT'),
+        ('subscription_plan', "TEXT DEFAULT 'none'"),
+        ('plan_expires_at', 'TIMESTAMP'),
+        ('google_id', 'TEXT'),
+        ('google_name', 'TEXT')
+    ])
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS bots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            bot_name TEXT NOT NULL,
+            bot_username TEXT NOT NULL,
+            ip_address TEXT NOT NULL,
+            gateway_token TEXT NOT NULL,
+            droplet_id INTEGER NOT NULL,
+            region TEXT NOT NULL,
+            status TEXT DEFAULT 'running',
+            message_count INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+
+    # API Keys table (for storing user's API keys)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS api_keys (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            do_token TEXT,
+            anthropic_key TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+
+    # Pending Payments table (for payments before user registration)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pending_payments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT NOT NULL,
+            payment_id TEXT NOT NULL,
+            subscription_plan TEXT DEFAULT 'monthly',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def deploy_jobs(cursor):
+    """Background deploy queue (see backend/jobs.py)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS deploy_jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT DEFAULT 'deploy',
+            username TEXT,
+            status TEXT DEFAULT 'queued',
+            phase TEXT DEFAULT 'queued',
+            payload TEXT,
+            droplet_id INTEGER,
+            ip_address TEXT,
+            gateway_token TEXT,
+            bot_username TEXT,
+            bot_id INTEGER,
+            error TEXT,
+            attempts INTEGER DEFAULT 0,
+            worker TEXT,
+            lease_expires_at TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Region/size size the warm pool, result holds per-bot outcomes of batch deploys
+    _add_columns(cursor, 'deploy_jobs', [
+        ('region', 'TEXT'),
+        ('size', 'TEXT'),
+        ('result', 'TEXT')
+    ])
+
+
+def snapshots_and_warm_pool(cursor):
+    """Golden snapshot images and pre-booted droplets (see backend/snapshots.py, backend/warmpool.py)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            snapshot_id TEXT NOT NULL,
+            name TEXT NOT NULL,
+            region TEXT NOT NULL,
+            size TEXT NOT NULL,
+            status TEXT DEFAULT 'ready',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS warm_droplets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            droplet_id INTEGER UNIQUE NOT NULL,
+            region TEXT NOT NULL,
+            size TEXT NOT NULL,
+            ip_address TEXT,
+            status TEXT DEFAULT 'booting',
+            claim_token TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            claimed_at TIMESTAMP
+        )
+    ''')
+
+
+def bot_heartbeats(cursor):
+    """Last status pushed by each droplet's heartbeat agent (see backend/heartbeat.py)"""
+    _add_columns(cursor, 'bots', [
+        ('last_seen_at', 'TIMESTAMP'),
+        ('heartbeat_ts', 'INTEGER'),
+        ('telegram_ready', 'INTEGER DEFAULT 0'),
+        ('service_active', 'INTEGER DEFAULT 0')
+    ])
+
+
+def unique_google_id(cursor):
+    """Rebuild users with UNIQUE google_id (SQLite can't add the constraint with ALTER TABLE)"""
+    # Keep the oldest account for a Google ID if duplicates slipped in before the constraint
+    cursor.execute('''
+        UPDATE users SET google_id = NULL
+        WHERE google_id IS NOT NULL
+          AND id NOT IN (SELECT MIN(id) FROM users WHERE google_id IS NOT NULL GROUP BY google_id)
+    ''')
+    if cursor.rowcount:
+        print(f"⚠️  Cleared {cursor.rowcount} duplicate Google ID(s) before adding UNIQUE constraint")
+
+    cursor.execute('''
+        CREATE TABLE users_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_login TIMESTAMP,
+            credits REAL DEFAULT 50.0,
+            has_paid INTEGER DEFAULT 0,
+            payment_date TIMESTAMP,
+            dodo_payment_id TEXT,
+            subscription_plan TEXT DEFAULT 'none',
+            plan_expires_at TIMESTAMP,
+            google_id TEXT UNIQUE,
+            google_name TEXT
+        )
+    ''')
+
+    columns = ('id, username, email, password_hash, created_at, last_login, credits, has_paid, payment_date, '
+               'dodo_payment_id, subscription_plan, plan_expires_at, google_id, google_name')
+    cursor.execute(f'INSERT INTO users_new ({columns}) SELECT {columns} FROM users')
+    cursor.execute('DROP TABLE users')
+    cursor.execute('ALTER TABLE users_new RENAME TO users')
+
+
+def indexes(cursor):
+    """Indexes for every lookup path in Database (python -m backend.query_plans checks none scans)"""
+    # users: username, email and google_id are UNIQUE, so SQLite already indexes them
+    statements = [
+        'CREATE INDEX IF NOT EXISTS idx_bots_user_created ON bots (user_id, created_at DESC)',
+        'CREATE INDEX IF NOT EXISTS idx_bots_droplet ON bots (droplet_id)',
+        'CREATE INDEX IF NOT EXISTS idx_bots_created ON bots (created_at DESC)',
+        'CREATE INDEX IF NOT EXISTS idx_api_keys_user ON api_keys (user_id)',
+        'CREATE INDEX IF NOT EXISTS idx_pending_payments_email_created ON pending_payments (email, created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_deploy_jobs_status_lease ON deploy_jobs (status, lease_expires_at)',
+        'CREATE INDEX IF NOT EXISTS idx_deploy_jobs_worker ON deploy_jobs (worker)',
+        'CREATE INDEX IF NOT EXISTS idx_deploy_jobs_kind_region_size ON deploy_jobs (kind, region, size, created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_snapshots_region_status_created ON snapshots (region, status, created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_snapshots_snapshot_id ON snapshots (snapshot_id)',
+        'CREATE INDEX IF NOT EXISTS idx_warm_droplets_pool ON warm_droplets (region, size, status, created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_warm_droplets_claim ON warm_droplets (claim_token)',
+    ]
+    for statement in statements:
+        cursor.execute(statement)
+
+
+def message_usage(cursor):
+    """Per-bot message counts in minute, hour and day buckets (see backend/usage.py)"""
+    for table in ('usage_minute', 'usage_hour', 'usage_day'):
+        # bucket is the unix time the bucket starts; WITHOUT ROWID keeps rows to the key plus one integer
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {table} (
+                bot_id INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                messages INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (bot_id, bucket)
+            ) WITHOUT ROWID
+        ''')
+        # Retention deletes by age across all bots
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_bucket ON {table} (bucket)')
+
+
+def postgres_baseline(cursor):
+    """Whole schema as of SQLite migration 7, for fresh PostgreSQL databases"""
+    statements = [
+        '''
+        CREATE TABLE IF NOT EXISTS users (
+            id BIGSERIAL PRIMARY KEY,
+            username TEXT UNIQUE NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_login TIMESTAMP,
+            credits REAL DEFAULT 50.0,
+            has_paid INTEGER DEFAULT 0,
+            payment_date TIMESTAMP,
+            dodo_payment_id TEXT,
+            subscription_plan TEXT DEFAULT 'none',
+            plan_expires_at TIMESTAMP,
+            google_id TEXT UNIQUE,
+            google_name TEXT
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS bots (
+            id BIGSERIAL PRIMARY KEY,
+            user_id BIGINT NOT NULL REFERENCES users (id),
+            bot_name TEXT NOT NULL,
+            bot_username TEXT NOT NULL,
+            ip_address TEXT NOT NULL,
+            gateway_token TEXT NOT NULL,
+            droplet_id BIGINT NOT NULL,
+            region TEXT NOT NULL,
+            status TEXT DEFAULT 'running',
+            message_count BIGINT DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_seen_at TIMESTAMP,
+            heartbeat_ts BIGINT,
+            telegram_ready INTEGER DEFAULT 0,
+            service_active INTEGER DEFAULT 0
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS api_keys (
+            id BIGSERIAL PRIMARY KEY,
+            user_id BIGINT NOT NULL REFERENCES users (id),
+            do_token TEXT,
+            anthropic_key TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS pending_payments (
+            id BIGSERIAL PRIMARY KEY,
+            email TEXT NOT NULL,
+            payment_id TEXT NOT NULL,
+            subscription_plan TEXT DEFAULT 'monthly',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS deploy_jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT DEFAULT 'deploy',
+            username TEXT,
+            status TEXT DEFAULT 'queued',
+            phase TEXT DEFAULT 'queued',
+            payload TEXT,
+            droplet_id BIGINT,
+            ip_address TEXT,
+            gateway_token TEXT,
+            bot_username TEXT,
+            bot_id BIGINT,
+            error TEXT,
+            attempts INTEGER DEFAULT 0,
+            worker TEXT,
+            lease_expires_at TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            region TEXT,
+            size TEXT,
+            result TEXT
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS snapshots (
+            id BIGSERIAL PRIMARY KEY,
+            snapshot_id TEXT NOT NULL,
+            name TEXT NOT NULL,
+            region TEXT NOT NULL,
+            size TEXT NOT NULL,
+            status TEXT DEFAULT 'ready',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS warm_droplets (
+            id BIGSERIAL PRIMARY KEY,
+            droplet_id BIGINT UNIQUE NOT NULL,
+            region TEXT NOT NULL,
+            size TEXT NOT NULL,
+            ip_address TEXT,
+            status TEXT DEFAULT 'booting',
+            claim_token TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            claimed_at TIMESTAMP
+        )
+        '''
+    ]
+    for table in ('usage_minute', 'usage_hour', 'usage_day'):
+        statements.append(f'''
+            CREATE TABLE IF NOT EXISTS {table} (
+                bot_id BIGINT NOT NULL,
+                bucket BIGINT NOT NULL,
+                messages BIGINT NOT NULL DEFAULT 0,
+                PRIMARY KEY (bot_id, bucket)
+            )
+        ''')
+        statements.append(f'CREATE INDEX IF NOT EXISTS idx_{table}_bucket ON {table} (bucket)')
+
+    for statement in statements:
+        cursor.execute(statement)
+
+    # Same secondary indexes as SQLite migration 6
+    indexes(cursor)
+
+
+# Append only: never renumber or edit a migration that has shipped
+MIGRATIONS = [
+    (1, 'baseline', baseline),
+    (2, 'deploy_jobs', deploy_jobs),
+    (3, 'snapshots_and_warm_pool', snapshots_and_warm_pool),
+    (4, 'bot_heartbeats', bot_heartbeats),
+    (5, 'unique_google_id', unique_google_id),
+    (6, 'indexes', indexes),
+    (7, 'message_usage', message_usage),
+]
+
+# PostgreSQL skips SQLite's history; migrations after 7 go in both lists with the same number
+POSTGRES_MIGRATIONS = [
+    (7, 'postgres_baseline', postgres_baseline),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def migrations_for(db):
+    """Migration list for a database's backend"""
+    if db.backend.dialect == 'postgres':
+        return POSTGRES_MIGRATIONS
+    return MIGRATIONS
+
+
+def current_version(db):
+    """Schema version of a database (0 if it has never been migrated)"""
+    if not db.backend.table_exists('schema_version'):
+        return 0
+    return db.query_one('SELECT COALESCE(MAX(version), 0) AS version FROM schema_version')['version']
+
+
+def migrate(db):
+    """Apply pending migrations in a single transaction (returns how many ran)"""
+    # Steady state: two reads, no DDL and no write lock
+    if current_version(db) >= LATEST_VERSION:
+        return 0
+
+    applied = 0
+    with db.transaction() as cursor:
+        # Workers starting together on Postgres would otherwise race to create schema_version
+        db.backend.serialize(cursor, 'migrations')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                applied_at TIMESTAMP
+            )
+        ''')
+
+        # Re-read under the write lock: another worker may have migrated while we waited
+        version = cursor.execute('SELECT COALESCE(MAX(version), 0) AS version FROM schema_version').fetchone()['version']
+
+        for number, name, migration in migrations_for(db):
+            if number <= version:
+                continue
+            migration(cursor)
+            cursor.execute(
+                'INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)',
+                (number, name, datetime.now())
+            )
+            print(f"🗄️  Applied migration {number:03d} {name}")
+            applied += 1
+
+    return applied
+
+
+if __name__ == '__main__':
+    # Show or apply migrations: python -m backend.migrations [db_path]  (DATABASE_URL selects Postgres)
+    from backend.database import Database
+
+    database = Database(sys.argv[1] if len(sys.argv) > 1 else 'openclaw_saas.db')
+    print(f"Schema version {current_version(database)} (latest {LATEST_VERSION})")
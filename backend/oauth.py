@@ -0,0 +1,128 @@
+"""
+Google sign-in for OpenClaw SaaS
+OAuth client config built once, ID tokens verified against Google's signing certs cached for as long as Google allows
+"""
+
+import os
+import re
+import threading
+import time
+
+import requests
+from google.auth import jwt
+from google_auth_oauthlib.flow import Flow
+from requests.adapters import HTTPAdapter
+from requests_oauthlib import OAuth2Session
+
+# Google's PEM signing certs (point at a local stub server to test sign-in offline)
+GOOGLE_CERTS_URL = os.environ.get('GOOGLE_CERTS_URL', 'https://www.googleapis.com/oauth2/v1/certs')
+GOOGLE_AUTH_URI = 'https://accounts.google.com/o/oauth2/auth'
+GOOGLE_TOKEN_URI = 'https://oauth2.googleapis.com/token'
+GOOGLE_ISSUERS = ('accounts.google.com', 'https://accounts.google.com')
+SCOPES = ['openid', 'https://www.googleapis.com/auth/userinfo.email', 'https://www.googleapis.com/auth/userinfo.profile']
+
+CERTS_DEFAULT_MAX_AGE = 300     # Seconds certs are kept when the response has no usable Cache-Control
+CERTS_RETRY_SECONDS = 60        # After a failed refresh (stale certs are kept) or an unknown key id, wait this long to refetch
+HTTP_TIMEOUT = 10
+
+
+def max_age(headers, default=CERTS_DEFAULT_MAX_AGE):
+    """Seconds a response may be cached, from Cache-Control max-age less its Age"""
+    cache_control = headers.get('Cache-Control', '')
+    if re.search(r'\b(no-store|no-cache)\b', cache_control):
+        return 0
+    match = re.search(r'\bmax-age=(\d+)', cache_control)
+    if not match:
+        return default
+    age = headers.get('Age', '0')
+    return max(0, int(match.group(1)) - (int(age) if age.isdigit() else 0))
+
+
+class CertCache:
+    def __init__(self, url, session):
+        """Initialize cache (certs are fetched on first use)"""
+        self.url = url
+        self.session = session
+        self._certs = None
+        self._expires_at = 0
+        self._next_forced_refresh = 0
+        self._fetches = 0
+        self._lock = threading.Lock()
+
+    def get(self, key_id=None):
+        """Current certs by key id, refetched once they expire or if key_id is new (rotation)"""
+        # One thread refetches while the rest wait for its result
+        with self._lock:
+            now = time.time()
+            if self._certs is None or now >= self._expires_at:
+                self._refresh()
+            elif key_id and key_id not in self._certs and now >= self._next_forced_refresh:
+                # Unknown kids in forged tokens must not turn every request into a fetch
+                self._next_forced_refresh = now + CERTS_RETRY_SECONDS
+                self._refresh()
+            return self._certs
+
+    def _refresh(self):
+        """Fetch certs (keeps the cached ones for a while if Google can't be reached)"""
+        try:
+            response = self.session.get(self.url, timeout=HTTP_TIMEOUT)
+            response.raise_for_status()
+            certs = response.json()
+        except (requests.RequestException, ValueError) as e:
+            if self._certs is None:
+                raise
+            print(f"❌ Google cert refresh failed, using cached certs: {e}")
+            self._expires_at = time.time() + CERTS_RETRY_SECONDS
+            return
+
+        self._certs = certs
+        self._expires_at = time.time() + max_age(response.headers)
+        self._fetches += 1
+
+    def stats(self):
+        """Fetch count and seconds until the cached certs expire"""
+        with self._lock:
+            return {'fetches': self._fetches, 'expires_in': max(0, round(self._expires_at - time.time()))}
+
+
+class GoogleOAuth:
+    def __init__(self, client_id, client_secret, redirect_uri, certs_url=None):
+        """Initialize client (one per process, shared by every request thread)"""
+        self.client_id = client_id
+        self.redirect_uri = redirect_uri
+        self.client_config = {
+            'web': {
+                'client_id': client_id,
+                'client_secret': client_secret,
+                'auth_uri': GOOGLE_AUTH_URI,
+                'token_uri': GOOGLE_TOKEN_URI,
+                'redirect_uris': [redirect_uri]
+            }
+        }
+        self.configured = bool(client_id and client_secret)
+
+        # Token exchanges and cert fetches reuse kept-alive connections to Google
+        self._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self.http = requests.Session()
+        self.http.mount('https://', self._adapter)
+        self.http.mount('http://', self._adapter)
+        self.certs = CertCache(certs_url or GOOGLE_CERTS_URL, self.http)
+
+    def flow(self, state=None, code_verifier=None):
+        """Flow for one sign-in (it holds that login's state and PKCE verifier) on the shared config and connections
+
+        Starting a sign-in generates a fresh code_verifier; the callback passes the one stored with the state.
+        """
+        oauth2session = OAuth2Session(client_id=self.client_id, scope=SCOPES, state=state)
+        oauth2session.mount('https://', self._adapter)
+        oauth2session.mount('http://', self._adapter)
+        return Flow(oauth2session, 'web', self.client_config,
+                    redirect_uri=self.redirect_uri, code_verifier=code_verifier)
+
+    def verify_id_token(self, token):
+        """Claims of a Google ID token (ValueError if its signature, audience, expiry or issuer is wrong)"""
+        key_id = jwt.decode_header(token).get('kid')
+        claims = jwt.decode(token, certs=self.certs.get(key_id), audience=self.client_id)
+        if claims.get('iss') not in GOOGLE_ISSUERS:
+            raise ValueError(f"Wrong issuer: {claims.get('iss')}")
+        return claims
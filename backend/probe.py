@@ -0,0 +1,204 @@
+"""
+Remote probe for OpenClaw SaaS
+One SSH execution returns logs and gateway status for a droplet as a single JSON document
+"""
+
+import json
+import shlex
+
+from backend.ssh import ssh_pool
+
+PROBE_VERSION = 3
+PROBE_PATH = '/usr/local/bin/openclaw-probe'
+
+# Installed on droplets with each bot's config (see BotDeployer.create_agent_script), and piped over stdin to droplets
+# that predate it (or have an older version). Python 3 stdlib only.
+PROBE_SCRIPT = r'''#!/usr/bin/env python3
+"""OpenClaw probe: deploy log, gateway journal and status as one JSON document"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+
+PROBE_VERSION = 3
+UNIT = 'openclaw-gateway'
+STATE_FILE = '/var/lib/openclaw-probe/state.json'
+CLOUD_INIT_LOG = '/var/log/cloud-init-output.log'
+TELEGRAM_STARTED = re.compile(r'\[telegram\].*starting provider')
+MAX_NEW_LINES = 500
+
+
+def run(args, timeout=10):
+    try:
+        return subprocess.run(args, capture_output=True, text=True, timeout=timeout).stdout
+    except Exception:
+        return ''
+
+
+def journal(*args):
+    """Gateway journal lines plus the cursor of the last entry read"""
+    lines = run(['journalctl', '-u', UNIT, '--no-pager', '--show-cursor'] + list(args)).splitlines()
+    cursor = None
+    if lines and lines[-1].startswith('-- cursor: '):
+        cursor = lines.pop()[len('-- cursor: '):]
+    return [line for line in lines if not line.startswith('-- No entries')], cursor
+
+
+def journal_head(count):
+    """First entries of the journal, without reading the rest of it"""
+    lines = []
+    try:
+        proc = subprocess.Popen(['journalctl', '-u', UNIT, '--no-pager'], stdout=subprocess.PIPE, text=True)
+        for line in proc.stdout:
+            if not line.startswith('-- No entries'):
+                lines.append(line.rstrip('\n'))
+            if len(lines) >= count:
+                break
+        proc.kill()
+        proc.wait()
+    except Exception:
+        pass
+    return lines
+
+
+def read_log(path, offset=None, count=80, max_bytes=65536):
+    """Complete lines after a byte offset (or the last count lines), plus the offset to read from next"""
+    try:
+        with open(path, 'rb') as f:
+            size = f.seek(0, os.SEEK_END)
+            # No offset yet, or the file was truncated since: start from the tail
+            start = max(0, size - max_bytes) if offset is None or offset > size else max(offset, size - max_bytes)
+            f.seek(start)
+            data = f.read(size - start)
+    except OSError:
+        return None, 0
+
+    end = data.rfind(b'\n') + 1
+    lines = data[:end].decode('utf-8', 'replace').splitlines()
+    return (lines if offset is not None else lines[-count:]), start + end
+
+
+def load_state():
+    try:
+        with open(STATE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state):
+    try:
+        os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+        with open(STATE_FILE + '.tmp', 'w') as f:
+            json.dump(state, f)
+        os.replace(STATE_FILE + '.tmp', STATE_FILE)
+    except OSError:
+        pass
+
+
+def telegram_ready(state):
+    """Scan only journal entries after the last cursor we checked, and remember success"""
+    if not state.get('telegram_ready'):
+        lines, cursor = journal(*(['--after-cursor', state['cursor']] if state.get('cursor') else []))
+        if any(TELEGRAM_STARTED.search(line) for line in lines):
+            state['telegram_ready'] = True
+        if cursor:
+            state['cursor'] = cursor
+    return bool(state.get('telegram_ready'))
+
+
+def option(name):
+    """Value following a command line flag, or None"""
+    if name in sys.argv[1:-1]:
+        return sys.argv[sys.argv.index(name) + 1]
+    return None
+
+
+def main():
+    if '--version' in sys.argv:
+        print(PROBE_VERSION)
+        return
+
+    state = load_state()
+    offset = option('--offset')
+
+    if '--status' in sys.argv:
+        # Heartbeat agent: gateway state only
+        doc, cursor, next_offset = {}, None, None
+    elif offset is None:
+        # Full snapshot for a viewer that has nothing yet
+        cloud_init, next_offset = read_log(CLOUD_INIT_LOG)
+        recent, cursor = journal('-n', '500')
+        doc = {
+            'cloud_init': cloud_init,
+            'startup': journal_head(30),
+            'recent': [line for line in recent if 'bonjour' not in line][-30:]
+        }
+    else:
+        # Only what was written after the viewer's journal cursor and cloud-init offset
+        since = option('--cursor')
+        cloud_init, next_offset = read_log(CLOUD_INIT_LOG, int(offset))
+        journal_lines, cursor = journal(*(['--after-cursor', since] if since else []))
+        doc = {
+            'cloud_init': cloud_init,
+            'journal': [line for line in journal_lines if 'bonjour' not in line][-MAX_NEW_LINES:]
+        }
+        cursor = cursor or since
+
+    doc.update({
+        'version': PROBE_VERSION,
+        'cursor': cursor,
+        'offset': next_offset,
+        'telegram_ready': telegram_ready(state),
+        'service_active': run(['systemctl', 'is-active', UNIT]).strip() == 'active'
+    })
+
+    save_state(state)
+    json.dump(doc, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
+'''
+
+
+def probe_command(args=()):
+    """Remote command: run the installed probe if it is current, otherwise the copy on stdin"""
+    quoted = ' '.join(shlex.quote(arg) for arg in args)
+    return (
+        f"if grep -q '^PROBE_VERSION = {PROBE_VERSION}$' {PROBE_PATH} 2>/dev/null; "
+        f"then exec python3 {PROBE_PATH} {quoted}; "
+        f"else exec python3 - {quoted}; fi"
+    )
+
+
+def run_probe(ip_address, args=(), timeout=15):
+    """Probe a droplet over SSH and return the parsed JSON document (raises if unreachable)"""
+    result = ssh_pool.run(ip_address, probe_command(args), input=PROBE_SCRIPT, timeout=timeout)
+    if result.returncode != 0 or not result.stdout.strip():
+        raise RuntimeError(f"Probe failed: {result.stderr.strip()[-200:]}")
+    return json.loads(result.stdout)
+
+
+def format_logs(probe):
+    """Render probe sections as the text shown in the dashboard logs panel"""
+    output_parts = []
+
+    if probe.get('cloud_init') is None:
+        output_parts.append("=== DEPLOYMENT LOG (cloud-init) ===")
+        output_parts.append('(cloud-init log not available yet)')
+    elif probe['cloud_init']:
+        output_parts.append("=== DEPLOYMENT LOG (cloud-init) ===")
+        output_parts.append('\n'.join(probe['cloud_init']))
+
+    if probe.get('startup'):
+        output_parts.append("\n=== OPENCLAW STARTUP LOG ===")
+        output_parts.append('\n'.join(probe['startup']))
+
+    if probe.get('recent'):
+        output_parts.append("\n=== RECENT ACTIVITY (bonjour filtered) ===")
+        output_parts.append('\n'.join(probe['recent']))
+
+    return '\n'.join(output_parts)
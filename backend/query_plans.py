@@ -0,0 +1,194 @@
+"""
+Query plan check for OpenClaw SaaS
+Runs every Database method against a scratch database and fails if any statement full-scans a table
+
+Usage: python -m backend.query_plans   (exit status 1 on a scan or an unexercised method)
+Set TEST_DATABASE_URL to an empty PostgreSQL database to run the same check against its planner too.
+"""
+
+import inspect
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+from backend.database import Database
+from backend.storage import _pyformat
+
+# Methods that read whole tables on purpose
+ALLOWED_SCANS = {'get_all_bots'}
+
+# Plumbing rather than queries
+SKIP_METHODS = {'init_database', 'close', 'transaction', 'query_one', 'query_all'}
+
+CHECKED_VERBS = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH')
+
+
+def exercise(db):
+    """Call every query method once with realistic arguments (yields method names as it goes)"""
+    now = datetime.now()
+
+    calls = [
+        ('store_pending_payment', ('paid@example.com', 'pay_1')),
+        ('get_pending_payment', ('paid@example.com',)),
+        ('create_user', ('alice', 'paid@example.com', 'hash')),
+        ('clear_pending_payment', ('paid@example.com',)),
+        ('create_google_user', ('bob', 'bob@example.com', 'google-1', 'Bob')),
+        ('get_user', ('alice',)),
+        ('get_user_by_email', ('bob@example.com',)),
+        ('get_user_by_google_id', ('google-1',)),
+        ('update_last_login', ('alice',)),
+        ('update_password_hash', ('alice', 'hash')),
+        ('update_payment_status', ('bob@example.com', 'pay_2')),
+        ('save_api_keys', ('alice', 'sk-test')),
+        ('get_api_keys', ('alice',)),
+        ('get_api_keys', ('alice',), {'user_id': 1}),
+        ('add_bot', ('alice', 'bot', 'bot', '10.0.0.1', 'token', 101, 'nyc3')),
+        ('add_bots', ('alice', [{'bot_username': 'b2', 'ip_address': '10.0.0.2', 'gateway_token': 't', 'droplet_id': 102}], 'nyc3')),
+        ('get_user_bots', ('alice',)),
+        ('get_user_bots', ('alice',), {'user_id': 1}),
+        ('get_all_bots', ()),
+        ('get_bot', (1,)),
+        ('get_bot_by_droplet_id', (101,)),
+        ('record_heartbeat', (1, int(now.timestamp()), True, True)),
+        ('update_bot_status', (1, 'running')),
+        ('increment_message_count', (1,)),
+        ('add_message_counts', ({1: 3},)),
+        ('record_usage', ({'minute': {(1, 60): 3}, 'hour': {(1, 0): 3}, 'day': {(1, 0): 3}},)),
+        ('get_usage', (1, 'hour', 0)),
+        ('prune_usage', ('minute', 0)),
+        ('delete_bot', (2,)),
+        ('create_deploy_job', ('job-1', 'alice', '{}', 'deploy', 'nyc3', 's-2vcpu-2gb')),
+        ('create_unique_job', ('job-2', 'snapshot', '{}', 3600)),
+        ('get_deploy_job', ('job-1',)),
+        ('claim_deploy_job', ('worker-1', 300, 3)),
+        ('update_deploy_job', ('job-1',), {'phase': 'created'}),
+        ('count_recent_deploys', ('nyc3', 's-2vcpu-2gb', now - timedelta(hours=6))),
+        ('fail_abandoned_deploy_jobs', (3,)),
+        ('add_snapshot', (1234, 'openclaw-base', 'nyc3', 's-1vcpu-2gb')),
+        ('get_snapshots', ('nyc3',)),
+        ('get_latest_snapshot', ('nyc3',)),
+        ('update_snapshot_status', (1234, 'deleted')),
+        ('add_warm_droplet', (201, 'nyc3', 's-2vcpu-2gb')),
+        ('get_warm_droplets', ('nyc3', 's-2vcpu-2gb')),
+        ('get_warm_droplets', ('nyc3', 's-2vcpu-2gb', 'idle')),
+        ('mark_warm_droplet_idle', (201, '10.0.0.3')),
+        ('claim_warm_droplet', ('nyc3', 's-2vcpu-2gb', 'claim-1')),
+        ('delete_warm_droplet', (201,)),
+    ]
+
+    for call in calls:
+        name, args = call[0], call[1]
+        kwargs = call[2] if len(call) > 2 else {}
+        yield name
+        getattr(db, name)(*args, **kwargs)
+
+
+def full_scans(conn, sql):
+    """Plan lines of a statement that scan a table without an index"""
+    plan = conn.execute(f'EXPLAIN QUERY PLAN {sql}').fetchall()
+    return [
+        row[3] for row in plan
+        if row[3].startswith('SCAN') and 'CONSTANT ROW' not in row[3]
+    ]
+
+
+def postgres_scans(plan):
+    """Nodes of a PostgreSQL JSON plan that read a whole table, or a whole index with no condition on it"""
+    scans = []
+    if plan['Node Type'] == 'Seq Scan' or (plan['Node Type'] in ('Index Scan', 'Index Only Scan')
+                                           and 'Index Cond' not in plan):
+        scans.append(f"{plan['Node Type'].upper()} {plan['Relation Name']}")
+    for child in plan.get('Plans', []):
+        scans.extend(postgres_scans(child))
+    return scans
+
+
+def trace(db, set_trace):
+    """Exercise every Database method, returning the names exercised and the (method, sql, params) they ran"""
+    statements = []
+    current = {'method': None}
+    set_trace(lambda sql, params=(): statements.append((current['method'], sql, params)))
+
+    exercised = set()
+    try:
+        for name in exercise(db):
+            current['method'] = name
+            exercised.add(name)
+    except Exception as e:
+        raise RuntimeError(f"{current['method']}: {e}") from e
+    finally:
+        set_trace(None)
+
+    return exercised, statements
+
+
+def find_problems(exercised, statements, scans):
+    """Unexercised methods, plus every scan the scans(sql, params) callback reports outside ALLOWED_SCANS"""
+    problems = []
+
+    methods = {
+        name for name, member in inspect.getmembers(Database, inspect.isfunction)
+        if not name.startswith('_') and name not in SKIP_METHODS
+    }
+    for name in sorted(methods - exercised):
+        problems.append(f"{name}: not exercised (add it to backend/query_plans.py)")
+
+    seen = set()
+    for method, sql, params in statements:
+        if not sql.lstrip().upper().startswith(CHECKED_VERBS) or (method, sql) in seen:
+            continue
+        seen.add((method, sql))
+        if method in ALLOWED_SCANS:
+            continue
+        for detail in scans(sql, params):
+            problems.append(f"{method}: {detail}\n    {' '.join(sql.split())}")
+
+    return problems
+
+
+def check(db_path=None):
+    """Exercise every Database method and return a list of problems (empty when all plans use indexes)"""
+    path = db_path or os.path.join(tempfile.mkdtemp(), 'plans.db')
+    # Plans are SQLite's (EXPLAIN QUERY PLAN), whatever DATABASE_URL says
+    db = Database(path, url='')
+    conn = db.backend.get_connection()
+
+    exercised, statements = trace(db, conn.set_trace_callback)
+    return find_problems(exercised, statements, lambda sql, params: full_scans(conn, sql))
+
+
+def check_postgres(url):
+    """The same check against an empty PostgreSQL database (its tables are created there if missing)"""
+    import psycopg
+    from psycopg import ClientCursor
+
+    db = Database(url=url)
+    try:
+        exercised, statements = trace(db, lambda callback: setattr(db.backend, 'trace', callback))
+    except RuntimeError as e:
+        return [str(e)]
+    finally:
+        db.close()
+
+    with psycopg.connect(url, autocommit=True) as conn:
+        # Empty tables make a sequential scan the cheapest plan; forbidding it shows whether an index could serve
+        conn.execute('SET enable_seqscan = off')
+
+        def scans(sql, params):
+            cursor = ClientCursor(conn)
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {_pyformat(sql)}', params)
+            return postgres_scans(cursor.fetchone()[0][0]['Plan'])
+
+        return find_problems(exercised, statements, scans)
+
+
+if __name__ == '__main__':
+    found = check()
+    if os.environ.get('TEST_DATABASE_URL'):
+        found += check_postgres(os.environ['TEST_DATABASE_URL'])
+    for problem in found:
+        print(f"❌ {problem}")
+    if found:
+        sys.exit(1)
+    print("✅ Every Database query uses an index")
@@ -0,0 +1,210 @@
+"""
+Droplet readiness watcher for OpenClaw SaaS
+One shared poller per process resolves a future per droplet once it is active with a public IP
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime, timezone
+
+from pydo import Client
+
+WATCH_TAG = 'openclaw-pending'  # Bot droplets are created with this tag; it comes off once they are ready
+BASE_DELAY = 2              # First poll after a new droplet is registered
+MAX_DELAY = 30
+ACTION_CHECK_SECONDS = 20   # Per droplet, how often to ask the actions API whether the create failed
+STALE_TAG_SECONDS = 3600    # Tagged droplets nobody watched for this long lost their watcher (process restart)
+
+_watchers = {}
+_watchers_lock = threading.Lock()
+
+
+def get_watcher(do_token):
+    """Get the process-wide watcher for a DigitalOcean token"""
+    with _watchers_lock:
+        if do_token not in _watchers:
+            _watchers[do_token] = DropletWatcher(do_token)
+        return _watchers[do_token]
+
+
+class DropletWatcher:
+    def __init__(self, do_token, tag=WATCH_TAG):
+        """Initialize watcher (the poll thread only runs while droplets are pending)"""
+        self.client = Client(token=do_token)
+        self.tag = tag
+        self.api_requests = 0   # Total DO API calls made, for comparing against per-droplet polling
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def watch(self, droplet_id, action_id=None, timeout=300, on_active=None):
+        """Register a droplet and return a Future resolving to its public IP"""
+        with self._lock:
+            entry = self._pending.get(droplet_id)
+            if entry:
+                return entry['future']
+
+            future = Future()
+            self._pending[droplet_id] = {
+                'future': future,
+                'action_id': action_id,
+                'deadline': time.time() + timeout,
+                'on_active': on_active,
+                'active': False,
+                'action_checked_at': time.time()
+            }
+
+            if not self._thread:
+                self._thread = threading.Thread(target=self._run, name='droplet-watcher', daemon=True)
+                self._thread.start()
+
+        # New droplet: restart the backoff so it is picked up quickly
+        self._wakeup.set()
+        return future
+
+    def _run(self):
+        """Poll with jittered exponential backoff until nothing is pending"""
+        attempt = 0
+
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+
+            try:
+                self._poll()
+            except Exception as e:
+                print(f"❌ Droplet watcher error: {str(e)}")
+
+            delay = min(MAX_DELAY, BASE_DELAY * (2 ** attempt))
+            attempt += 1
+            # Full jitter so many processes don't hit the API in lockstep
+            if self._wakeup.wait(random.uniform(delay / 2, delay)):
+                self._wakeup.clear()
+                attempt = 0
+
+    def _poll(self):
+        """One droplets.list by tag for every pending droplet, plus occasional action checks"""
+        droplets = self._list_tagged()
+        now = time.time()
+
+        with self._lock:
+            pending = list(self._pending.items())
+
+        self._untag_stale(droplets, {droplet_id for droplet_id, _ in pending})
+
+        for droplet_id, entry in pending:
+            droplet = droplets.get(droplet_id)
+
+            if droplet and droplet['status'] == 'active':
+                if not entry['active']:
+                    entry['active'] = True
+                    self._notify_active(entry)
+
+                ip_address = self._public_ip(droplet)
+                if ip_address:
+                    self._resolve(droplet_id, result=ip_address)
+                    continue
+
+            elif entry['action_id'] and now - entry['action_checked_at'] > ACTION_CHECK_SECONDS:
+                entry['action_checked_at'] = now
+                try:
+                    action = self._call(self.client.actions.get, action_id=entry['action_id'])['action']
+                except Exception as e:
+                    # One failed lookup must not hold up every other pending droplet
+                    print(f"❌ Droplet {droplet_id} action check error: {str(e)}")
+                    action = None
+                if action and action['status'] == 'errored':
+                    self._resolve(droplet_id, error=RuntimeError(f'Create action {entry["action_id"]} errored'))
+                    continue
+
+            if now > entry['deadline']:
+                self._final_check(droplet_id, entry)
+
+    def _final_check(self, droplet_id, entry):
+        """Direct lookup before giving up, so a droplet that just became active isn't reported as failed"""
+        try:
+            droplet = self._call(self.client.droplets.get, droplet_id=droplet_id)['droplet']
+            ip_address = self._public_ip(droplet) if droplet['status'] == 'active' else None
+        except Exception:
+            ip_address = None
+
+        if ip_address:
+            self._resolve(droplet_id, result=ip_address)
+        else:
+            self._resolve(droplet_id, error=TimeoutError(f'Droplet {droplet_id} not ready in time'))
+
+    def _list_tagged(self):
+        """All droplets carrying the watch tag, keyed by id"""
+        droplets = {}
+        page = 1
+
+        while True:
+            resp = self._call(self.client.droplets.list, tag_name=self.tag, per_page=200, page=page)
+            for droplet in resp.get('droplets', []):
+                droplets[droplet['id']] = droplet
+
+            total = resp.get('meta', {}).get('total', 0)
+            if not resp.get('droplets') or len(droplets) >= total:
+                return droplets
+            page += 1
+
+    def _untag(self, droplet_id):
+        """Take the watch tag off a droplet so later polls no longer list it"""
+        try:
+            self._call(
+                self.client.tags.unassign_resources,
+                tag_id=self.tag,
+                body={"resources": [{"resource_id": str(droplet_id), "resource_type": "droplet"}]}
+            )
+        except Exception as e:
+            print(f"⚠️  Droplet {droplet_id} untag error: {str(e)}")
+
+    def _untag_stale(self, droplets, watched):
+        """Untag long-tagged droplets no watcher is waiting on, so the tagged list stays small"""
+        now = datetime.now(timezone.utc)
+
+        for droplet_id, droplet in droplets.items():
+            if droplet_id in watched or not droplet.get('created_at'):
+                continue
+            created_at = datetime.fromisoformat(droplet['created_at'].replace('Z', '+00:00'))
+            if (now - created_at).total_seconds() > STALE_TAG_SECONDS:
+                self._untag(droplet_id)
+
+    def _call(self, method, **kwargs):
+        """Call the DO API and count the request"""
+        self.api_requests += 1
+        return method(**kwargs)
+
+    def _public_ip(self, droplet):
+        """Public IPv4 of a droplet, if assigned"""
+        return next(
+            (net['ip_address'] for net in droplet['networks']['v4'] if net['type'] == 'public'),
+            None
+        )
+
+    def _notify_active(self, entry):
+        """Run the on_active callback without letting it break the poller"""
+        if entry['on_active']:
+            try:
+                entry['on_active']()
+            except Exception as e:
+                print(f"❌ Droplet watcher callback error: {str(e)}")
+
+    def _resolve(self, droplet_id, result=None, error=None):
+        """Complete a droplet's future and stop watching it"""
+        with self._lock:
+            entry = self._pending.pop(droplet_id, None)
+        if not entry:
+            return
+
+        self._untag(droplet_id)
+
+        if error:
+            entry['future'].set_exception(error)
+        else:
+            entry['future'].set_result(result)
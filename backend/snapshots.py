@@ -0,0 +1,155 @@
+"""
+Golden snapshot builder for OpenClaw SaaS
+Bakes the static part of the bot install (packages, Node.js, OpenClaw) into a DigitalOcean snapshot
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+from backend.deployer import BotDeployer
+
+BUILD_TIMEOUT = 30 * 60      # apt upgrade + Node + OpenClaw install
+SNAPSHOT_TIMEOUT = 20 * 60
+POLL_SECONDS = 15
+KEEP_SNAPSHOTS = 2           # Previous snapshot stays around in case the new one is bad
+
+# Disk of the builder size is the minimum disk for droplets booted from the snapshot,
+# so build on a small size (s-1vcpu-2gb: 50 GB) that fits every bot plan
+SNAPSHOT_SIZE = os.environ.get('SNAPSHOT_SIZE', 's-1vcpu-2gb')
+SNAPSHOT_REGIONS = [r.strip() for r in os.environ.get('SNAPSHOT_REGIONS', 'nyc3').split(',') if r.strip()]
+SNAPSHOT_REBUILD_HOURS = float(os.environ.get('SNAPSHOT_REBUILD_HOURS', '168'))  # Weekly, 0 disables
+
+
+def is_image_error(error):
+    """Whether a droplet create failed because of the image itself (deleted, or too big for the size)
+
+    Rate limits, capacity and 5xx errors are not: the same snapshot will work on the next attempt.
+    """
+    if getattr(error, 'status_code', None) not in (404, 422):
+        return False
+    message = str(getattr(error, 'message', None) or error).lower()
+    return 'image' in message or 'size' in message or 'snapshot' in message
+
+
+class SnapshotBuilder:
+    def __init__(self, db, do_token):
+        """Initialize builder with database and DigitalOcean token"""
+        self.db = db
+        self.deployer = BotDeployer(do_token)
+        self.client = self.deployer.client
+
+    def is_due(self, region):
+        """Check whether the region has no snapshot or its newest one is older than the rebuild interval"""
+        latest = self.db.get_latest_snapshot(region)
+        if not latest:
+            return True
+        if SNAPSHOT_REBUILD_HOURS <= 0:
+            return False
+
+        created_at = datetime.fromisoformat(str(latest['created_at']))
+        return datetime.now() - created_at > timedelta(hours=SNAPSHOT_REBUILD_HOURS)
+
+    def build(self, region='nyc3', size=SNAPSHOT_SIZE, on_phase=None, heartbeat=None):
+        """Provision a builder droplet, snapshot it once the base install powers it off, record the id"""
+        name = f"openclaw-base-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+
+        # Only one build runs at a time, so any builder left over from a crashed worker is stale
+        try:
+            self.client.droplets.destroy_by_tag(tag_name='openclaw-builder')
+        except Exception:
+            pass
+
+        resp = self.client.droplets.create(body={
+            "name": f"openclaw-builder-{int(time.time())}",
+            "region": region,
+            "size": size,
+            "image": "ubuntu-24-04-x64",
+            "backups": False,
+            "ipv6": False,
+            "monitoring": False,
+            "tags": ["openclaw", "openclaw-builder"],
+            "user_data": self.deployer.create_snapshot_script()
+        })
+        droplet_id = resp["droplet"]["id"]
+
+        try:
+            # The snapshot script powers the droplet off when the base install finished
+            if on_phase:
+                on_phase('building')
+            self._wait_for_status(droplet_id, 'off', BUILD_TIMEOUT, heartbeat)
+
+            if on_phase:
+                on_phase('snapshotting')
+            action = self.client.droplet_actions.post(
+                droplet_id=droplet_id,
+                body={"type": "snapshot", "name": name}
+            )
+            self._wait_for_action(action["action"]["id"], SNAPSHOT_TIMEOUT, heartbeat)
+
+            snapshots = self.client.droplets.list_snapshots(droplet_id=droplet_id)["snapshots"]
+            snapshot = next((s for s in snapshots if s["name"] == name), None)
+            if not snapshot:
+                raise RuntimeError(f'Snapshot {name} not found after build')
+
+            self.db.add_snapshot(snapshot["id"], name, region, size)
+        finally:
+            self.deployer.delete_droplet(droplet_id)
+
+        self.prune(region)
+        return snapshot["id"]
+
+    def prune(self, region, keep=KEEP_SNAPSHOTS):
+        """Delete all but the newest snapshots for a region"""
+        for snapshot in self.db.get_snapshots(region)[keep:]:
+            try:
+                self.client.snapshots.delete(snapshot_id=snapshot['snapshot_id'])
+            except Exception as e:
+                print(f"❌ Snapshot delete error: {str(e)}")
+                continue
+            self.db.update_snapshot_status(snapshot['snapshot_id'], 'deleted')
+
+    def _wait_for_status(self, droplet_id, status, timeout, heartbeat=None):
+        """Wait for a droplet to reach a status"""
+        start_time = time.time()
+
+        while time.time() - start_time < timeout:
+            droplet = self.client.droplets.get(droplet_id=droplet_id)
+            if droplet["droplet"]["status"] == status:
+                return
+            if heartbeat:
+                heartbeat()
+            time.sleep(POLL_SECONDS)
+
+        raise RuntimeError(f'Builder droplet did not reach status {status} in time')
+
+    def _wait_for_action(self, action_id, timeout, heartbeat=None):
+        """Wait for a DigitalOcean action to complete"""
+        start_time = time.time()
+
+        while time.time() - start_time < timeout:
+            action = self.client.actions.get(action_id=action_id)["action"]
+            if action["status"] == "completed":
+                return
+            if action["status"] == "errored":
+                raise RuntimeError(f'Action {action_id} errored')
+            if heartbeat:
+                heartbeat()
+            time.sleep(POLL_SECONDS)
+
+        raise RuntimeError(f'Action {action_id} did not complete in time')
+
+
+if __name__ == '__main__':
+    # Manual rebuild: python -m backend.snapshots [region]
+    from backend.database import Database
+
+    token = os.environ.get('DIGITALOCEAN_TOKEN')
+    if not token:
+        sys.exit('DIGITALOCEAN_TOKEN is not set')
+
+    build_region = sys.argv[1] if len(sys.argv) > 1 else SNAPSHOT_REGIONS[0]
+    builder = SnapshotBuilder(Database(), token)
+    print(f"📸 Building golden snapshot in {build_region}...")
+    print(f"✅ Snapshot ready: {builder.build(build_region, on_phase=print)}")
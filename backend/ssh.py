@@ -0,0 +1,126 @@
+"""
+SSH transport for OpenClaw SaaS
+Reuses one authenticated, multiplexed SSH connection per droplet (OpenSSH ControlMaster)
+"""
+
+import atexit
+import os
+import subprocess
+import tempfile
+import threading
+import time
+
+CONTROL_DIR = os.path.join(tempfile.gettempdir(), 'openclaw-ssh')
+IDLE_SECONDS = int(os.environ.get('SSH_IDLE_SECONDS', '300'))       # Master closes after this long unused
+MAX_CONNECTIONS = int(os.environ.get('SSH_MAX_CONNECTIONS', '64'))  # Per process, least recently used closed first
+
+
+class SSHPool:
+    def __init__(self, control_dir=CONTROL_DIR, idle_seconds=IDLE_SECONDS, max_connections=MAX_CONNECTIONS):
+        """Initialize pool (masters are started lazily by the first command to each host)"""
+        self.control_dir = control_dir
+        self.idle_seconds = idle_seconds
+        self.max_connections = max_connections
+        self._last_used = {}
+        self._lock = threading.Lock()
+
+        os.makedirs(control_dir, mode=0o700, exist_ok=True)
+
+    def run(self, ip_address, command, input=None, timeout=15, known_hosts_file=None):
+        """Run a command on a droplet as root, reusing the host's master connection"""
+        self._touch(ip_address, known_hosts_file)
+
+        return subprocess.run(
+            self._ssh_args(ip_address, known_hosts_file) + [f"root@{ip_address}", command],
+            input=input,
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+
+    def popen(self, ip_address, command, known_hosts_file=None):
+        """Start a long-running command (e.g. journalctl -f) over the host's master connection"""
+        self._touch(ip_address, known_hosts_file)
+
+        return subprocess.Popen(
+            self._ssh_args(ip_address, known_hosts_file) + [f"root@{ip_address}", command],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+
+    def close(self, ip_address, known_hosts_file=None):
+        """Shut down the master connection to a host"""
+        with self._lock:
+            self._last_used.pop((ip_address, known_hosts_file), None)
+
+        subprocess.run(
+            self._ssh_args(ip_address, known_hosts_file) + ["-O", "exit", f"root@{ip_address}"],
+            capture_output=True,
+            timeout=5
+        )
+
+    def close_all(self):
+        """Shut down every master this process started"""
+        with self._lock:
+            hosts = list(self._last_used)
+        for ip_address, known_hosts_file in hosts:
+            try:
+                self.close(ip_address, known_hosts_file)
+            except Exception:
+                pass
+
+    def stats(self):
+        """Open connections and their idle time in seconds"""
+        now = time.time()
+        with self._lock:
+            return {ip: round(now - last_used) for (ip, _), last_used in self._last_used.items()}
+
+    def _ssh_args(self, ip_address, known_hosts_file):
+        """ssh command line with multiplexing options"""
+        # Pinned and unpinned connections never share a master, so a pinned command
+        # can't ride on a connection whose host key was never checked
+        control_path = os.path.join(self.control_dir, 'p-%C' if known_hosts_file else '%C')
+
+        args = [
+            "ssh",
+            "-o", "ControlMaster=auto",
+            "-o", f"ControlPath={control_path}",
+            "-o", f"ControlPersist={self.idle_seconds}",
+            "-o", "ConnectTimeout=8",
+            "-o", "ServerAliveInterval=15",
+            "-o", "BatchMode=yes",
+        ]
+        if known_hosts_file:
+            # Pin the host key seen on first contact instead of trusting whatever answers later
+            args += ["-o", "StrictHostKeyChecking=accept-new", "-o", f"UserKnownHostsFile={known_hosts_file}"]
+        else:
+            args += ["-o", "StrictHostKeyChecking=no"]
+        return args
+
+    def _touch(self, ip_address, known_hosts_file):
+        """Record use of a host and evict idle or least recently used masters"""
+        now = time.time()
+        evict = []
+
+        with self._lock:
+            self._last_used[(ip_address, known_hosts_file)] = now
+
+            # ControlPersist closes idle masters on its own, just forget them
+            for key, last_used in list(self._last_used.items()):
+                if now - last_used > self.idle_seconds:
+                    del self._last_used[key]
+
+            while len(self._last_used) > self.max_connections:
+                oldest = min(self._last_used, key=self._last_used.get)
+                del self._last_used[oldest]
+                evict.append(oldest)
+
+        for key in evict:
+            threading.Thread(target=self.close, args=key, daemon=True).start()
+
+
+ssh_pool = SSHPool()
+atexit.register(ssh_pool.close_all)
@@ -0,0 +1,83 @@
+"""
+Login throttling for OpenClaw SaaS
+Counts failed logins per client IP and per (username, IP) in a sliding window, so password guessing stops before it costs CPU
+"""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+LOGIN_WINDOW_SECONDS = int(os.environ.get('LOGIN_THROTTLE_WINDOW', '900'))      # Failures older than this are forgotten
+LOGIN_MAX_FAILURES_IP = int(os.environ.get('LOGIN_MAX_FAILURES_IP', '20'))      # Per client IP within the window
+LOGIN_MAX_FAILURES_USER = int(os.environ.get('LOGIN_MAX_FAILURES_USER', '5'))   # Per username from one IP within the window
+MAX_TRACKED_KEYS = 100000   # Oldest keys are dropped beyond this, so a flood of random usernames can't grow memory
+
+
+class FailureWindow:
+    def __init__(self, limit, window, max_keys=MAX_TRACKED_KEYS):
+        """Initialize window (a key is blocked once it has limit failures in the last window seconds)"""
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._failures = OrderedDict()     # key -> deque of failure times, oldest first
+        self._lock = threading.Lock()
+
+    def retry_after(self, key):
+        """Seconds until key may try again (0 if it isn't blocked)"""
+        now = time.time()
+        with self._lock:
+            failures = self._failures.get(key)
+            if not failures:
+                return 0
+            while failures and failures[0] <= now - self.window:
+                failures.popleft()
+            if not failures:
+                del self._failures[key]
+                return 0
+            if len(failures) < self.limit:
+                return 0
+            # Allowed again once enough old failures fall out of the window
+            return max(1, math.ceil(failures[-self.limit] + self.window - now))
+
+    def fail(self, key):
+        """Record a failure for key"""
+        with self._lock:
+            failures = self._failures.setdefault(key, deque(maxlen=self.limit))
+            failures.append(time.time())
+            self._failures.move_to_end(key)
+            while len(self._failures) > self.max_keys:
+                self._failures.popitem(last=False)
+
+    def reset(self, key):
+        """Forget key's failures (after a successful login)"""
+        with self._lock:
+            self._failures.pop(key, None)
+
+
+class LoginThrottle:
+    """Per-IP and per-(username, IP) failure windows for one gunicorn worker
+
+    The username window is keyed by IP too, so failed guesses from elsewhere can't lock the owner out of their account.
+    """
+
+    def __init__(self):
+        self.by_ip = FailureWindow(LOGIN_MAX_FAILURES_IP, LOGIN_WINDOW_SECONDS)
+        self.by_username = FailureWindow(LOGIN_MAX_FAILURES_USER, LOGIN_WINDOW_SECONDS)
+
+    def retry_after(self, ip, username):
+        """Seconds until this IP may try this username again (0 = go ahead)"""
+        return max(self.by_ip.retry_after(ip), self.by_username.retry_after((username, ip)))
+
+    def failed(self, ip, username):
+        """Record a failed login"""
+        self.by_ip.fail(ip)
+        self.by_username.fail((username, ip))
+
+    def succeeded(self, ip, username):
+        """Clear this IP's failures on a username (its per-IP count stays, so one good account can't reset guessing)"""
+        self.by_username.reset((username, ip))
+
+
+login_throttle = LoginThrottle()
@@ -0,0 +1,76 @@
+"""
+Message usage time series for OpenClaw SaaS
+Per-bot message counts in minute, hour and day buckets, all written at ingest so reads never aggregate raw rows
+"""
+
+import os
+import time
+
+# Bucket width in seconds for each resolution
+RESOLUTIONS = {
+    'minute': 60,
+    'hour': 3600,
+    'day': 86400
+}
+
+# Days each resolution is kept (older minute data survives only in its hour and day rollups)
+RETENTION_DAYS = {
+    'minute': int(os.environ.get('USAGE_MINUTE_RETENTION_DAYS', '2')),
+    'hour': int(os.environ.get('USAGE_HOUR_RETENTION_DAYS', '90')),
+    'day': int(os.environ.get('USAGE_DAY_RETENTION_DAYS', '730'))
+}
+
+# ?range= values for /api/bots/<id>/usage: resolution served and seconds covered
+RANGES = {
+    '1h': ('minute', 3600),
+    '24h': ('hour', 86400),
+    '7d': ('hour', 7 * 86400),
+    '30d': ('day', 30 * 86400),
+    '365d': ('day', 365 * 86400)
+}
+DEFAULT_RANGE = '24h'
+
+RETENTION_COOLDOWN = 3600   # Prune at most hourly
+
+
+def bucket_start(timestamp, resolution):
+    """Unix time a bucket of the given resolution starts at (UTC)"""
+    width = RESOLUTIONS[resolution]
+    return int(timestamp) // width * width
+
+
+def rollup(minutes):
+    """Spread minute counts ({(bot_id, minute): count}) over every resolution"""
+    buckets = {resolution: {} for resolution in RESOLUTIONS}
+    for (bot_id, minute), count in minutes.items():
+        for resolution, counts in buckets.items():
+            key = (bot_id, bucket_start(minute, resolution))
+            counts[key] = counts.get(key, 0) + count
+    return buckets
+
+
+def usage_series(db, bot_id, range_name, now=None):
+    """Zero-filled usage points for a bot over one of RANGES, ending with the current bucket"""
+    resolution, seconds = RANGES[range_name]
+    width = RESOLUTIONS[resolution]
+    end = bucket_start(now or time.time(), resolution)
+    start = end - seconds + width
+
+    counts = {row['bucket']: row['messages'] for row in db.get_usage(bot_id, resolution, start)}
+    points = [{'t': bucket, 'messages': counts.get(bucket, 0)} for bucket in range(start, end + width, width)]
+
+    return {
+        'range': range_name,
+        'resolution': resolution,
+        'total': sum(point['messages'] for point in points),
+        'points': points
+    }
+
+
+def prune(db, now=None):
+    """Delete buckets older than their resolution's retention (returns rows deleted)"""
+    now = now or time.time()
+    deleted = 0
+    for resolution, days in RETENTION_DAYS.items():
+        deleted += db.prune_usage(resolution, bucket_start(now - days * 86400, resolution))
+    return deleted
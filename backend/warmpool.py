@@ -0,0 +1,163 @@
+"""
+Warm pool for OpenClaw SaaS
+Keeps idle, fully booted droplets ready so a deploy only has to push the bot's config
+"""
+
+import math
+import os
+import secrets
+import time
+from datetime import datetime, timedelta
+
+from backend.deployer import BotDeployer, forget_host_key, is_warm_ready
+
+WARM_TAG = 'openclaw-warm'
+
+# Pools to keep warm as region:size pairs, e.g. "nyc3:s-2vcpu-2gb,sfo3:s-2vcpu-2gb"
+WARM_POOLS = [tuple(p.strip().split(':', 1)) for p in os.environ.get('WARM_POOLS', 'nyc3:s-2vcpu-2gb').split(',') if ':' in p]
+WARM_POOL_MIN = int(os.environ.get('WARM_POOL_MIN', '0'))
+WARM_POOL_MAX = int(os.environ.get('WARM_POOL_MAX', '0'))                          # 0 disables the pool
+WARM_POOL_MAX_HOURLY_COST = float(os.environ.get('WARM_POOL_MAX_HOURLY_COST', '0.25'))  # USD/hour per pool on idle droplets
+WARM_POOL_LEAD_MINUTES = 20     # Deploys we expect while a new warm droplet boots
+RATE_WINDOW_HOURS = 6           # Deploy rate is averaged over this window
+MAX_IDLE_HOURS = 24             # Recycle idle droplets so they pick up new snapshots
+CLAIM_TIMEOUT_MINUTES = 30      # Claimed but never handed off (worker died mid hand-off)
+
+_hourly_prices = {}
+
+
+class WarmPool:
+    def __init__(self, db, do_token):
+        """Initialize warm pool with database and DigitalOcean token"""
+        self.db = db
+        self.deployer = BotDeployer(do_token)
+        self.client = self.deployer.client
+
+    def target_size(self, region, size):
+        """Idle droplets to keep: recent deploy rate over the boot lead time, clamped and cost-capped"""
+        since = datetime.now() - timedelta(hours=RATE_WINDOW_HOURS)
+        recent = self.db.count_recent_deploys(region, size, since)
+        per_minute = recent / (RATE_WINDOW_HOURS * 60)
+
+        target = max(WARM_POOL_MIN, min(WARM_POOL_MAX, math.ceil(per_minute * WARM_POOL_LEAD_MINUTES)))
+
+        price = self._hourly_price(size)
+        if price:
+            target = min(target, int(WARM_POOL_MAX_HOURLY_COST // price))
+
+        return target
+
+    def replenish(self, region, size):
+        """Promote booted droplets, drop stale ones and create or trim to the target size"""
+        now = datetime.now()
+
+        for droplet in self.db.get_warm_droplets(region, size):
+            created_at = datetime.fromisoformat(str(droplet['created_at']))
+
+            if droplet['status'] == 'booting':
+                self._check_booted(droplet)
+            elif droplet['status'] == 'idle' and now - created_at > timedelta(hours=MAX_IDLE_HOURS):
+                self._destroy(droplet['droplet_id'])
+            elif droplet['status'] == 'claimed' and droplet['claimed_at']:
+                claimed_at = datetime.fromisoformat(str(droplet['claimed_at']))
+                if now - claimed_at > timedelta(minutes=CLAIM_TIMEOUT_MINUTES):
+                    self._destroy(droplet['droplet_id'])
+
+        pool = [d for d in self.db.get_warm_droplets(region, size) if d['status'] in ('booting', 'idle')]
+        target = self.target_size(region, size)
+
+        if len(pool) < target:
+            if not self.deployer.get_ssh_key_ids():
+                print("⚠️  Warm pool needs platform SSH keys to push bot config, skipping")
+                return
+            for _ in range(target - len(pool)):
+                self._create(region, size)
+        else:
+            # Trim surplus, newest first (booting ones cost the same as idle ones)
+            for droplet in reversed(pool[target:]):
+                self._destroy(droplet['droplet_id'])
+
+    def claim(self, region, size):
+        """Claim an idle warm droplet (None if the pool is empty)"""
+        return self.db.claim_warm_droplet(region, size, secrets.token_hex(8))
+
+    def hand_off(self, droplet, telegram_token, nvidia_key, gateway_token, openrouter_key=None, bot_name='openclaw-bot'):
+        """Push the bot config over SSH, then turn the warm droplet into a regular bot droplet"""
+        # Host key was pinned when the droplet became ready, so this goes to the same machine
+        self.deployer.push_bot_config(droplet['ip_address'], telegram_token, nvidia_key, gateway_token,
+                                      openrouter_key=openrouter_key)
+
+        # Cosmetic: rename and retag so the droplet looks like any other bot in the DO console
+        droplet_id = droplet['droplet_id']
+        resource = {"resources": [{"resource_id": str(droplet_id), "resource_type": "droplet"}]}
+        try:
+            self.client.droplet_actions.post(
+                droplet_id=droplet_id,
+                body={"type": "rename", "name": f"{bot_name}-{int(time.time())}"}
+            )
+            self.client.tags.unassign_resources(tag_id=WARM_TAG, body=resource)
+            for tag in ("saas", "bot"):
+                self.client.tags.assign_resources(tag_id=tag, body=resource)
+        except Exception as e:
+            print(f"⚠️  Warm droplet {droplet_id} retag error: {str(e)}")
+
+        self.db.delete_warm_droplet(droplet_id)
+
+    def discard(self, droplet):
+        """Destroy a claimed droplet whose hand-off failed"""
+        self._destroy(droplet['droplet_id'])
+
+    def _create(self, region, size):
+        """Boot a new warm droplet from the golden snapshot (or the full base install)"""
+        snapshot = self.db.get_latest_snapshot(region)
+
+        resp = self.client.droplets.create(body={
+            "name": f"openclaw-warm-{int(time.time())}-{secrets.token_hex(2)}",
+            "region": region,
+            "size": size,
+            "image": int(snapshot['snapshot_id']) if snapshot else "ubuntu-24-04-x64",
+            "ssh_keys": self.deployer.get_ssh_key_ids(),
+            "backups": False,
+            "ipv6": True,
+            "monitoring": True,
+            "tags": ["openclaw", WARM_TAG],
+            "user_data": self.deployer.create_warm_script(from_snapshot=bool(snapshot))
+        })
+        self.db.add_warm_droplet(resp["droplet"]["id"], region, size)
+
+    def _check_booted(self, droplet):
+        """Mark a booting droplet idle once it has an IP and its warm script finished"""
+        try:
+            info = self.client.droplets.get(droplet_id=droplet['droplet_id'])["droplet"]
+        except Exception as e:
+            print(f"❌ Warm droplet {droplet['droplet_id']} lookup error: {str(e)}")
+            return
+
+        if info["status"] != "active":
+            return
+
+        ip_address = next((net["ip_address"] for net in info["networks"]["v4"] if net["type"] == "public"), None)
+        if not ip_address:
+            return
+
+        # New droplet may reuse an IP we pinned for an old one
+        forget_host_key(ip_address)
+
+        if is_warm_ready(ip_address):
+            self.db.mark_warm_droplet_idle(droplet['droplet_id'], ip_address)
+
+    def _destroy(self, droplet_id):
+        """Destroy a warm droplet and forget it"""
+        self.deployer.delete_droplet(droplet_id)
+        self.db.delete_warm_droplet(droplet_id)
+
+    def _hourly_price(self, size):
+        """Hourly USD price of a droplet size (cached per process)"""
+        if size not in _hourly_prices:
+            try:
+                sizes = self.client.sizes.list(per_page=200)["sizes"]
+                _hourly_prices.update({s["slug"]: s["price_hourly"] for s in sizes})
+            except Exception as e:
+                print(f"❌ Size price lookup error: {str(e)}")
+                return None
+        return _hourly_prices.get(size)
@@ -38,6 +38,8 @@ async function loadBots() {
             displayBots(data.bots, 'bots-list');
             displayBots(data.bots, 'bots-management');
             updateStats(data.bots);
+            // Check Telegram status for all bots in one request
+            checkFleetStatus();
         }
     } catch (error) {
         console.error('Error loading bots:', error);
@@ -92,8 +94,6 @@ function displayBots(bots, containerId) {
         </div>
     `).join('');
 
-    // Check Telegram status for each bot
-    bots.forEach(bot => checkBotStatus(bot.id, bot.bot_username));
 }
 
 function updateStats(bots) {
@@ -146,8 +146,14 @@ async function deployBot(event) {
             body: JSON.stringify(botData)
         });
 
+        let data = await response.json();
+
+        // Deployment runs in the background — poll the job until the droplet has an IP
+        if (data.success && data.job_id) {
+            data = await waitForDeployJob(data.job_id, progressText);
+        }
+
         clearInterval(progressInterval);
-        const data = await response.json();
 
         if (data.success) {
             progressFill.style.width = '100%';
@@ -157,7 +163,7 @@ async function deployBot(event) {
                 ✓ Bot deployed successfully!<br>
                 <strong>Bot:</strong> @${data.bot_username}<br>
                 <strong>IP:</strong> ${data.ip_address}<br>
-                <strong>Status:</strong> Ready to use!
+                <strong>Status:</strong> Installing OpenClaw, watch the logs panel
             `);
 
             form.reset();
@@ -179,6 +185,34 @@ async function deployBot(event) {
     }
 }
 
+const DEPLOY_PHASE_TEXT = {
+    'queued': '⏳ Waiting for a deploy worker...',
+    'created': '🌊 Creating droplet...',
+    'droplet-active': '🔌 Droplet booted, assigning IP...',
+    'ip-assigned': '📦 IP assigned, installing OpenClaw...',
+    'gateway-ready': '✅ Gateway ready!'
+};
+
+async function waitForDeployJob(jobId, progressText) {
+    // Resolves once the bot has an IP (it then shows up on the dashboard) or the job fails
+    while (true) {
+        await new Promise(resolve => setTimeout(resolve, 3000));
+
+        const response = await fetch(`/api/deploy/${jobId}`);
+        const job = await response.json();
+
+        if (!job.success || job.status === 'failed') {
+            return { success: false, error: job.error || job.message };
+        }
+
+        progressText.textContent = DEPLOY_PHASE_TEXT[job.phase] || job.phase;
+
+        if (job.bot_id) {
+            return job;
+        }
+    }
+}
+
 async function confirmDeleteBot(botId, botName) {
     if (confirm(`Are you sure you want to delete bot "${botName}"?\n\nThis will permanently delete the bot and its data.`)) {
         await deleteBot(botId);
@@ -239,6 +273,24 @@ async function populateBotSelects() {
 // Auto-refresh interval tracker for logs during deployment
 let logAutoRefreshTimer = null;
 
+// Log position of the bot shown in the logs panel, so refreshes only fetch new lines
+let logView = null;
+const MAX_RECENT_LOG_LINES = 500;
+
+function renderLogs(sections) {
+    const parts = [];
+    if (sections.cloud_init.length) {
+        parts.push('=== DEPLOYMENT LOG (cloud-init) ===', sections.cloud_init.join('\n'));
+    }
+    if (sections.startup.length) {
+        parts.push('\n=== OPENCLAW STARTUP LOG ===', sections.startup.join('\n'));
+    }
+    if (sections.recent.length) {
+        parts.push('\n=== RECENT ACTIVITY (bonjour filtered) ===', sections.recent.join('\n'));
+    }
+    return parts.join('\n');
+}
+
 async function loadLogs(botId) {
     // If no botId passed, read from dropdown
     if (!botId) {
@@ -247,6 +299,8 @@ async function loadLogs(botId) {
     const logsContent = document.getElementById('logs-content');
 
     if (!botId) {
+        logView = null;
+        stopLogStream();
         logsContent.textContent = 'Select a bot to view logs...';
         return;
     }
@@ -255,17 +309,43 @@ async function loadLogs(botId) {
     const isFirstLoad = logsContent.textContent === 'Select a bot to view logs...';
     if (isFirstLoad) logsContent.textContent = '⏳ Loading logs...';
 
+    // Same bot and we know where we left off: ask only for new lines
+    const incremental = logView && logView.botId === String(botId) && logView.offset !== null;
+    const url = incremental
+        ? `/api/logs/${botId}?offset=${logView.offset}&cursor=${encodeURIComponent(logView.cursor || '')}`
+        : `/api/logs/${botId}`;
+
     try {
-        const response = await fetch(`/api/logs/${botId}`);
+        const response = await fetch(url);
         const data = await response.json();
 
-        if (data.success) {
-            logsContent.textContent = data.logs || 'No logs available';
-            // Auto-scroll to bottom to follow latest output
-            logsContent.scrollTop = logsContent.scrollHeight;
-        } else {
+        if (!data.success) {
             logsContent.textContent = '✗ Failed to load logs: ' + data.message;
+            return;
+        }
+
+        if (incremental) {
+            // Droplet unreachable this time: keep what's shown and retry from the same position
+            if (!data.cloud_init) return;
+            // While the live stream is open it owns the journal, polling only adds cloud-init output
+            const streaming = logStream && logStream.botId === String(botId);
+            const journal = streaming ? [] : data.journal;
+            logView.offset = data.offset;
+            if (!streaming) logView.cursor = data.cursor;
+            if (!data.cloud_init.length && !journal.length) return;
+            logView.sections.cloud_init.push(...data.cloud_init);
+            logView.sections.recent = logView.sections.recent.concat(journal).slice(-MAX_RECENT_LOG_LINES);
+            logsContent.textContent = renderLogs(logView.sections);
+        } else {
+            logView = data.sections
+                ? {botId: String(botId), cursor: data.cursor, offset: data.offset, sections: data.sections}
+                : null;
+            logsContent.textContent = data.logs || 'No logs available';
+            if (logView) startLogStream(botId);
+            else stopLogStream();
         }
+        // Auto-scroll to bottom to follow latest output
+        logsContent.scrollTop = logsContent.scrollHeight;
     } catch (error) {
         logsContent.textContent = '✗ Connection error';
         console.error('Logs error:', error);
@@ -297,6 +377,58 @@ function stopLogAutoRefresh() {
     }
 }
 
+// Live gateway log stream (Server-Sent Events) for the bot in the logs panel
+let logStream = null;
+
+function startLogStream(botId) {
+    if (logStream && logStream.botId === String(botId)) return;
+    stopLogStream();
+    if (!window.EventSource) {
+        startLogPolling();
+        return;
+    }
+
+    const source = new EventSource(`/api/logs/${botId}/stream?cursor=${encodeURIComponent(logView.cursor || '')}`);
+    let failures = 0;
+    logStream = {botId: String(botId), source: source};
+
+    source.onmessage = (event) => {
+        failures = 0;
+        if (!logView || logView.botId !== String(botId)) return;
+        logView.sections.recent.push(JSON.parse(event.data));
+        logView.sections.recent = logView.sections.recent.slice(-MAX_RECENT_LOG_LINES);
+        if (event.lastEventId) logView.cursor = event.lastEventId;
+
+        const logsContent = document.getElementById('logs-content');
+        logsContent.textContent = renderLogs(logView.sections);
+        logsContent.scrollTop = logsContent.scrollHeight;
+    };
+
+    source.onerror = () => {
+        // EventSource reconnects by itself; give up on streaming if that keeps failing,
+        // or right away if the server refused the stream (e.g. 503 when it is at its stream limit)
+        failures += 1;
+        if (failures >= 3 || source.readyState === EventSource.CLOSED) {
+            stopLogStream();
+            startLogPolling();
+        }
+    };
+}
+
+function stopLogStream() {
+    if (logStream) {
+        logStream.source.close();
+        logStream = null;
+    }
+}
+
+function startLogPolling() {
+    // Fallback when streaming is unavailable: incremental refresh of the selected bot every 10 seconds
+    if (!logAutoRefreshTimer) {
+        logAutoRefreshTimer = setInterval(() => loadLogs(), 10000);
+    }
+}
+
 async function logout() {
     try {
         await fetch('/api/logout', { method: 'POST' });
@@ -392,74 +524,88 @@ async function subscribeToDeploy() {
     }
 }
 
-async function checkBotStatus(botId, botUsername) {
-    try {
-        console.log(`[Bot ${botId}] Checking Telegram status...`);
-        const response = await fetch(`/api/bots/${botId}/status`);
-        const data = await response.json();
+// Single timer re-polling /api/bots/status while any bot is still coming up
+let fleetStatusTimer = null;
 
-        console.log(`[Bot ${botId}] Status response:`, data);
+async function checkFleetStatus() {
+    clearTimeout(fleetStatusTimer);
+    fleetStatusTimer = null;
 
-        const statusElement = document.getElementById(`telegram-status-${botId}`);
-        const actionsElement = document.getElementById(`actions-${botId}`);
+    let nextCheck = null;
+    try {
+        const response = await fetch('/api/bots/status');
+        const data = await response.json();
 
-        if (!statusElement) {
-            console.warn(`[Bot ${botId}] Status element not found, stopping checks`);
+        if (!data.success) {
+            console.error('Status check failed:', data.message);
             return;
         }
 
-        if (data.success) {
-            const status = data.status;
-            console.log(`[Bot ${botId}] Current status: ${status}, Telegram ready: ${data.telegram_ready}`);
-
-            if (status === 'ready') {
-                // Telegram is connected and ready!
-                statusElement.innerHTML = '🟢 Ready!';
-                statusElement.style.color = 'var(--primary-green)';
-                console.log(`[Bot ${botId}] ✅ Telegram is ready!`);
-
-                // Stop auto-refreshing logs - bot is fully running
-                stopLogAutoRefresh();
-
-                // Add test button if not already present
-                if (actionsElement && !actionsElement.querySelector('.btn-test')) {
-                    const testBtn = `<button class="btn-small btn-test" onclick="window.open('https://t.me/${botUsername}', '_blank')" style="background: var(--primary-cyan); color: var(--bg-dark);">
-                        💬 TEST BOT
-                    </button>`;
-                    actionsElement.insertAdjacentHTML('afterbegin', testBtn);
-                    console.log(`[Bot ${botId}] Added TEST BOT button`);
-                }
-                // Stop checking - bot is ready!
-            } else if (status === 'initializing') {
-                statusElement.textContent = '🟡 Initializing...';
-                statusElement.style.color = '#ffbd2e';
-                console.log(`[Bot ${botId}] Service active, waiting for Telegram... (checking again in 5s)`);
-                // Auto-open logs panel and refresh every 10s so user can see what's happening
-                startLogAutoRefresh(botId);
-                // Check again in 5 seconds - service is running but Telegram not ready yet
-                setTimeout(() => checkBotStatus(botId, botUsername), 5000);
-            } else {
-                // Still deploying
-                statusElement.textContent = '🟡 Setting up...';
-                statusElement.style.color = '#ffbd2e';
-                console.log(`[Bot ${botId}] VPS still deploying... (checking again in 10s)`);
-                // Auto-open logs panel and refresh every 10s so user can see what's happening
-                startLogAutoRefresh(botId);
-                // Check again in 10 seconds - VPS still being set up
-                setTimeout(() => checkBotStatus(botId, botUsername), 10000);
-            }
-        } else {
-            console.error(`[Bot ${botId}] Status check failed:`, data.message);
-        }
+        data.bots.forEach(bot => {
+            const delay = applyBotStatus(bot);
+            if (delay !== null) nextCheck = nextCheck === null ? delay : Math.min(nextCheck, delay);
+        });
     } catch (error) {
-        console.error(`[Bot ${botId}] Status check error:`, error);
-        const statusElement = document.getElementById(`telegram-status-${botId}`);
-        if (statusElement) {
+        console.error('Status check error:', error);
+        document.querySelectorAll('[id^="telegram-status-"]').forEach(statusElement => {
             statusElement.textContent = '⚠️ Checking...';
             statusElement.style.color = 'var(--primary-cyan)';
-            // Retry in 10 seconds on error
-            console.log(`[Bot ${botId}] Error occurred, retrying in 10s`);
-            setTimeout(() => checkBotStatus(botId, botUsername), 10000);
+        });
+        // Retry in 10 seconds on error
+        nextCheck = 10000;
+    }
+
+    if (nextCheck !== null) {
+        fleetStatusTimer = setTimeout(checkFleetStatus, nextCheck);
+    }
+}
+
+function applyBotStatus(bot) {
+    // Update one bot's card, returns ms until it should be checked again (null when ready)
+    const botId = bot.id;
+    const statusElement = document.getElementById(`telegram-status-${botId}`);
+    const actionsElement = document.getElementById(`actions-${botId}`);
+
+    if (!statusElement) return null;
+
+    if (bot.status === 'ready') {
+        // Telegram is connected and ready!
+        statusElement.innerHTML = '🟢 Ready!';
+        statusElement.style.color = 'var(--primary-green)';
+
+        // Stop auto-refreshing logs - bot is fully running
+        stopLogAutoRefresh();
+
+        // Add test button if not already present
+        if (actionsElement && !actionsElement.querySelector('.btn-test')) {
+            const testBtn = `<button class="btn-small btn-test" onclick="window.open('https://t.me/${bot.bot_username}', '_blank')" style="background: var(--primary-cyan); color: var(--bg-dark);">
+                💬 TEST BOT
+            </button>`;
+            actionsElement.insertAdjacentHTML('afterbegin', testBtn);
         }
+        return null;
+    }
+
+    if (bot.status === 'unknown') {
+        // Status check didn't finish in time on the server; ask again shortly
+        statusElement.textContent = '⚠️ Checking...';
+        statusElement.style.color = 'var(--primary-cyan)';
+        return 5000;
+    }
+
+    if (bot.status === 'initializing') {
+        statusElement.textContent = '🟡 Initializing...';
+        statusElement.style.color = '#ffbd2e';
+        // Auto-open logs panel and refresh every 10s so user can see what's happening
+        startLogAutoRefresh(botId);
+        // Service is running but Telegram not ready yet
+        return 5000;
     }
+
+    // Still deploying
+    statusElement.textContent = '🟡 Setting up...';
+    statusElement.style.color = '#ffbd2e';
+    // Auto-open logs panel and refresh every 10s so user can see what's happening
+    startLogAutoRefresh(botId);
+    return 10000;
 }
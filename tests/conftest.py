@@ -0,0 +1,79 @@
+"""
+Shared fixtures for the OpenClaw SaaS tests
+Database tests run on SQLite, and on PostgreSQL as well when TEST_DATABASE_URL or DATABASE_URL is set
+(each test gets a scratch schema there, dropped afterwards, so existing tables are never touched)
+"""
+
+import os
+import secrets
+from urllib.parse import quote
+
+import pytest
+
+from backend import storage
+from backend.database import Database
+
+POSTGRES_URL = os.environ.get('TEST_DATABASE_URL') or os.environ.get('DATABASE_URL', '')
+
+
+def scratch_schema_url(url, schema):
+    """DATABASE_URL with every connection's search_path set to one schema"""
+    separator = '&' if '?' in url else '?'
+    return f"{url}{separator}options={quote(f'-csearch_path={schema}')}"
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    """Migrated SQLite database in a temporary directory"""
+    database = Database(str(tmp_path / 'openclaw_test.db'), url='')
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def postgres_url():
+    """URL of a fresh, empty PostgreSQL schema (skipped without a database URL)"""
+    if not POSTGRES_URL:
+        pytest.skip('TEST_DATABASE_URL / DATABASE_URL is not set')
+    import psycopg
+
+    schema = f"openclaw_test_{secrets.token_hex(4)}"
+    with psycopg.connect(POSTGRES_URL, autocommit=True) as conn:
+        conn.execute(f'CREATE SCHEMA {schema}')
+
+    yield scratch_schema_url(POSTGRES_URL, schema)
+
+    with psycopg.connect(POSTGRES_URL, autocommit=True) as conn:
+        conn.execute(f'DROP SCHEMA {schema} CASCADE')
+
+
+@pytest.fixture
+def postgres_db(postgres_url):
+    """Migrated PostgreSQL database in a fresh schema"""
+    database = Database(url=postgres_url)
+    yield database
+    database.close()
+
+
+@pytest.fixture(params=['sqlite', 'postgres'])
+def db(request):
+    """The same test against each storage backend"""
+    return request.getfixturevalue(f'{request.param}_db')
+
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    """app.py, imported from a scratch directory on SQLite so its own database never touches DATABASE_URL"""
+    with pytest.MonkeyPatch.context() as patch:
+        patch.chdir(tmp_path_factory.mktemp('app'))
+        patch.setattr(storage, 'DATABASE_URL', '')
+        import app
+    return app
+
+
+@pytest.fixture
+def client(app_module, db, monkeypatch):
+    """Flask test client whose routes use the test's database"""
+    monkeypatch.setattr(app_module, 'db', db)
+    app_module.status_cache.clear()
+    return app_module.app.test_client()
@@ -0,0 +1,216 @@
+"""
+Dashboard API routes, run against a scratch database (no droplet is contacted)
+"""
+
+import gzip
+import time
+
+import pytest
+
+from backend import auth, throttle
+from backend.auth import hash_password, parse_hash
+from backend.oauth import GoogleOAuth
+from backend.throttle import LoginThrottle
+
+
+def login(client, username):
+    with client.session_transaction() as session:
+        session['username'] = username
+
+
+@pytest.fixture
+def login_throttle(app_module, monkeypatch):
+    fresh = LoginThrottle()
+    monkeypatch.setattr(app_module, 'login_throttle', fresh)
+    return fresh
+
+
+@pytest.fixture
+def fast_hashes(monkeypatch):
+    monkeypatch.setattr(auth, 'PASSWORD_HASH_ALGORITHM', 'pbkdf2-sha256')
+    monkeypatch.setattr(auth, 'PBKDF2_ITERATIONS', 1000)
+
+
+def add_bot(db, username, droplet_id):
+    """A bot whose droplet sent a fresh heartbeat, so its status never needs an SSH probe"""
+    db.create_user(username, f'{username}@example.com', 'x')
+    bot_id = db.add_bot(username, 'bot', f'{username}_bot', '10.0.0.1', 'token', droplet_id, 'nyc3')
+    db.record_heartbeat(bot_id, int(time.time()), True, True)
+    return bot_id
+
+
+def test_fleet_status_needs_login(client):
+    assert client.get('/api/bots/status').status_code == 401
+
+
+def test_fleet_status_lists_only_own_bots(client, db):
+    own = add_bot(db, 'alice', 1)
+    add_bot(db, 'bob', 2)
+    login(client, 'alice')
+
+    bots = client.get('/api/bots/status').get_json()['bots']
+
+    assert [(bot['id'], bot['status']) for bot in bots] == [(own, 'ready')]
+
+
+def test_fleet_status_of_every_bot_is_admin_only(client, db):
+    add_bot(db, 'alice', 1)
+    login(client, 'alice')
+
+    assert client.get('/api/bots/status?scope=all').status_code == 403
+
+
+def test_status_of_another_users_bot_is_not_found(client, db):
+    own = add_bot(db, 'alice', 1)
+    other = add_bot(db, 'bob', 2)
+    login(client, 'alice')
+
+    assert client.get(f'/api/bots/{own}/status').get_json()['status'] == 'ready'
+    assert client.get(f'/api/bots/{other}/status').status_code == 404
+
+
+def test_slow_probes_are_reported_unknown(client, db, app_module, monkeypatch):
+    db.create_user('alice', 'alice@example.com', 'x')
+    db.add_bot('alice', 'bot', 'alice_bot', '10.0.0.1', 'token', 1, 'nyc3')   # No heartbeat yet: needs an SSH probe
+    monkeypatch.setattr(app_module, 'FLEET_STATUS_DEADLINE', 0.05)
+    monkeypatch.setattr(app_module, 'probe_gateway', lambda ip_address: time.sleep(0.5))
+    login(client, 'alice')
+
+    started = time.time()
+    bots = client.get('/api/bots/status').get_json()['bots']
+
+    assert time.time() - started < 0.5
+    assert [bot['status'] for bot in bots] == ['unknown']
+
+
+def test_fleet_status_of_every_bot_never_probes(client, db, app_module, monkeypatch):
+    db.create_user('alice', 'alice@example.com', 'x')
+    db.add_bot('alice', 'bot', 'alice_bot', '10.0.0.1', 'token', 1, 'nyc3')
+    monkeypatch.setattr(app_module, 'ADMIN_USERNAMES', {'alice'})
+    monkeypatch.setattr(app_module, 'probe_gateway', pytest.fail)
+    login(client, 'alice')
+
+    assert [bot['status'] for bot in client.get('/api/bots/status?scope=all').get_json()['bots']] == ['unknown']
+
+
+def test_usage_is_only_shown_to_the_owner(client, db):
+    own = add_bot(db, 'alice', 1)
+    other = add_bot(db, 'bob', 2)
+    login(client, 'alice')
+
+    assert client.get(f'/api/bots/{own}/usage?range=1h').get_json()['resolution'] == 'minute'
+    assert client.get(f'/api/bots/{other}/usage').status_code == 404
+    assert client.get(f'/api/bots/{own}/usage?range=2h').status_code == 400
+
+
+def test_logs_of_another_users_bot_are_not_found(client, db, app_module, monkeypatch):
+    add_bot(db, 'alice', 1)
+    other = add_bot(db, 'bob', 2)
+    monkeypatch.setattr(app_module.log_cache, 'snapshot', pytest.fail)
+    monkeypatch.setattr(app_module.log_cache, 'since', pytest.fail)
+    login(client, 'alice')
+
+    assert client.get(f'/api/logs/{other}').status_code == 404
+    assert client.get(f'/api/logs/{other}?offset=0').status_code == 404
+
+
+def test_log_stream_of_another_users_bot_is_not_found(client, db):
+    add_bot(db, 'alice', 1)
+    other = add_bot(db, 'bob', 2)
+    login(client, 'alice')
+
+    assert client.get(f'/api/logs/{other}/stream').status_code == 404
+
+
+def post_login(client, password):
+    return client.post('/api/login', json={'username': 'alice', 'password': password})
+
+
+def test_login(client, db, login_throttle, fast_hashes):
+    db.create_user('alice', 'alice@example.com', hash_password('right'))
+
+    assert post_login(client, 'wrong').status_code == 401
+    assert post_login(client, 'right').status_code == 200
+    with client.session_transaction() as session:
+        assert session['username'] == 'alice'
+
+
+def test_failed_logins_are_throttled_before_hashing(client, db, login_throttle, fast_hashes):
+    db.create_user('alice', 'alice@example.com', hash_password('right'))
+    for _ in range(throttle.LOGIN_MAX_FAILURES_USER):
+        assert post_login(client, 'wrong').status_code == 401
+
+    response = post_login(client, 'right')
+
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) > 0
+
+
+def test_login_upgrades_an_outdated_hash(client, db, login_throttle, fast_hashes):
+    db.create_user('alice', 'alice@example.com', hash_password('right', 'pbkdf2-sha256', {'i': 500}))
+
+    assert post_login(client, 'right').status_code == 200
+
+    stored = db.get_user('alice')['password_hash']
+    assert parse_hash(stored)[:2] == ('pbkdf2-sha256', {'i': 1000})
+    assert auth.verify_password('right', stored)
+
+
+def test_google_sign_in_round_trips_the_pkce_verifier(client, app_module, monkeypatch):
+    google = GoogleOAuth('client-id', 'secret', 'http://localhost/auth/google/callback')
+    monkeypatch.setattr(app_module, 'google_oauth', google)
+
+    assert 'code_challenge=' in client.get('/auth/google').location
+    with client.session_transaction() as session:
+        code_verifier = session['code_verifier']
+
+    flows = []
+
+    def flow(state=None, code_verifier=None):
+        flows.append(code_verifier)
+        raise RuntimeError('stop before the token exchange')
+
+    monkeypatch.setattr(google, 'flow', flow)
+    client.get('/auth/google/callback?state=x&code=y')
+    assert flows == [code_verifier]
+
+    # The verifier is single-use
+    assert client.get('/auth/google/callback?state=x&code=y').status_code == 400
+
+
+def test_blog_post_is_served_compressed_with_validators(client, app_module):
+    slug = next(iter(app_module.blog_pages))
+
+    response = client.get(f'/blog/{slug}', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert b'<html' in gzip.decompress(response.data).lower()
+
+    revalidated = client.get(f'/blog/{slug}', headers={'Accept-Encoding': 'gzip', 'If-None-Match': response.headers['ETag']})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b''
+
+
+def test_blog_post_validator_only_matches_its_own_encoding(client, app_module):
+    slug = next(iter(app_module.blog_pages))
+    gzip_etag = client.get(f'/blog/{slug}', headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+
+    response = client.get(f'/blog/{slug}', headers={'Accept-Encoding': 'identity', 'If-None-Match': gzip_etag})
+
+    assert response.status_code == 200
+    assert 'Content-Encoding' not in response.headers
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert b'<html' in response.data.lower()
+
+
+def test_unknown_blog_post_is_not_found(client):
+    assert client.get('/blog/no-such-post').status_code == 404
+
+
+def test_landing_page_links_sized_favicons(client):
+    html = client.get('/').get_data(as_text=True)
+
+    assert 'logo-32.' in html
+    assert 'logo-192.' in html
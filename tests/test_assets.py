@@ -0,0 +1,71 @@
+"""
+Fingerprinted, precompressed static assets
+"""
+
+import gzip
+import json
+
+import pytest
+
+from werkzeug.datastructures import Accept
+
+from backend.assets import MANIFEST_NAME, AssetManifest, build, fingerprint
+
+CSS = 'body { color: red; }' * 50
+
+
+@pytest.fixture
+def dist_dir(tmp_path):
+    static_dir = tmp_path / 'static'
+    (static_dir / 'css').mkdir(parents=True)
+    (static_dir / 'css' / 'site.css').write_text(CSS)
+    (static_dir / 'css' / 'site.css.backup').write_text('old')
+    build(str(static_dir), str(static_dir / 'dist'))
+    return static_dir / 'dist'
+
+
+def test_fingerprint_follows_content():
+    assert fingerprint('css/site.css', b'a') == fingerprint('css/site.css', b'a')
+    assert fingerprint('css/site.css', b'a') != fingerprint('css/site.css', b'b')
+    assert fingerprint('css/site.css', b'a').startswith('css/site.')
+    assert fingerprint('css/site.css', b'a').endswith('.css')
+
+
+def test_build_writes_manifest_and_compressed_siblings(dist_dir):
+    assets = json.loads((dist_dir / MANIFEST_NAME).read_text())['assets']
+    entry = assets['css/site.css']
+
+    assert list(assets) == ['css/site.css']
+    assert entry['file'] == fingerprint('css/site.css', CSS.encode())
+    assert 'gzip' in entry['encodings']
+    assert gzip.decompress((dist_dir / f"{entry['file']}.gz").read_bytes()) == CSS.encode()
+
+
+def test_manifest_picks_the_accepted_variant(dist_dir):
+    manifest = AssetManifest(str(dist_dir))
+    hashed = manifest.lookup('css/site.css')
+
+    assert manifest.variant(hashed, Accept([('gzip', 1)])) == ('css/site.css', 'gzip', hashed + '.gz')
+    assert manifest.variant(hashed, Accept([])) == ('css/site.css', 'identity', hashed)
+    assert manifest.variant('css/unknown.css', Accept([('gzip', 1)])) is None
+    assert AssetManifest(str(dist_dir / 'missing')).lookup('css/site.css') is None
+
+
+def test_asset_route_serves_precompressed_files_forever(client, app_module, dist_dir, monkeypatch):
+    manifest = AssetManifest(str(dist_dir))
+    monkeypatch.setattr(app_module, 'asset_manifest', manifest)
+    monkeypatch.setattr(app_module, 'ASSET_DIST_DIR', str(dist_dir))
+    hashed = manifest.lookup('css/site.css')
+
+    with app_module.app.test_request_context():
+        assert app_module.asset_url('css/site.css') == f'/assets/{hashed}'
+        assert app_module.asset_url('css/other.css') == '/static/css/other.css'
+
+    response = client.get(f'/assets/{hashed}', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Content-Type'].startswith('text/css')
+    assert 'immutable' in response.headers['Cache-Control']
+    assert gzip.decompress(response.data) == CSS.encode()
+    response.close()
+
+    assert client.get('/assets/css/site.000000000000.css').status_code == 404
@@ -0,0 +1,118 @@
+"""
+Password hash formats: current self-describing hashes, legacy ones, and when to upgrade
+"""
+
+import hashlib
+import secrets
+import threading
+
+import pytest
+
+from backend import auth
+from backend.auth import HashingBusy, HashingPool, hash_password, needs_rehash, parse_hash, verify_password
+
+FAST_PBKDF2 = {'i': 1000}
+FAST_SCRYPT = {'n': 1024, 'r': 8, 'p': 1}
+
+
+@pytest.fixture(autouse=True)
+def fast_params(monkeypatch):
+    """Cheap costs for new hashes so the suite doesn't spend seconds in PBKDF2"""
+    monkeypatch.setattr(auth, 'PASSWORD_HASH_ALGORITHM', 'pbkdf2-sha256')
+    monkeypatch.setattr(auth, 'PBKDF2_ITERATIONS', FAST_PBKDF2['i'])
+    monkeypatch.setattr(auth, 'SCRYPT_N', FAST_SCRYPT['n'])
+
+
+def legacy_hash(password):
+    """Hash as written by the original hash_password: hex salt text + PBKDF2 digest at 100000 iterations"""
+    salt = secrets.token_hex(32)
+    return salt + hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt.encode('utf-8'), 100000).hex()
+
+
+def test_new_hash_names_algorithm_and_cost():
+    stored = hash_password('hunter2')
+
+    _, algorithm, params, salt, digest = stored.split('$')
+    assert algorithm == 'pbkdf2-sha256'
+    assert params == 'i=1000'
+    assert len(bytes.fromhex(salt)) == auth.SALT_BYTES
+    assert len(bytes.fromhex(digest)) == auth.DIGEST_BYTES
+
+
+def test_salts_differ_between_hashes():
+    assert hash_password('hunter2') != hash_password('hunter2')
+
+
+@pytest.mark.parametrize('algorithm, params', [('pbkdf2-sha256', FAST_PBKDF2), ('scrypt', FAST_SCRYPT)])
+def test_verify_round_trip(algorithm, params):
+    stored = hash_password('correct horse', algorithm, params)
+
+    assert verify_password('correct horse', stored)
+    assert not verify_password('correct horsf', stored)
+
+
+def test_hash_verifies_after_parameters_change(monkeypatch):
+    stored = hash_password('hunter2')
+    monkeypatch.setattr(auth, 'PBKDF2_ITERATIONS', 2000)
+
+    # The stored hash carries its own cost, so old passwords keep working
+    assert verify_password('hunter2', stored)
+
+
+def test_legacy_hash_verifies():
+    stored = legacy_hash('hunter2')
+
+    assert verify_password('hunter2', stored)
+    assert not verify_password('hunter3', stored)
+    assert parse_hash(stored)[:2] == ('pbkdf2-sha256', {'i': auth.LEGACY_ITERATIONS})
+
+
+@pytest.mark.parametrize('stored', [
+    '',
+    'abc',
+    '$md5$i=1$00$00',
+    '$pbkdf2-sha256$n=1$00$00',
+    '$pbkdf2-sha256$i=1000$00',
+    '$scrypt$n=1024$00$00',
+])
+def test_malformed_hash_never_verifies(stored):
+    assert not verify_password('anything', stored)
+    assert needs_rehash(stored)
+
+
+def test_needs_rehash():
+    assert not needs_rehash(hash_password('hunter2'))
+    assert needs_rehash(legacy_hash('hunter2'))
+    assert needs_rehash(hash_password('hunter2', 'pbkdf2-sha256', {'i': 500}))
+    assert needs_rehash(hash_password('hunter2', 'scrypt', FAST_SCRYPT))
+
+
+def test_needs_rehash_follows_configured_algorithm(monkeypatch):
+    stored = hash_password('hunter2')
+    monkeypatch.setattr(auth, 'PASSWORD_HASH_ALGORITHM', 'scrypt')
+
+    assert needs_rehash(stored)
+    assert not needs_rehash(hash_password('hunter2'))
+
+
+def test_pool_rejects_when_every_slot_is_taken():
+    pool = HashingPool(workers=1, queue_max=0)
+    started = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        started.set()
+        release.wait(5)
+
+    holder = threading.Thread(target=pool._run, args=(hold,))
+    holder.start()
+    try:
+        assert started.wait(5)
+        with pytest.raises(HashingBusy):
+            pool.hash_password('hunter2')
+    finally:
+        release.set()
+        holder.join()
+
+    assert pool.verify_password('hunter2', pool.hash_password('hunter2'))
+    assert pool.stats()['rejected'] == 1
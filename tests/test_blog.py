@@ -0,0 +1,57 @@
+"""
+Blog posts: front matter, and pages rendered and compressed once
+"""
+
+import gzip
+
+import pytest
+
+from werkzeug.datastructures import Accept
+
+from backend.blog import REQUIRED_FIELDS, RenderedPage, load_posts, parse_post
+
+POST = """---
+title: Hello
+description: First post
+date: February 21, 2026
+read_time: 3
+---
+<p>Body</p>
+"""
+
+
+def test_parse_post():
+    fields, body = parse_post(POST)
+
+    assert fields == {'title': 'Hello', 'description': 'First post', 'date': 'February 21, 2026', 'read_time': '3'}
+    assert body == '<p>Body</p>'
+
+
+@pytest.mark.parametrize('text', [
+    '<p>No front matter</p>',
+    '---\ntitle: Hello\n<p>Never closed</p>',
+    '---\ntitle: Hello\n---\n<p>Missing fields</p>',
+])
+def test_parse_post_rejects_bad_front_matter(text):
+    with pytest.raises(ValueError):
+        parse_post(text)
+
+
+def test_every_shipped_post_loads():
+    posts = load_posts()
+
+    assert posts
+    for post in posts.values():
+        assert all(post[field] for field in REQUIRED_FIELDS + ('content',))
+
+
+def test_page_variants_have_their_own_etags():
+    page = RenderedPage('<p>Body</p>' * 100)
+
+    encoding, body, etag = page.negotiate(Accept([('gzip', 1)]))
+    assert encoding == 'gzip'
+    assert gzip.decompress(body) == page.body
+    assert page.negotiate(Accept([]))[0] == 'identity'
+    etags = [variant_etag for _, variant_etag in page.variants.values()]
+    assert len(set(etags)) == len(etags)
+    assert etag == page.variants['gzip'][1]
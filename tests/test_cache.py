@@ -0,0 +1,49 @@
+"""
+In-process TTL cache
+"""
+
+from backend import cache
+from backend.cache import TTLCache
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+def test_entries_expire(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, 'time', clock.time)
+    entries = TTLCache(ttl=10)
+
+    entries.set('a', 1)
+    clock.now += 10
+    assert entries.get('a') == 1
+    clock.now += 1
+    assert entries.get('a') is None
+
+
+def test_least_recently_used_entries_are_evicted():
+    entries = TTLCache(ttl=60, max_entries=2)
+    entries.set('a', 1)
+    entries.set('b', 2)
+    entries.get('a')
+    entries.set('c', 3)
+
+    assert entries.get('a') == 1
+    assert entries.get('b') is None
+    assert entries.get('c') == 3
+
+
+def test_delete_and_clear():
+    entries = TTLCache(ttl=60)
+    entries.set('a', 1)
+    entries.set('b', 2)
+
+    entries.delete('a')
+    assert entries.get('a') is None
+    entries.clear()
+    assert entries.get('b') is None
@@ -0,0 +1,85 @@
+"""
+Buffered message counters and the usage buckets they feed
+"""
+
+import time
+
+from backend.counters import MessageCounter
+from backend.usage import usage_series
+
+
+def add_bot(db):
+    db.create_user('alice', 'alice@example.com', 'x')
+    return db.add_bot('alice', 'bot', 'alice_bot', '10.0.0.1', 'token', 42, 'nyc3')
+
+
+def test_flush_writes_counts_and_usage(db):
+    bot_id = add_bot(db)
+    counter = MessageCounter(db, flush_ms=60000, flush_at=1000)
+    now = 86400 * 20000 + 3600 * 5 + 30
+
+    counter.increment(bot_id, 2, timestamp=now)
+    counter.increment(bot_id, 3, timestamp=now + 60)
+    counter.increment(bot_id, 0, timestamp=now)
+    assert counter.pending(bot_id) == 5
+    assert counter.flush() == 1
+
+    assert counter.pending(bot_id) == 0
+    assert db.get_bot(bot_id)['message_count'] == 5
+    series = usage_series(db, bot_id, '1h', now=now + 60)
+    assert series['total'] == 5
+    assert [p['messages'] for p in series['points']][-2:] == [2, 3]
+
+    # A second flush of the same hour adds to its bucket instead of replacing it
+    counter.increment(bot_id, 1, timestamp=now)
+    counter.flush()
+    assert usage_series(db, bot_id, '24h', now=now)['total'] == 6
+
+
+def test_failed_flush_requeues_the_batch(db):
+    bot_id = add_bot(db)
+
+    class FailingDB:
+        def __init__(self):
+            self.fail = True
+
+        def transaction(self):
+            return db.transaction()
+
+        def add_message_counts(self, counts):
+            if self.fail:
+                raise RuntimeError('database is locked')
+            db.add_message_counts(counts)
+
+        def record_usage(self, buckets):
+            db.record_usage(buckets)
+
+    flaky = FailingDB()
+    counter = MessageCounter(flaky, flush_ms=60000, flush_at=1000)
+    counter.increment(bot_id, 4)
+
+    assert counter.flush() == 0
+    assert counter.pending(bot_id) == 4
+    assert counter.stats()['failed_flushes'] == 1
+
+    flaky.fail = False
+    counter.increment(bot_id, 1)
+    assert counter.flush() == 1
+    assert db.get_bot(bot_id)['message_count'] == 5
+
+
+def test_full_buffer_is_flushed_early(db):
+    bot_id = add_bot(db)
+    counter = MessageCounter(db, flush_ms=60000, flush_at=3)
+    counter.start()
+    try:
+        counter.increment(bot_id, 3)
+        deadline = time.time() + 5
+        while counter.pending(bot_id) and time.time() < deadline:
+            time.sleep(0.01)
+        assert counter.pending(bot_id) == 0
+    finally:
+        counter.stop()
+
+    assert db.get_bot(bot_id)['message_count'] == 3
+    assert counter.stats()['flushes'] == 1
@@ -0,0 +1,230 @@
+"""
+Database methods on every storage backend (PostgreSQL runs when DATABASE_URL is set)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.storage import _pyformat, create_backend
+
+
+def bot_row(username, droplet_id):
+    return {'bot_username': f'{username}_bot_{droplet_id}', 'ip_address': '10.0.0.1',
+            'gateway_token': 'token', 'droplet_id': droplet_id}
+
+
+def test_pyformat_rewrites_placeholders_and_escapes_percent():
+    assert _pyformat("SELECT * FROM users WHERE username = ? AND email LIKE '%@x'") == \
+        "SELECT * FROM users WHERE username = %s AND email LIKE '%%@x'"
+
+
+def test_create_backend_rejects_unknown_scheme():
+    with pytest.raises(ValueError):
+        create_backend('unused.db', 'mysql://localhost/openclaw')
+
+
+def test_sqlite_connection_is_reused_per_thread(sqlite_db):
+    backend = sqlite_db.backend
+    conn = backend.get_connection()
+    assert backend.get_connection() is conn
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        other = pool.submit(backend.get_connection).result()
+    assert other is not conn
+
+    sqlite_db.close()
+    assert backend.get_connection() is not conn
+
+
+def test_sqlite_connection_uses_wal(sqlite_db):
+    assert sqlite_db.query_one('PRAGMA journal_mode')['journal_mode'] == 'wal'
+
+
+def test_create_user_and_duplicates(db):
+    assert db.create_user('alice', 'alice@example.com', 'hash')
+    assert not db.create_user('alice', 'other@example.com', 'hash')
+    assert not db.create_user('bob', 'alice@example.com', 'hash')
+
+    user = db.get_user('alice')
+    assert user['email'] == 'alice@example.com'
+    assert user['has_paid'] == 0
+    assert db.get_user_by_email('alice@example.com')['username'] == 'alice'
+    assert db.get_user('nobody') is None
+
+
+def test_user_reads_are_cached_and_copied(db):
+    db.create_user('alice', 'alice@example.com', 'hash')
+    db.get_user('alice')['email'] = 'changed@example.com'
+
+    # Written behind the cache's back: lookups by every key keep serving the cached record
+    with db.transaction() as cursor:
+        cursor.execute("UPDATE users SET password_hash = 'other' WHERE username = 'alice'")
+
+    assert db.get_user('alice')['email'] == 'alice@example.com'
+    assert db.get_user('alice')['password_hash'] == 'hash'
+    assert db.get_user_by_email('alice@example.com')['password_hash'] == 'hash'
+
+
+def test_writes_invalidate_the_user_cache(db):
+    db.create_user('alice', 'alice@example.com', 'hash')
+    assert db.get_user('alice')['has_paid'] == 0
+
+    db.update_password_hash('alice', 'new-hash')
+    assert db.get_user('alice')['password_hash'] == 'new-hash'
+
+    db.update_last_login('alice')
+    assert db.get_user('alice')['last_login'] is not None
+
+    db.update_payment_status('alice@example.com', 'pay_1')
+    user = db.get_user('alice')
+    assert user['has_paid'] == 1
+    assert user['dodo_payment_id'] == 'pay_1'
+
+
+def test_pending_payment_activates_new_user(db):
+    db.store_pending_payment('alice@example.com', 'pay_1')
+
+    # Runs the pending payment lookup and clear inside create_user's transaction
+    assert db.create_user('alice', 'alice@example.com', 'hash')
+
+    user = db.get_user('alice')
+    assert user['has_paid'] == 1
+    assert user['dodo_payment_id'] == 'pay_1'
+    assert db.get_pending_payment('alice@example.com') is None
+
+
+def test_google_user(db):
+    assert db.create_google_user('alice', 'alice@example.com', 'g-1', 'Alice')
+    assert not db.create_google_user('alice2', 'alice2@example.com', 'g-1', 'Alice')
+
+    assert db.get_user_by_google_id('g-1')['username'] == 'alice'
+
+
+def test_api_keys_insert_then_update(db):
+    db.create_user('alice', 'alice@example.com', 'hash')
+    user_id = db.get_user('alice')['id']
+
+    assert db.save_api_keys('alice', anthropic_key='first')
+    assert db.save_api_keys('alice', anthropic_key='second')
+
+    assert db.get_api_keys('alice')['anthropic_key'] == 'second'
+    assert db.get_api_keys('alice', user_id=user_id)['anthropic_key'] == 'second'
+    assert len(db.query_all('SELECT id FROM api_keys')) == 1
+    assert not db.save_api_keys('nobody', anthropic_key='x')
+
+
+def test_bots(db):
+    db.create_user('alice', 'alice@example.com', 'hash')
+    user_id = db.get_user('alice')['id']
+
+    bot_id = db.add_bot('alice', 'bot', 'alice_bot', '10.0.0.1', 'token', 42, 'nyc3')
+    assert db.add_bot('nobody', 'bot', 'x_bot', '10.0.0.2', 'token', 43, 'nyc3') is False
+
+    assert db.get_bot(bot_id)['user_id'] == user_id
+    assert db.get_bot_by_droplet_id(42)['id'] == bot_id
+    assert [bot['id'] for bot in db.get_user_bots('alice')] == [bot_id]
+    assert [bot['id'] for bot in db.get_user_bots('alice', user_id=user_id)] == [bot_id]
+    assert [bot['id'] for bot in db.get_all_bots()] == [bot_id]
+
+    db.update_bot_status(bot_id, 'stopped')
+    db.increment_message_count(bot_id)
+    db.add_message_counts({bot_id: 4})
+    bot = db.get_bot(bot_id)
+    assert bot['status'] == 'stopped'
+    assert bot['message_count'] == 5
+
+    assert db.delete_bot(bot_id)
+    assert db.get_bot(bot_id) is None
+
+
+def test_add_bots_saves_whole_batch(db):
+    db.create_user('alice', 'alice@example.com', 'hash')
+
+    bot_ids = db.add_bots('alice', [bot_row('alice', 1), bot_row('alice', 2)], 'nyc3')
+
+    assert len(bot_ids) == 2
+    assert [db.get_bot(bot_id)['droplet_id'] for bot_id in bot_ids] == [1, 2]
+
+
+def test_add_bots_for_missing_user_saves_nothing(db):
+    with pytest.raises(RuntimeError):
+        db.add_bots('nobody', [bot_row('nobody', 1)], 'nyc3')
+
+    assert db.get_bot_by_droplet_id(1) is None
+
+
+def test_transaction_rolls_back_on_error(db):
+    with pytest.raises(RuntimeError):
+        with db.transaction() as cursor:
+            cursor.execute("INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
+                           ('alice', 'alice@example.com', 'hash'))
+            raise RuntimeError('abort')
+
+    assert db.get_user('alice') is None
+
+
+def test_nested_transaction_joins_the_outer_one(db):
+    with pytest.raises(RuntimeError):
+        with db.transaction() as cursor:
+            cursor.execute("INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
+                           ('alice', 'alice@example.com', 'hash'))
+            with db.transaction() as inner:
+                inner.execute("INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
+                              ('bob', 'bob@example.com', 'hash'))
+            raise RuntimeError('abort')
+
+    assert db.query_all('SELECT username FROM users') == []
+
+
+def test_deploy_job_fields(db):
+    db.create_deploy_job('job', 'alice', '{}', region='nyc3', size='s-2vcpu-2gb')
+
+    assert db.update_deploy_job('job', phase='created', droplet_id=7, ignored='x')
+    assert not db.update_deploy_job('job', ignored='x')
+
+    job = db.get_deploy_job('job')
+    assert job['phase'] == 'created'
+    assert job['droplet_id'] == 7
+    assert job['kind'] == 'deploy'
+
+
+def test_snapshots(db):
+    db.add_snapshot(111, 'base-1', 'nyc3', 's-1vcpu-2gb')
+    db.add_snapshot(222, 'base-2', 'nyc3', 's-1vcpu-2gb')
+    with db.transaction() as cursor:
+        cursor.execute("UPDATE snapshots SET created_at = '2020-01-01 00:00:00' WHERE snapshot_id = '111'")
+
+    assert db.get_latest_snapshot('nyc3')['snapshot_id'] == '222'
+    db.update_snapshot_status(222, 'unusable')
+    assert db.get_latest_snapshot('nyc3')['snapshot_id'] == '111'
+    assert db.get_latest_snapshot('sfo3') is None
+
+
+def test_warm_droplets_are_claimed_once(db):
+    for droplet_id in range(1, 5):
+        db.add_warm_droplet(droplet_id, 'nyc3', 's-2vcpu-2gb')
+    db.mark_warm_droplet_idle(1, '10.0.0.1')
+    db.mark_warm_droplet_idle(2, '10.0.0.2')
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        claimed = list(pool.map(lambda i: db.claim_warm_droplet('nyc3', 's-2vcpu-2gb', f'claim-{i}'), range(4)))
+
+    claimed_ids = sorted(droplet['droplet_id'] for droplet in claimed if droplet)
+    assert claimed_ids == [1, 2]
+    assert len(db.get_warm_droplets('nyc3', 's-2vcpu-2gb', status='booting')) == 2
+
+    db.delete_warm_droplet(1)
+    assert [d['droplet_id'] for d in db.get_warm_droplets('nyc3', 's-2vcpu-2gb', status='claimed')] == [2]
+
+
+def test_record_usage_adds_to_existing_buckets(db):
+    db.record_usage({'minute': {(1, 60): 2}, 'hour': {(1, 0): 2}, 'day': {(1, 0): 2}})
+    db.record_usage({'minute': {(1, 60): 3, (1, 120): 1}, 'hour': {(1, 0): 4}, 'day': {(1, 0): 4}})
+
+    assert db.get_usage(1, 'minute', 0) == [{'bucket': 60, 'messages': 5}, {'bucket': 120, 'messages': 1}]
+    assert db.get_usage(1, 'minute', 100) == [{'bucket': 120, 'messages': 1}]
+    assert db.get_usage(1, 'hour', 0) == [{'bucket': 0, 'messages': 6}]
+
+    assert db.prune_usage('minute', 100) == 1
+    assert db.get_usage(1, 'minute', 0) == [{'bucket': 120, 'messages': 1}]
@@ -0,0 +1,59 @@
+"""
+Heartbeat signatures and replay protection
+"""
+
+import pytest
+
+from backend.heartbeat import sign, verify_signature
+
+BODY = b'{"droplet_id": 42, "timestamp": 1700000000, "telegram_ready": true, "service_active": true}'
+
+
+def test_signature_round_trip():
+    assert verify_signature('gateway-token', BODY, sign('gateway-token', BODY))
+
+
+@pytest.mark.parametrize('token, body', [
+    ('other-token', BODY),
+    ('gateway-token', BODY.replace(b'42', b'43')),
+])
+def test_signature_is_bound_to_token_and_body(token, body):
+    assert not verify_signature(token, body, sign('gateway-token', BODY))
+
+
+@pytest.mark.parametrize('signature', [None, '', 'not-hex', 'é' * 64, '☃'])
+def test_malformed_signature_is_rejected_not_raised(signature):
+    assert not verify_signature('gateway-token', BODY, signature)
+
+
+def add_bot(db, droplet_id=42):
+    db.create_user('alice', 'alice@example.com', 'x')
+    return db.add_bot('alice', 'bot', 'alice_bot', '10.0.0.1', 'gateway-token', droplet_id, 'nyc3')
+
+
+def test_heartbeat_is_recorded(db):
+    bot_id = add_bot(db)
+
+    assert db.record_heartbeat(bot_id, 1000, True, False)
+
+    bot = db.get_bot(bot_id)
+    assert bot['heartbeat_ts'] == 1000
+    assert bot['telegram_ready'] == 1
+    assert bot['service_active'] == 0
+    assert bot['last_seen_at'] is not None
+
+
+def test_replayed_or_older_heartbeat_is_rejected(db):
+    bot_id = add_bot(db)
+    assert db.record_heartbeat(bot_id, 1000, True, True)
+
+    assert not db.record_heartbeat(bot_id, 1000, False, False)
+    assert not db.record_heartbeat(bot_id, 999, False, False)
+    assert db.get_bot(bot_id)['telegram_ready'] == 1
+
+    assert db.record_heartbeat(bot_id, 1001, False, True)
+    assert db.get_bot(bot_id)['telegram_ready'] == 0
+
+
+def test_heartbeat_for_unknown_bot_is_not_recorded(db):
+    assert not db.record_heartbeat(12345, 1000, True, True)
@@ -0,0 +1,251 @@
+"""
+Deploy queue: claims, leases and retries (database side on every backend, worker side with fakes)
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend import jobs
+from backend.jobs import MAX_ATTEMPTS, DeployQueue
+
+
+def queue_job(db, job_id, username='alice', created_at=None):
+    """Queue a deploy job, optionally backdated so claim order is deterministic"""
+    db.create_deploy_job(job_id, username, json.dumps({'region': 'nyc3', 'size': 's-2vcpu-2gb'}),
+                         region='nyc3', size='s-2vcpu-2gb')
+    if created_at:
+        with db.transaction() as cursor:
+            cursor.execute('UPDATE deploy_jobs SET created_at = ? WHERE id = ?', (created_at, job_id))
+
+
+def expire_lease(db, job_id):
+    db.update_deploy_job(job_id, lease_expires_at=datetime.now() - timedelta(seconds=1))
+
+
+def test_claim_takes_oldest_queued_job(db):
+    queue_job(db, 'newer', created_at=datetime.now())
+    queue_job(db, 'older', created_at=datetime.now() - timedelta(minutes=5))
+
+    job = db.claim_deploy_job('worker-a', 300, MAX_ATTEMPTS)
+
+    assert job['id'] == 'older'
+    assert job['status'] == 'running'
+    assert job['worker'] == 'worker-a'
+    assert job['attempts'] == 1
+    assert datetime.fromisoformat(str(job['lease_expires_at'])) > datetime.now()
+
+
+def test_job_with_live_lease_is_not_claimed_again(db):
+    queue_job(db, 'job')
+    assert db.claim_deploy_job('worker-a', 300, MAX_ATTEMPTS)
+
+    assert db.claim_deploy_job('worker-b', 300, MAX_ATTEMPTS) is None
+
+
+def test_expired_lease_is_reclaimed(db):
+    queue_job(db, 'job')
+    db.claim_deploy_job('worker-a', 300, MAX_ATTEMPTS)
+    expire_lease(db, 'job')
+
+    job = db.claim_deploy_job('worker-b', 300, MAX_ATTEMPTS)
+
+    assert job['id'] == 'job'
+    assert job['worker'] == 'worker-b'
+    assert job['attempts'] == 2
+
+
+def test_job_out_of_attempts_is_failed_not_reclaimed(db):
+    queue_job(db, 'job')
+    for attempt in range(MAX_ATTEMPTS):
+        assert db.claim_deploy_job(f'worker-{attempt}', 300, MAX_ATTEMPTS)
+        expire_lease(db, 'job')
+
+    assert db.claim_deploy_job('worker-last', 300, MAX_ATTEMPTS) is None
+    assert db.fail_abandoned_deploy_jobs(MAX_ATTEMPTS) == 1
+
+    job = db.get_deploy_job('job')
+    assert job['status'] == 'failed'
+    assert job['payload'] is None
+
+
+def test_concurrent_claims_never_share_a_job(db):
+    for i in range(8):
+        queue_job(db, f'job-{i}')
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        claimed = list(pool.map(lambda i: db.claim_deploy_job(f'worker-{i}', 300, MAX_ATTEMPTS), range(8)))
+
+    ids = [job['id'] for job in claimed if job]
+    assert sorted(ids) == sorted(f'job-{i}' for i in range(8))
+
+
+def test_unique_job_is_deduplicated_and_cooled_down(db):
+    assert db.create_unique_job('first', 'snapshot', None, 3600)
+    assert not db.create_unique_job('second', 'snapshot', None, 3600)
+
+    db.update_deploy_job('first', status='done')
+    # Finished, but inside the cooldown
+    assert not db.create_unique_job('third', 'snapshot', None, 3600)
+    assert db.create_unique_job('fourth', 'snapshot', None, 0)
+
+
+class RecordingDB:
+    """Stands in for Database where only the queue's writes matter"""
+
+    def __init__(self, snapshot=None):
+        self.updates = []
+        self.snapshot = snapshot
+        self.snapshot_status = {}
+
+    def update_deploy_job(self, job_id, **fields):
+        self.updates.append((job_id, fields))
+
+    def get_latest_snapshot(self, region):
+        return self.snapshot
+
+    def update_snapshot_status(self, snapshot_id, status):
+        self.snapshot_status[snapshot_id] = status
+
+
+class FakeDeployer:
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.images = []
+        self.deleted = []
+
+    def create_droplet(self, telegram_token, nvidia_key, image=None, **kwargs):
+        self.images.append(image)
+        if self.errors:
+            raise self.errors.pop(0)
+        return {'droplet_id': 7, 'action_id': None, 'gateway_token': 'gw', 'bot_username': 'bot'}
+
+    def delete_droplet(self, droplet_id):
+        self.deleted.append(droplet_id)
+
+
+class ApiError(Exception):
+    """Shaped like the HttpResponseError pydo raises"""
+
+    def __init__(self, status_code, message):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+def deploy_payload():
+    return {'telegram_token': 't', 'region': 'nyc3', 'size': 's-2vcpu-2gb', 'bot_name': 'bot'}
+
+
+def test_keep_lease_renews_until_stopped(monkeypatch):
+    monkeypatch.setattr(jobs, 'LEASE_SECONDS', 0.05)
+    db = RecordingDB()
+    queue = DeployQueue(db, 'do-token', 'nvidia-key', workers=1)
+
+    stop = queue._keep_lease('job')
+    time.sleep(0.1)
+    stop.set()
+    time.sleep(0.03)
+    renewals = len(db.updates)
+    time.sleep(0.05)
+
+    assert renewals >= 2
+    assert len(db.updates) == renewals
+    assert all(job_id == 'job' and 'lease_expires_at' in fields for job_id, fields in db.updates)
+
+
+def test_keep_lease_survives_a_failed_renewal(monkeypatch):
+    monkeypatch.setattr(jobs, 'LEASE_SECONDS', 0.05)
+    calls = []
+
+    class FlakyDB(RecordingDB):
+        def update_deploy_job(self, job_id, **fields):
+            calls.append(job_id)
+            if len(calls) == 1:
+                raise RuntimeError('database is locked')
+
+    queue = DeployQueue(FlakyDB(), 'do-token', 'nvidia-key', workers=1)
+    stop = queue._keep_lease('job')
+    time.sleep(0.1)
+    stop.set()
+
+    assert len(calls) >= 2
+
+
+def test_fail_requeues_while_attempts_remain():
+    db = RecordingDB()
+    deployer = FakeDeployer()
+    queue = DeployQueue(db, 'do-token', 'nvidia-key', workers=1)
+
+    queue._fail({'id': 'job', 'attempts': 1, 'bot_id': None, 'droplet_id': 7}, deployer, 'boom')
+
+    assert db.updates == [('job', {'status': 'queued', 'error': 'boom', 'worker': None})]
+    # Retry resumes with the same droplet
+    assert deployer.deleted == []
+
+
+def test_fail_cleans_up_droplet_after_last_attempt():
+    db = RecordingDB()
+    deployer = FakeDeployer()
+    queue = DeployQueue(db, 'do-token', 'nvidia-key', workers=1)
+
+    queue._fail({'id': 'job', 'attempts': MAX_ATTEMPTS, 'bot_id': None, 'droplet_id': 7}, deployer, 'boom')
+
+    assert deployer.deleted == [7]
+    assert db.updates[-1][1]['status'] == 'failed'
+
+
+def test_transient_create_error_keeps_the_snapshot():
+    db = RecordingDB(snapshot={'snapshot_id': '123'})
+    deployer = FakeDeployer(errors=[ApiError(429, 'Too many requests')])
+    queue = DeployQueue(db, 'do-token', 'nvidia-key', workers=1)
+
+    with pytest.raises(ApiError):
+        queue._create_droplet(deployer, deploy_payload())
+
+    assert db.snapshot_status == {}
+    assert deployer.images == [123]
+
+
+def test_image_error_retires_the_snapshot_and_falls_back():
+    db = RecordingDB(snapshot={'snapshot_id': '123'})
+    deployer = FakeDeployer(errors=[ApiError(422, 'The image you specified is not available')])
+    queue = DeployQueue(db, 'do-token', 'nvidia-key', workers=1)
+
+    created = queue._create_droplet(deployer, deploy_payload())
+
+    assert created['droplet_id'] == 7
+    assert db.snapshot_status == {'123': 'unusable'}
+    assert deployer.images == [123, None]
+
+
+class BatchDeployer(FakeDeployer):
+    def deploy_many(self, bots, nvidia_key, on_created=None, **kwargs):
+        on_created([11, 12])
+        return [
+            {'success': True, 'droplet_id': 11, 'bot_username': 'alice_bot_11', 'ip_address': '10.0.0.11',
+             'gateway_token': 'gw'},
+            {'success': False, 'droplet_id': 12, 'bot_username': 'alice_bot_12', 'error': 'config push failed'},
+        ]
+
+
+def test_batch_saves_deployed_bots_and_deletes_failed_droplets(db, monkeypatch):
+    deployer = BatchDeployer()
+    monkeypatch.setattr(jobs, 'BotDeployer', lambda do_token: deployer)
+    db.create_user('alice', 'alice@example.com', 'hash')
+    queue = DeployQueue(db, 'do-token', 'nvidia-key', workers=1)
+    bots = [{'telegram_token': 't', 'bot_name': 'bot', 'bot_username': None}] * 2
+    job_id = queue.enqueue_batch('alice', bots)
+
+    queue._run_batch(db.claim_deploy_job('worker-a', 300, MAX_ATTEMPTS))
+
+    job = db.get_deploy_job(job_id)
+    assert job['status'] == 'done'
+    assert job['error'] == '1 bot(s) failed'
+    results = json.loads(job['result'])['bots']
+    assert [r['success'] for r in results] == [True, False]
+    assert db.get_bot(results[0]['bot_id'])['droplet_id'] == 11
+    assert deployer.deleted == [12]
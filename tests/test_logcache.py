@@ -0,0 +1,87 @@
+"""
+Shared per-bot log cache: one probe per TTL however many viewers poll (probes are faked)
+"""
+
+import pytest
+
+from backend import logcache
+from backend.logcache import LogCache
+
+
+class FakeDroplet:
+    """Answers probes from an append-only journal, positions being line counts"""
+
+    def __init__(self):
+        self.journal = ['line 0', 'line 1']
+        self.probes = []
+
+    def probe(self, ip_address, args=(), timeout=None):
+        self.probes.append(list(args))
+        if not args:
+            return {'cloud_init': [], 'startup': [], 'recent': list(self.journal),
+                    'cursor': str(len(self.journal)), 'offset': 0}
+        start = int(args[args.index('--cursor') + 1] or 0)
+        return {'cloud_init': [], 'journal': self.journal[start:], 'cursor': str(len(self.journal)), 'offset': 0}
+
+
+@pytest.fixture
+def droplet(monkeypatch):
+    fake = FakeDroplet()
+    monkeypatch.setattr(logcache, 'run_probe', fake.probe)
+    return fake
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    class Clock:
+        now = 1000.0
+
+        def time(self):
+            return self.now
+
+    fake = Clock()
+    monkeypatch.setattr(logcache.time, 'time', fake.time)
+    return fake
+
+
+def test_snapshot_is_shared_within_the_ttl(droplet, clock):
+    cache = LogCache(ttl=60)
+
+    first = cache.snapshot(1, '10.0.0.1')
+    second = cache.snapshot(1, '10.0.0.1')
+
+    assert first is second
+    assert cache.remote_fetches == 1
+
+
+def test_viewers_at_the_same_position_replay_one_fetch(droplet, clock):
+    cache = LogCache(ttl=60)
+    doc = cache.snapshot(1, '10.0.0.1')
+    droplet.journal += ['line 2', 'line 3']
+    clock.now += 61
+
+    first = cache.since(1, '10.0.0.1', doc['cursor'], doc['offset'])
+    second = cache.since(1, '10.0.0.1', doc['cursor'], doc['offset'])
+
+    assert first['journal'] == second['journal'] == ['line 2', 'line 3']
+    assert first['cursor'] == second['cursor'] == '4'
+    assert cache.remote_fetches == 2
+
+
+def test_unchanged_position_is_not_reprobed_within_the_ttl(droplet, clock):
+    cache = LogCache(ttl=60)
+    doc = cache.snapshot(1, '10.0.0.1')
+
+    update = cache.since(1, '10.0.0.1', doc['cursor'], doc['offset'])
+
+    assert update['journal'] == []
+    assert cache.remote_fetches == 1
+
+
+def test_new_droplet_ip_starts_over(droplet):
+    cache = LogCache(ttl=60)
+    cache.snapshot(1, '10.0.0.1')
+
+    cache.snapshot(1, '10.0.0.2')
+
+    assert cache.remote_fetches == 2
@@ -0,0 +1,115 @@
+"""
+Live log fan-out: one upstream journalctl -f per bot, whatever the number of browsers (SSH is faked)
+"""
+
+import json
+import queue
+
+import pytest
+
+from backend import logstream
+from backend.logstream import LogStreamHub, StreamsFull, format_entry
+
+
+class FakeProc:
+    """journalctl -f on a droplet: lines arrive when the test writes them"""
+
+    def __init__(self, command):
+        self.command = command
+        self.lines = queue.Queue()
+        self.stdout = iter(self.lines.get, None)
+        self.terminated = False
+
+    def write(self, cursor, message):
+        self.lines.put(json.dumps({'__CURSOR': cursor, '__REALTIME_TIMESTAMP': '0', 'MESSAGE': message,
+                                   '_HOSTNAME': 'bot', 'SYSLOG_IDENTIFIER': 'node'}) + '\n')
+
+    def poll(self):
+        return 0 if self.terminated else None
+
+    def terminate(self):
+        self.terminated = True
+        self.lines.put(None)
+
+
+@pytest.fixture
+def procs(monkeypatch):
+    started = []
+
+    def popen(ip_address, command):
+        started.append(FakeProc(command))
+        return started[-1]
+
+    monkeypatch.setattr(logstream.ssh_pool, 'popen', popen)
+    return started
+
+
+def test_format_entry():
+    entry = {'__REALTIME_TIMESTAMP': '1700000000000000', '_HOSTNAME': 'bot', 'SYSLOG_IDENTIFIER': 'node',
+             '_PID': '42', 'MESSAGE': 'gateway listening'}
+
+    assert format_entry(entry) == 'Nov 14 22:13:20 bot node[42]: gateway listening'
+    assert format_entry(dict(entry, MESSAGE=[104, 105])).endswith(': [binary data]')
+
+
+def test_subscribers_share_one_upstream(procs):
+    hub = LogStreamHub()
+    first = hub.subscribe(1, '10.0.0.1')
+    second = hub.subscribe(1, '10.0.0.1')
+
+    procs[0].write('c1', 'hello')
+
+    assert len(procs) == 1
+    assert first.get(timeout=5) == second.get(timeout=5) == ('c1', 'Jan 01 00:00:00 bot node: hello')
+    assert hub.stats() == {1: 2}
+
+
+def test_last_unsubscribe_stops_the_upstream(procs):
+    hub = LogStreamHub()
+    first = hub.subscribe(1, '10.0.0.1')
+    second = hub.subscribe(1, '10.0.0.1')
+
+    hub.unsubscribe(1, first)
+    assert not procs[0].terminated
+
+    hub.unsubscribe(1, second)
+    assert procs[0].terminated
+    assert hub.stats() == {}
+
+
+def test_reconnect_replays_lines_after_its_cursor(procs):
+    hub = LogStreamHub()
+    watcher = hub.subscribe(1, '10.0.0.1')
+    for cursor in ('c1', 'c2', 'c3'):
+        procs[0].write(cursor, cursor)
+    for _ in range(3):
+        watcher.get(timeout=5)
+
+    rejoined = hub.subscribe(1, '10.0.0.1', cursor='c1')
+
+    assert [rejoined.get_nowait()[0] for _ in range(2)] == ['c2', 'c3']
+
+
+def test_upstream_exit_ends_every_subscriber(procs):
+    hub = LogStreamHub()
+    watcher = hub.subscribe(1, '10.0.0.1')
+
+    procs[0].lines.put(None)
+
+    assert watcher.get(timeout=5) is None
+    assert hub.stats() == {}
+
+
+def test_streams_are_capped_per_process(procs):
+    hub = LogStreamHub(max_streams=1)
+    watcher = hub.subscribe(1, '10.0.0.1')
+
+    with pytest.raises(StreamsFull):
+        hub.subscribe(2, '10.0.0.2')
+
+    # Unsubscribing twice must not free a slot that another stream holds
+    hub.unsubscribe(1, watcher)
+    hub.unsubscribe(1, watcher)
+    hub.subscribe(2, '10.0.0.2')
+    with pytest.raises(StreamsFull):
+        hub.subscribe(1, '10.0.0.1')
@@ -0,0 +1,71 @@
+"""
+Media template helpers and the committed media manifest
+"""
+
+import os
+
+from backend.media import STATIC_DIR, load_manifest, media_url, picture, video
+
+MANIFEST = {
+    'images': {
+        'logo.png': {
+            'width': 1024, 'height': 1024,
+            'variants': {
+                'webp': [[32, 'media/logo/logo-32.webp'], [192, 'media/logo/logo-192.webp']],
+                'png': [[32, 'media/logo/logo-32.png'], [192, 'media/logo/logo-192.png']],
+            },
+        },
+    },
+    'videos': {
+        'demo.gif': {'width': 640, 'height': 360, 'poster': 'media/demo/demo-poster.webp',
+                     'sources': [{'type': 'video/webm', 'file': 'media/demo/demo.webm'}]},
+    },
+}
+
+
+def url(path):
+    return f'/static/{path}'
+
+
+def test_committed_manifest_points_at_committed_files():
+    manifest = load_manifest()
+    paths = [path for entry in manifest['images'].values() for variants in entry['variants'].values()
+             for _, path in variants]
+    paths += [entry['poster'] for entry in manifest['videos'].values()]
+    paths += [source['file'] for entry in manifest['videos'].values() for source in entry['sources']]
+
+    assert paths
+    for path in paths:
+        assert os.path.isfile(os.path.join(STATIC_DIR, path)), path
+
+
+def test_media_url_picks_smallest_wide_enough_variant():
+    assert media_url(MANIFEST, 'logo.png', url, 32) == '/static/media/logo/logo-32.png'
+    assert media_url(MANIFEST, 'logo.png', url, 100) == '/static/media/logo/logo-192.png'
+    assert media_url(MANIFEST, 'logo.png', url, 1000) == '/static/media/logo/logo-192.png'
+    assert media_url(MANIFEST, 'logo.png', url, 100, ext='webp') == '/static/media/logo/logo-192.webp'
+    assert media_url(MANIFEST, 'other.png', url, 32) == '/static/other.png'
+
+
+def test_picture_lists_modern_formats_before_the_fallback():
+    html = str(picture(MANIFEST, 'logo.png', url, 'Logo "OpenClaw"', sizes='64px', class_='logo'))
+
+    assert html.startswith('<picture><source type="image/webp" srcset="/static/media/logo/logo-32.webp 32w, ')
+    assert 'alt="Logo &#34;OpenClaw&#34;"' in html
+    assert ' class="logo"' in html
+    assert 'width="1024" height="1024" loading="lazy"' in html
+    assert html.endswith('</picture>')
+
+
+def test_unbuilt_media_falls_back_to_the_original():
+    assert str(picture(MANIFEST, 'other.png', url, 'Other')) == '<img src="/static/other.png" alt="Other">'
+    assert str(video(MANIFEST, 'other.gif', url, 'Demo')) == '<img src="/static/other.gif" alt="Demo">'
+
+
+def test_video_replaces_a_gif():
+    html = str(video(MANIFEST, 'demo.gif', url, 'Demo'))
+
+    assert html.startswith('<video autoplay loop muted playsinline preload="metadata" '
+                           'poster="/static/media/demo/demo-poster.webp"')
+    assert 'aria-label="Demo"' in html
+    assert html.endswith('<source src="/static/media/demo/demo.webm" type="video/webm"></video>')
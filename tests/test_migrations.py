@@ -0,0 +1,104 @@
+"""
+Schema migrations: fresh databases, re-runs, and SQLite files created before migrations existed
+"""
+
+import sqlite3
+
+from backend.database import Database
+from backend.migrations import LATEST_VERSION, MIGRATIONS, POSTGRES_MIGRATIONS, current_version, migrate, migrations_for
+
+
+def test_fresh_database_is_at_latest_version(db):
+    assert current_version(db) == LATEST_VERSION
+    for table in ('users', 'bots', 'api_keys', 'pending_payments', 'deploy_jobs', 'snapshots',
+                  'warm_droplets', 'usage_minute', 'usage_hour', 'usage_day'):
+        assert db.backend.table_exists(table), table
+
+
+def test_migrate_again_is_a_no_op(db):
+    assert migrate(db) == 0
+    rows = db.query_all('SELECT version FROM schema_version ORDER BY version')
+    assert [row['version'] for row in rows] == [number for number, _, _ in migrations_for(db)]
+
+
+def test_migrations_are_numbered_in_order():
+    for migrations in (MIGRATIONS, POSTGRES_MIGRATIONS):
+        versions = [number for number, _, _ in migrations]
+        assert versions == sorted(set(versions))
+        assert versions[-1] == LATEST_VERSION
+
+
+def test_pre_migration_database_is_upgraded_in_place(tmp_path):
+    # Schema and data as the original init_database left them: no payment/Google columns, no schema_version
+    path = str(tmp_path / 'legacy.db')
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_login TIMESTAMP,
+            credits REAL DEFAULT 50.0
+        );
+        CREATE TABLE bots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            bot_name TEXT NOT NULL,
+            bot_username TEXT NOT NULL,
+            ip_address TEXT NOT NULL,
+            gateway_token TEXT NOT NULL,
+            droplet_id INTEGER NOT NULL,
+            region TEXT NOT NULL,
+            status TEXT DEFAULT 'running',
+            message_count INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO users (username, email, password_hash) VALUES ('alice', 'alice@example.com', 'x');
+        INSERT INTO bots (user_id, bot_name, bot_username, ip_address, gateway_token, droplet_id, region)
+        VALUES (1, 'bot', 'alice_bot', '10.0.0.1', 'token', 42, 'nyc3');
+    ''')
+    conn.close()
+
+    db = Database(path, url='')
+    try:
+        assert current_version(db) == LATEST_VERSION
+        user = db.get_user('alice')
+        assert user['subscription_plan'] == 'none'
+        assert user['google_id'] is None
+        bot = db.get_bot_by_droplet_id(42)
+        assert bot['bot_username'] == 'alice_bot'
+        assert bot['heartbeat_ts'] is None
+    finally:
+        db.close()
+
+
+def test_duplicate_google_ids_are_cleared_before_unique_constraint(tmp_path):
+    path = str(tmp_path / 'duplicates.db')
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_login TIMESTAMP,
+            credits REAL DEFAULT 50.0,
+            google_id TEXT,
+            google_name TEXT
+        );
+        INSERT INTO users (username, email, password_hash, google_id) VALUES ('first', 'a@example.com', '', 'g-1');
+        INSERT INTO users (username, email, password_hash, google_id) VALUES ('second', 'b@example.com', '', 'g-1');
+    ''')
+    conn.close()
+
+    db = Database(path, url='')
+    try:
+        assert db.get_user_by_google_id('g-1')['username'] == 'first'
+        assert db.get_user('second')['google_id'] is None
+        # Constraint is in place now
+        assert not db.create_google_user('third', 'c@example.com', 'g-1', 'Third')
+    finally:
+        db.close()
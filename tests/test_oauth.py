@@ -0,0 +1,228 @@
+"""
+Google sign-in against a stub cert endpoint: cert caching and ID token checks
+"""
+
+import datetime
+import time
+
+import pytest
+import requests
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from google.auth import crypt, jwt
+
+from backend import oauth
+from backend.oauth import CERTS_RETRY_SECONDS, CertCache, GoogleOAuth, max_age
+
+CLIENT_ID = 'client-id.apps.googleusercontent.com'
+
+
+def make_key(kid):
+    """(signer, PEM cert) for a fresh RSA key"""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, kid)])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (x509.CertificateBuilder()
+            .subject_name(name).issuer_name(name)
+            .public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(days=1))
+            .not_valid_after(now + datetime.timedelta(days=1))
+            .sign(key, hashes.SHA256()))
+    pem_key = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                serialization.NoEncryption())
+    return crypt.RSASigner.from_string(pem_key, kid), cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+@pytest.fixture(scope='module')
+def keys():
+    return {kid: make_key(kid) for kid in ('key-1', 'key-2')}
+
+
+class StubResponse:
+    def __init__(self, certs, headers):
+        self.certs = certs
+        self.headers = headers
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.certs
+
+
+class StubSession:
+    """Serves whatever certs and headers the test sets, counting fetches"""
+
+    def __init__(self, certs, headers=None):
+        self.certs = certs
+        self.headers = headers if headers is not None else {'Cache-Control': 'public, max-age=3600'}
+        self.error = None
+        self.fetches = 0
+
+    def get(self, url, timeout=None):
+        self.fetches += 1
+        if self.error:
+            raise self.error
+        return StubResponse(dict(self.certs), self.headers)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    class Clock:
+        now = 1_000_000.0
+
+        def time(self):
+            return self.now
+
+    fake = Clock()
+    monkeypatch.setattr(oauth.time, 'time', fake.time)
+    return fake
+
+
+def id_token(signer, **claims):
+    now = int(time.time())
+    payload = {'iss': 'https://accounts.google.com', 'aud': CLIENT_ID, 'sub': '123',
+               'email': 'alice@example.com', 'iat': now, 'exp': now + 600}
+    payload.update(claims)
+    return jwt.encode(signer, payload).decode()
+
+
+@pytest.mark.parametrize('headers, expected', [
+    ({'Cache-Control': 'public, max-age=3600'}, 3600),
+    ({'Cache-Control': 'public, max-age=3600', 'Age': '600'}, 3000),
+    ({'Cache-Control': 'max-age=100', 'Age': '500'}, 0),
+    ({'Cache-Control': 'max-age=100', 'Age': 'junk'}, 100),
+    ({'Cache-Control': 'no-store'}, 0),
+    ({'Cache-Control': 'no-cache, max-age=3600'}, 0),
+    ({}, oauth.CERTS_DEFAULT_MAX_AGE),
+])
+def test_max_age(headers, expected):
+    assert max_age(headers) == expected
+
+
+def test_certs_are_cached_until_they_expire(clock):
+    session = StubSession({'key-1': 'pem'})
+    cache = CertCache('https://certs.test', session)
+
+    cache.get('key-1')
+    clock.now += 3599
+    cache.get('key-1')
+    assert session.fetches == 1
+
+    clock.now += 1
+    cache.get('key-1')
+    assert session.fetches == 2
+    assert cache.stats()['fetches'] == 2
+
+
+def test_no_store_refetches_every_time(clock):
+    session = StubSession({'key-1': 'pem'}, {'Cache-Control': 'no-store'})
+    cache = CertCache('https://certs.test', session)
+
+    cache.get()
+    cache.get()
+    assert session.fetches == 2
+
+
+def test_unknown_kid_forces_at_most_one_refetch_per_interval(clock):
+    session = StubSession({'key-1': 'pem'})
+    cache = CertCache('https://certs.test', session)
+    cache.get('key-1')
+
+    # Google rotated in key-2 before our copy expired
+    session.certs = {'key-1': 'pem', 'key-2': 'pem'}
+    assert 'key-2' in cache.get('key-2')
+    assert session.fetches == 2
+
+    # Forged kids within the interval are answered from the cache
+    for _ in range(5):
+        cache.get('forged')
+    assert session.fetches == 2
+
+    clock.now += CERTS_RETRY_SECONDS
+    cache.get('forged')
+    assert session.fetches == 3
+
+
+def test_failed_refresh_keeps_stale_certs_and_backs_off(clock):
+    session = StubSession({'key-1': 'pem'})
+    cache = CertCache('https://certs.test', session)
+    cache.get()
+
+    clock.now += 3600
+    session.error = requests.ConnectionError('unreachable')
+    assert cache.get() == {'key-1': 'pem'}
+    assert session.fetches == 2
+
+    # No refetch until the retry interval passes
+    cache.get()
+    assert session.fetches == 2
+
+    clock.now += CERTS_RETRY_SECONDS
+    session.error = None
+    session.certs = {'key-2': 'pem'}
+    assert cache.get() == {'key-2': 'pem'}
+
+
+def test_first_fetch_failure_raises(clock):
+    session = StubSession({})
+    session.error = requests.ConnectionError('unreachable')
+
+    with pytest.raises(requests.ConnectionError):
+        CertCache('https://certs.test', session).get()
+
+
+def google_client(keys):
+    client = GoogleOAuth(CLIENT_ID, 'secret', 'https://app.test/auth/google/callback', certs_url='https://certs.test')
+    client.certs.session = StubSession({kid: cert for kid, (_, cert) in keys.items()})
+    return client
+
+
+def test_valid_token_is_accepted(keys):
+    client = google_client(keys)
+
+    claims = client.verify_id_token(id_token(keys['key-1'][0]))
+
+    assert claims['email'] == 'alice@example.com'
+
+
+@pytest.mark.parametrize('issuer', ['accounts.google.com', 'https://accounts.google.com'])
+def test_both_google_issuers_are_accepted(keys, issuer):
+    assert google_client(keys).verify_id_token(id_token(keys['key-1'][0], iss=issuer))
+
+
+@pytest.mark.parametrize('issuer', ['https://evil.example.com', None])
+def test_other_issuers_are_rejected(keys, issuer):
+    with pytest.raises(ValueError, match='Wrong issuer'):
+        google_client(keys).verify_id_token(id_token(keys['key-1'][0], iss=issuer))
+
+
+@pytest.mark.parametrize('claims', [
+    {'aud': 'someone-else'},
+    {'iat': int(time.time()) - 7200, 'exp': int(time.time()) - 3600},
+])
+def test_bad_claims_are_rejected(keys, claims):
+    with pytest.raises(ValueError):
+        google_client(keys).verify_id_token(id_token(keys['key-1'][0], **claims))
+
+
+def test_token_signed_by_unknown_key_is_rejected(keys):
+    client = google_client({'key-1': keys['key-1']})
+
+    with pytest.raises(ValueError):
+        client.verify_id_token(id_token(keys['key-2'][0]))
+
+
+def test_sign_in_uses_pkce(keys):
+    client = google_client(keys)
+    flow = client.flow()
+
+    url, state = flow.authorization_url()
+
+    assert flow.code_verifier
+    assert 'code_challenge_method=S256' in url and 'code_challenge=' in url
+    # The callback's flow presents the verifier stored with the state
+    assert client.flow(state=state, code_verifier=flow.code_verifier).code_verifier == flow.code_verifier
@@ -0,0 +1,94 @@
+"""
+Remote probe: version check, JSON round trip and log formatting (SSH is faked)
+"""
+
+import json
+import subprocess
+
+import pytest
+
+from backend import probe
+from backend.probe import PROBE_SCRIPT, PROBE_VERSION, format_logs, probe_command, run_probe
+
+
+def test_probe_script_is_valid_and_versioned():
+    compile(PROBE_SCRIPT, 'openclaw-probe', 'exec')
+    # probe_command greps the installed copy for this exact line
+    assert f'\nPROBE_VERSION = {PROBE_VERSION}\n' in PROBE_SCRIPT
+
+
+def test_probe_command_quotes_arguments():
+    command = probe_command(['--after', "it's"])
+
+    assert f"^PROBE_VERSION = {PROBE_VERSION}$" in command
+    assert "'it'\"'\"'s'" in command
+
+
+@pytest.fixture
+def script():
+    """The probe script's functions, loaded without running main()"""
+    namespace = {'__name__': 'openclaw_probe'}
+    exec(compile(PROBE_SCRIPT, 'openclaw-probe', 'exec'), namespace)
+    return namespace
+
+
+def test_read_log_returns_complete_lines_after_offset(script, tmp_path):
+    log = tmp_path / 'cloud-init-output.log'
+    log.write_bytes(b'one\ntwo\nthr')
+
+    lines, offset = script['read_log'](str(log))
+    assert (lines, offset) == (['one', 'two'], 8)
+
+    # The partial line is returned once it is complete
+    log.write_bytes(b'one\ntwo\nthree\n')
+    assert script['read_log'](str(log), offset) == (['three'], 14)
+
+
+def test_read_log_restarts_after_truncation(script, tmp_path):
+    log = tmp_path / 'cloud-init-output.log'
+    log.write_bytes(b'fresh\n')
+
+    assert script['read_log'](str(log), 500) == (['fresh'], 6)
+    assert script['read_log'](str(tmp_path / 'missing.log')) == (None, 0)
+
+
+def fake_ssh(monkeypatch, returncode=0, stdout='', stderr=''):
+    calls = []
+
+    def run(ip_address, command, input=None, timeout=None):
+        calls.append((ip_address, input))
+        return subprocess.CompletedProcess([], returncode, stdout, stderr)
+
+    monkeypatch.setattr(probe.ssh_pool, 'run', run)
+    return calls
+
+
+def test_run_probe_parses_the_document(monkeypatch):
+    calls = fake_ssh(monkeypatch, stdout=json.dumps({'version': PROBE_VERSION, 'telegram_ready': True}))
+
+    assert run_probe('10.0.0.1')['telegram_ready'] is True
+    # The script always rides along on stdin for droplets without a current copy
+    assert calls == [('10.0.0.1', PROBE_SCRIPT)]
+
+
+@pytest.mark.parametrize('returncode, stdout', [(255, ''), (0, '  \n')])
+def test_run_probe_raises_when_unreachable(monkeypatch, returncode, stdout):
+    fake_ssh(monkeypatch, returncode=returncode, stdout=stdout, stderr='Connection refused')
+
+    with pytest.raises(RuntimeError, match='Connection refused'):
+        run_probe('10.0.0.1')
+
+
+def test_format_logs():
+    text = format_logs({'cloud_init': None, 'startup': ['gateway starting'], 'recent': ['[telegram] ready']})
+
+    assert text.splitlines() == [
+        '=== DEPLOYMENT LOG (cloud-init) ===',
+        '(cloud-init log not available yet)',
+        '',
+        '=== OPENCLAW STARTUP LOG ===',
+        'gateway starting',
+        '',
+        '=== RECENT ACTIVITY (bonjour filtered) ===',
+        '[telegram] ready',
+    ]
@@ -0,0 +1,29 @@
+"""
+Every Database method runs on an index (see backend/query_plans.py)
+"""
+
+from backend import query_plans
+
+
+def test_every_query_uses_an_index(tmp_path):
+    assert query_plans.check(str(tmp_path / 'plans.db')) == []
+
+
+def test_every_query_uses_an_index_on_postgres(postgres_url):
+    assert query_plans.check_postgres(postgres_url) == []
+
+
+def test_full_scans_are_reported(tmp_path, monkeypatch):
+    monkeypatch.setattr(query_plans, 'ALLOWED_SCANS', set())
+
+    problems = query_plans.check(str(tmp_path / 'plans.db'))
+
+    assert [problem.split(':')[0] for problem in problems] == ['get_all_bots']
+
+
+def test_full_scans_are_reported_on_postgres(postgres_url, monkeypatch):
+    monkeypatch.setattr(query_plans, 'ALLOWED_SCANS', set())
+
+    problems = query_plans.check_postgres(postgres_url)
+
+    assert [problem.split(':')[0] for problem in problems] == ['get_all_bots']
@@ -0,0 +1,116 @@
+"""
+Shared droplet readiness poller, driven by hand against a fake DigitalOcean client
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from backend import readiness
+from backend.readiness import DropletWatcher
+
+
+def droplet(droplet_id, status='active', ip_address='10.0.0.1', created_at='2030-01-01T00:00:00Z'):
+    networks = [{'type': 'public', 'ip_address': ip_address}] if ip_address else []
+    return {'id': droplet_id, 'status': status, 'networks': {'v4': networks}, 'created_at': created_at}
+
+
+class FakeClient:
+    def __init__(self, droplets=(), actions=None):
+        self.listed = {d['id']: d for d in droplets}
+        self.actions_status = actions or {}
+        self.list_calls = 0
+        self.untagged = []
+        self.droplets = SimpleNamespace(list=self._list, get=self._get)
+        self.actions = SimpleNamespace(get=self._get_action)
+        self.tags = SimpleNamespace(unassign_resources=self._unassign)
+
+    def _list(self, tag_name, per_page, page):
+        self.list_calls += 1
+        droplets = list(self.listed.values())
+        return {'droplets': droplets, 'meta': {'total': len(droplets)}}
+
+    def _get(self, droplet_id):
+        return {'droplet': self.listed.get(droplet_id, droplet(droplet_id, status='new', ip_address=None))}
+
+    def _get_action(self, action_id):
+        status = self.actions_status.get(action_id, 'in-progress')
+        if isinstance(status, Exception):
+            raise status
+        return {'action': {'id': action_id, 'status': status}}
+
+    def _unassign(self, tag_id, body):
+        self.untagged.extend(int(r['resource_id']) for r in body['resources'])
+
+
+@pytest.fixture
+def watcher():
+    watcher = DropletWatcher('do-token')
+    watcher._thread = True     # Tests call _poll() themselves instead of running the poll thread
+    return watcher
+
+
+def test_one_list_call_resolves_every_ready_droplet(watcher):
+    activated = []
+    watcher.client = FakeClient([droplet(1, ip_address='10.0.0.1'), droplet(2, ip_address='10.0.0.2'),
+                                 droplet(3, status='new', ip_address=None)])
+    futures = {i: watcher.watch(i, on_active=lambda i=i: activated.append(i)) for i in (1, 2, 3)}
+
+    watcher._poll()
+
+    assert futures[1].result(0) == '10.0.0.1'
+    assert futures[2].result(0) == '10.0.0.2'
+    assert not futures[3].done()
+    assert sorted(activated) == [1, 2]
+    assert watcher.client.list_calls == 1
+    # Resolved droplets lose the tag so the next list only pages through what is still booting
+    assert sorted(watcher.client.untagged) == [1, 2]
+
+
+def test_watching_twice_shares_the_future(watcher):
+    assert watcher.watch(1) is watcher.watch(1)
+
+
+def test_errored_create_action_fails_only_that_droplet(watcher, monkeypatch):
+    monkeypatch.setattr(readiness, 'ACTION_CHECK_SECONDS', -1)
+    watcher.client = FakeClient(actions={'a-1': 'errored'})
+    failed = watcher.watch(1, action_id='a-1')
+    booting = watcher.watch(2, action_id='a-2')
+
+    watcher._poll()
+
+    with pytest.raises(RuntimeError):
+        failed.result(0)
+    assert not booting.done()
+
+
+def test_failed_action_lookup_does_not_stop_the_poll(watcher, monkeypatch):
+    monkeypatch.setattr(readiness, 'ACTION_CHECK_SECONDS', -1)
+    watcher.client = FakeClient([droplet(2)], actions={'a-1': RuntimeError('503')})
+    booting = watcher.watch(1, action_id='a-1')
+    ready = watcher.watch(2)
+
+    watcher._poll()
+
+    assert not booting.done()
+    assert ready.result(0) == '10.0.0.1'
+
+
+def test_stale_tagged_droplets_are_untagged(watcher):
+    watcher.client = FakeClient([droplet(1, status='new', ip_address=None, created_at='2020-01-01T00:00:00Z'),
+                                 droplet(2, status='new', ip_address=None)])
+    watcher.watch(3)
+
+    watcher._poll()
+
+    assert watcher.client.untagged == [1]
+
+
+def test_deadline_does_a_final_lookup_before_timing_out(watcher):
+    watcher.client = FakeClient()
+    late = watcher.watch(1, timeout=-1)
+
+    watcher._poll()
+
+    with pytest.raises(TimeoutError):
+        late.result(0)
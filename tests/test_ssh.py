@@ -0,0 +1,64 @@
+"""
+Multiplexed SSH connections: command lines and master eviction (no real ssh is started)
+"""
+
+import itertools
+import threading
+
+import pytest
+
+from backend import ssh
+from backend.ssh import SSHPool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    return SSHPool(control_dir=str(tmp_path / 'ssh'), idle_seconds=300, max_connections=2)
+
+
+def option(args, name):
+    return next(args[i + 1].split('=', 1)[1] for i, arg in enumerate(args) if arg == '-o' and args[i + 1].startswith(name + '='))
+
+
+def test_run_goes_through_the_control_master(pool, monkeypatch):
+    calls = []
+    monkeypatch.setattr(ssh.subprocess, 'run', lambda args, **kwargs: calls.append(args))
+
+    pool.run('10.0.0.1', 'uptime')
+
+    args = calls[0]
+    assert args[-2:] == ['root@10.0.0.1', 'uptime']
+    assert option(args, 'ControlMaster') == 'auto'
+    assert option(args, 'ControlPersist') == '300'
+    assert option(args, 'ControlPath').startswith(pool.control_dir)
+    assert option(args, 'BatchMode') == 'yes'
+
+
+def test_pinned_connections_get_their_own_master(pool):
+    unpinned = pool._ssh_args('10.0.0.1', None)
+    pinned = pool._ssh_args('10.0.0.1', '/tmp/known_hosts')
+
+    assert option(unpinned, 'ControlPath') != option(pinned, 'ControlPath')
+    assert option(pinned, 'StrictHostKeyChecking') == 'accept-new'
+    assert option(pinned, 'UserKnownHostsFile') == '/tmp/known_hosts'
+
+
+def test_least_recently_used_master_is_closed_past_the_limit(pool, monkeypatch):
+    closed = []
+    done = threading.Event()
+
+    def close(ip_address, known_hosts_file=None):
+        closed.append(ip_address)
+        done.set()
+
+    monkeypatch.setattr(pool, 'close', close)
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(ssh.time, 'time', lambda: next(ticks))
+    pool._touch('10.0.0.1', None)
+    pool._touch('10.0.0.2', None)
+    pool._touch('10.0.0.1', None)
+    pool._touch('10.0.0.3', None)
+
+    assert done.wait(5)
+    assert closed == ['10.0.0.2']
+    assert sorted(pool.stats()) == ['10.0.0.1', '10.0.0.3']
@@ -0,0 +1,66 @@
+"""
+Sliding-window login throttling
+"""
+
+import pytest
+
+from backend import throttle
+from backend.throttle import FailureWindow, LoginThrottle
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    class Clock:
+        now = 1000.0
+
+        def time(self):
+            return self.now
+
+    fake = Clock()
+    monkeypatch.setattr(throttle.time, 'time', fake.time)
+    return fake
+
+
+def test_blocks_at_limit_until_oldest_failure_leaves_window(clock):
+    window = FailureWindow(limit=3, window=60)
+    for _ in range(2):
+        window.fail('alice')
+        clock.now += 10
+    assert window.retry_after('alice') == 0
+
+    window.fail('alice')   # failures at 1000, 1010, 1020
+    assert window.retry_after('alice') == 40
+
+    clock.now = 1060
+    assert window.retry_after('alice') == 0
+
+
+def test_reset_clears_failures(clock):
+    window = FailureWindow(limit=1, window=60)
+    window.fail('alice')
+    assert window.retry_after('alice') > 0
+
+    window.reset('alice')
+    assert window.retry_after('alice') == 0
+
+
+def test_tracked_keys_are_bounded(clock):
+    window = FailureWindow(limit=1, window=60, max_keys=2)
+    for key in ('a', 'b', 'c'):
+        window.fail(key)
+
+    assert window.retry_after('a') == 0
+    assert window.retry_after('c') > 0
+
+
+def test_username_failures_from_one_ip_do_not_lock_out_others(clock, monkeypatch):
+    monkeypatch.setattr(throttle, 'LOGIN_MAX_FAILURES_USER', 2)
+    login_throttle = LoginThrottle()
+    for _ in range(2):
+        login_throttle.failed('203.0.113.9', 'alice')
+
+    assert login_throttle.retry_after('203.0.113.9', 'alice') > 0
+    assert login_throttle.retry_after('198.51.100.7', 'alice') == 0
+
+    login_throttle.succeeded('203.0.113.9', 'alice')
+    assert login_throttle.retry_after('203.0.113.9', 'alice') == 0
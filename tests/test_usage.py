@@ -0,0 +1,51 @@
+"""
+Usage buckets: rollup, zero-filled series and retention
+"""
+
+from backend.usage import bucket_start, prune, rollup, usage_series
+
+DAY = 86400 * 20000
+
+
+def add_bot(db):
+    db.create_user('alice', 'alice@example.com', 'x')
+    return db.add_bot('alice', 'bot', 'alice_bot', '10.0.0.1', 'token', 42, 'nyc3')
+
+
+def test_bucket_start():
+    assert bucket_start(3599.9, 'minute') == 3540
+    assert bucket_start(3600, 'hour') == 3600
+    assert bucket_start(86399, 'day') == 0
+
+
+def test_rollup_spreads_minutes_over_every_resolution():
+    buckets = rollup({(1, DAY): 2, (1, DAY + 60): 3, (1, DAY + 3600): 4, (2, DAY): 1})
+
+    assert buckets['minute'] == {(1, DAY): 2, (1, DAY + 60): 3, (1, DAY + 3600): 4, (2, DAY): 1}
+    assert buckets['hour'] == {(1, DAY): 5, (1, DAY + 3600): 4, (2, DAY): 1}
+    assert buckets['day'] == {(1, DAY): 9, (2, DAY): 1}
+
+
+def test_series_is_zero_filled_up_to_the_current_bucket(db):
+    bot_id = add_bot(db)
+    now = DAY + 3600 * 12 + 30
+    db.record_usage(rollup({(bot_id, now - 3600 * 2): 3, (bot_id, now): 1}))
+
+    series = usage_series(db, bot_id, '24h', now=now)
+
+    assert series['resolution'] == 'hour'
+    assert len(series['points']) == 24
+    assert series['points'][-1] == {'t': bucket_start(now, 'hour'), 'messages': 1}
+    assert [p['messages'] for p in series['points']][-3:] == [3, 0, 1]
+    assert series['total'] == 4
+
+
+def test_prune_keeps_buckets_inside_retention(db):
+    bot_id = add_bot(db)
+    old, recent = DAY - 800 * 86400, DAY - 60
+    db.record_usage(rollup({(bot_id, old): 1, (bot_id, recent): 1}))
+
+    prune(db, now=DAY)
+
+    assert [row['bucket'] for row in db.get_usage(bot_id, 'minute', 0)] == [recent]
+    assert [row['bucket'] for row in db.get_usage(bot_id, 'day', 0)] == [bucket_start(recent, 'day')]
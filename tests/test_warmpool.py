@@ -0,0 +1,46 @@
+"""
+Warm pool sizing from the recent deploy rate
+"""
+
+import pytest
+
+from backend import warmpool
+from backend.warmpool import WarmPool
+
+SIZE = 's-2vcpu-2gb'
+
+
+@pytest.fixture
+def pool(db, monkeypatch):
+    monkeypatch.setattr(warmpool, 'WARM_POOL_MIN', 0)
+    monkeypatch.setattr(warmpool, 'WARM_POOL_MAX', 5)
+    monkeypatch.setitem(warmpool._hourly_prices, SIZE, 0.03)
+    return WarmPool(db, 'do-token')
+
+
+def queue_deploys(db, count, region='nyc3'):
+    for i in range(count):
+        db.create_deploy_job(f'{region}-{i}', 'alice', '{}', region=region, size=SIZE)
+
+
+def test_idle_pool_keeps_the_minimum(pool, monkeypatch):
+    assert pool.target_size('nyc3', SIZE) == 0
+
+    monkeypatch.setattr(warmpool, 'WARM_POOL_MIN', 1)
+    assert pool.target_size('nyc3', SIZE) == 1
+
+
+def test_target_follows_the_deploy_rate(pool, db):
+    # 36 deploys over the 6 hour window: 0.1 a minute, 2 expected while a droplet boots
+    queue_deploys(db, 36)
+    queue_deploys(db, 100, region='sfo3')
+
+    assert pool.target_size('nyc3', SIZE) == 2
+
+
+def test_target_is_clamped_and_cost_capped(pool, db, monkeypatch):
+    queue_deploys(db, 1000)
+    assert pool.target_size('nyc3', SIZE) == 5
+
+    monkeypatch.setitem(warmpool._hourly_prices, SIZE, 0.1)
+    assert pool.target_size('nyc3', SIZE) == 2